@@ -0,0 +1,151 @@
+#!/usr/bin/env python3
+"""
+SAKHI - Warm agent process pool.
+
+kiro-cli takes its query on the command line, so a session cannot be
+started before the query is known. Instead each pool slot pre-spawns the
+launcher (wsl -> bash -lc on Windows, bash on Linux/Mac) which blocks on
+stdin until a NUL-terminated query arrives and then execs kiro-cli in the
+already loaded shell. This takes WSL start-up, login-shell profile and
+PATH resolution off the emergency path.
+"""
+
+import asyncio
+import shlex
+import time
+from dataclasses import dataclass
+from typing import Callable, List, Optional, Set
+
+from agent_runner import AgentRunner, AgentRunResult
+
+# Recycle idle sessions after this many seconds so they never go stale
+DEFAULT_MAX_IDLE_SECONDS = 600
+# How often idle sessions are health checked
+HEALTH_CHECK_SECONDS = 30
+
+# Shell snippet: wait for the NUL-terminated query on stdin, then become kiro-cli
+_READ_QUERY_AND_EXEC = "IFS= read -r -d '' q; exec {kiro} chat --agent {agent} --no-interactive --trust-all-tools \"$q\""
+
+
+def build_warm_command(kiro_cli: str, agent_name: str, wsl: bool = False,
+                       wsl_workspace: Optional[str] = None, login_shell: bool = False) -> List[str]:
+    """Build the launcher command a pooled session is started with."""
+    script = _READ_QUERY_AND_EXEC.format(kiro=shlex.quote(kiro_cli), agent=shlex.quote(agent_name))
+    if wsl_workspace:
+        script = f"cd {shlex.quote(wsl_workspace)} && {script}"
+    shell = ["bash", "-lc" if login_shell else "-c", script]
+    return ["wsl", *shell] if wsl else shell
+
+
+@dataclass
+class _Session:
+    """A pre-spawned launcher waiting for its query."""
+    process: asyncio.subprocess.Process
+    created: float
+
+    def healthy(self, max_idle: float) -> bool:
+        return self.process.returncode is None and time.monotonic() - self.created < max_idle
+
+
+class AgentPool:
+    """Keeps pre-spawned sessions for one agent and hands queries to them."""
+
+    def __init__(self, runner: AgentRunner, agent_name: str, command: List[str],
+                 log: Callable[[str], None], size: int = 1,
+                 max_idle_seconds: float = DEFAULT_MAX_IDLE_SECONDS):
+        self.runner = runner
+        self.agent_name = agent_name
+        self.command = command
+        self.log = log
+        self.size = size
+        self.max_idle_seconds = max_idle_seconds
+        self._idle: List[_Session] = []
+        self._spawning = 0
+        self._health_task: Optional[asyncio.Task] = None
+        # Strong references to background refills/kills, so they are not garbage collected
+        self._tasks: Set[asyncio.Task] = set()
+        self.warm_hits = 0
+        self.cold_starts = 0
+
+    async def start(self):
+        """Fill the pool and start the background health check."""
+        await self._refill()
+        self._health_task = asyncio.create_task(self._health_loop())
+        self.log(f"🔥 Agent pool ready: {len(self._idle)} warm {self.agent_name} session(s)")
+
+    async def close(self):
+        """Stop health checks and kill every idle session."""
+        if self._health_task:
+            self._health_task.cancel()
+        for task in list(self._tasks):
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        idle, self._idle = self._idle, []
+        for session in idle:
+            await self.runner.kill(session.process)
+
+    async def run(self, query: str, timeout: float, label: str = "") -> AgentRunResult:
+        """Run a query on a warm session, falling back to a freshly spawned one."""
+        session = self._acquire()
+        if session:
+            self.warm_hits += 1
+        else:
+            self.cold_starts += 1
+            session = _Session(await self._spawn(), time.monotonic())
+
+        self._background(self._refill())
+        return await self.runner.attach(
+            self.agent_name,
+            session.process,
+            timeout,
+            label=label,
+            stdin_data=query.encode("utf-8") + b"\0"
+        )
+
+    def _acquire(self) -> Optional[_Session]:
+        while self._idle:
+            session = self._idle.pop(0)
+            if session.healthy(self.max_idle_seconds):
+                return session
+            self._background(self.runner.kill(session.process))
+        return None
+
+    def _background(self, coro):
+        """Run a coroutine in the background, logging its failure."""
+        task = asyncio.create_task(coro)
+        self._tasks.add(task)
+        task.add_done_callback(self._task_done)
+
+    def _task_done(self, task: asyncio.Task):
+        self._tasks.discard(task)
+        if not task.cancelled() and task.exception() is not None:
+            self.log(f"⚠️ {self.agent_name} pool task failed: {task.exception()}")
+
+    async def _spawn(self) -> asyncio.subprocess.Process:
+        return await self.runner.spawn(self.command, stdin=asyncio.subprocess.PIPE)
+
+    async def _refill(self):
+        """Spawn sessions until the pool is back at its target size."""
+        while len(self._idle) + self._spawning < self.size:
+            self._spawning += 1
+            try:
+                process = await self._spawn()
+                self._idle.append(_Session(process, time.monotonic()))
+            except Exception as e:
+                self.log(f"⚠️ Could not pre-spawn {self.agent_name} session: {e}")
+                return
+            finally:
+                self._spawning -= 1
+
+    async def _health_loop(self):
+        """Recycle dead or stale idle sessions."""
+        while True:
+            await asyncio.sleep(HEALTH_CHECK_SECONDS)
+            stale = [s for s in self._idle if not s.healthy(self.max_idle_seconds)]
+            if not stale:
+                continue
+            self._idle = [s for s in self._idle if s not in stale]
+            for session in stale:
+                await self.runner.kill(session.process)
+            self.log(f"♻️ Recycled {len(stale)} {self.agent_name} session(s)")
+            await self._refill()
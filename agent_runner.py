@@ -0,0 +1,203 @@
+#!/usr/bin/env python3
+"""
+SAKHI - Shared async runner for kiro-cli agent invocations.
+
+Used by scheduler.py and sos_scheduler.py so that agent runs never block
+the polling loop. Output is streamed line by line to the scheduler log,
+timeouts kill the whole process group (wsl -> bash -> kiro-cli -> MCP
+servers), and every run records its wall time.
+"""
+
+import asyncio
+import os
+import signal
+import subprocess
+import sys
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List, Optional
+
+# Seconds to wait after SIGTERM before escalating to SIGKILL
+KILL_GRACE_SECONDS = 5
+# Lines of stdout/stderr kept per run for error reporting
+TAIL_LINES = 20
+# Seconds to keep reading output after the process exits; a background child
+# still holding the pipes must not turn a finished run into a timeout
+DRAIN_SECONDS = 5
+EXIT_POLL_SECONDS = 0.1
+
+
+@dataclass
+class AgentRunResult:
+    """Outcome of a single agent invocation."""
+    agent: str
+    label: str
+    returncode: Optional[int]
+    elapsed: float
+    timed_out: bool = False
+    cancelled: bool = False
+    stdout_tail: List[str] = field(default_factory=list)
+    stderr_tail: List[str] = field(default_factory=list)
+
+    @property
+    def ok(self) -> bool:
+        return self.returncode == 0 and not self.timed_out and not self.cancelled
+
+    def error_summary(self, limit: int = 200) -> str:
+        """Short description of why the run failed."""
+        if self.timed_out:
+            return f"timed out after {self.elapsed:.0f}s"
+        if self.cancelled:
+            return "cancelled"
+        text = "\n".join(self.stderr_tail) or "unknown"
+        return text[:limit]
+
+
+class AgentRunner:
+    """Runs agent commands as asyncio subprocesses with streamed output."""
+
+    def __init__(self, log: Callable[[str], None], env: Optional[Dict[str, str]] = None):
+        self.log = log
+        self.env = {**os.environ, "KIRO_AUTO_APPROVE": "true", **(env or {})}
+        self.history: deque = deque(maxlen=100)
+        self._active: Dict[int, asyncio.subprocess.Process] = {}
+
+    @property
+    def active_count(self) -> int:
+        return len(self._active)
+
+    async def spawn(self, cmd: List[str], stdin: Optional[int] = None) -> asyncio.subprocess.Process:
+        """Start a command in its own process group."""
+        kwargs = {}
+        if sys.platform == "win32":
+            kwargs["creationflags"] = subprocess.CREATE_NEW_PROCESS_GROUP
+        else:
+            kwargs["start_new_session"] = True
+
+        return await asyncio.create_subprocess_exec(
+            *cmd,
+            stdin=stdin if stdin is not None else asyncio.subprocess.DEVNULL,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.PIPE,
+            env=self.env,
+            **kwargs
+        )
+
+    async def run(self, agent: str, cmd: List[str], timeout: float, label: str = "") -> AgentRunResult:
+        """Spawn a command and wait for it, streaming its output."""
+        process = await self.spawn(cmd)
+        return await self.attach(agent, process, timeout, label=label)
+
+    async def attach(self, agent: str, process: asyncio.subprocess.Process, timeout: float,
+                     label: str = "", stdin_data: Optional[bytes] = None) -> AgentRunResult:
+        """Stream an already running process until it exits, times out or is cancelled."""
+        label = label or agent
+        result = AgentRunResult(agent=agent, label=label, returncode=None, elapsed=0.0)
+        stdout_tail: deque = deque(maxlen=TAIL_LINES)
+        stderr_tail: deque = deque(maxlen=TAIL_LINES)
+        started = time.monotonic()
+        self._active[process.pid] = process
+
+        readers = [
+            asyncio.create_task(self._pump(process.stdout, f"[{label}] ", stdout_tail)),
+            asyncio.create_task(self._pump(process.stderr, f"[{label}] ⚠️ ", stderr_tail)),
+        ]
+
+        try:
+            if stdin_data is not None and process.stdin is not None:
+                process.stdin.write(stdin_data)
+                await process.stdin.drain()
+                process.stdin.close()
+
+            result.returncode = await asyncio.wait_for(self._exited(process), timeout=timeout)
+            _, pending = await asyncio.wait(readers, timeout=DRAIN_SECONDS)
+            if pending:
+                self.log(f"⚠️ {label}: output still open {DRAIN_SECONDS}s after exit, killing leftover processes")
+                await self.kill(process)
+        except asyncio.TimeoutError:
+            result.timed_out = True
+            await self.kill(process)
+        except asyncio.CancelledError:
+            result.cancelled = True
+            await self.kill(process)
+            raise
+        finally:
+            for reader in readers:
+                reader.cancel()
+            self._active.pop(process.pid, None)
+            result.elapsed = time.monotonic() - started
+            result.returncode = process.returncode if result.returncode is None else result.returncode
+            result.stdout_tail = list(stdout_tail)
+            result.stderr_tail = list(stderr_tail)
+            self.history.append(result)
+            self.log(f"⏱️ {label}: exit={result.returncode} in {result.elapsed:.1f}s"
+                     f"{' (timed out)' if result.timed_out else ''}"
+                     f"{' (cancelled)' if result.cancelled else ''}")
+
+        return result
+
+    async def cancel_all(self):
+        """Kill every agent process this runner still owns."""
+        for process in list(self._active.values()):
+            await self.kill(process)
+
+    async def _pump(self, stream: Optional[asyncio.StreamReader], prefix: str, tail: deque):
+        """Forward a process stream to the log one line at a time."""
+        if stream is None:
+            return
+        while True:
+            line = await stream.readline()
+            if not line:
+                break
+            text = line.decode("utf-8", errors="replace").rstrip()
+            if text:
+                tail.append(text)
+                self.log(f"{prefix}{text}")
+
+    @staticmethod
+    async def _exited(process: asyncio.subprocess.Process) -> int:
+        """Wait for the process itself to exit.
+
+        Unlike process.wait(), this does not also wait for stdout/stderr to
+        close, which a background child inheriting them can hold open.
+        """
+        while process.returncode is None:
+            await asyncio.sleep(EXIT_POLL_SECONDS)
+        return process.returncode
+
+    async def kill(self, process: asyncio.subprocess.Process):
+        """Terminate the process group, escalating to SIGKILL after a grace period.
+
+        The group is signalled even if the leader already exited, since
+        children it left behind (MCP servers, background jobs) live on in it.
+        """
+        if sys.platform == "win32":
+            if process.returncode is not None:
+                return
+            try:
+                process.send_signal(signal.CTRL_BREAK_EVENT)
+            except (ProcessLookupError, OSError):
+                pass
+        else:
+            try:
+                os.killpg(process.pid, signal.SIGTERM)
+            except (ProcessLookupError, OSError):
+                pass
+
+        try:
+            await asyncio.wait_for(self._exited(process), timeout=KILL_GRACE_SECONDS)
+            if sys.platform == "win32":
+                return
+        except asyncio.TimeoutError:
+            pass
+
+        try:
+            if sys.platform == "win32":
+                process.kill()
+            else:
+                # No-op (ESRCH) once everything in the group has exited
+                os.killpg(process.pid, signal.SIGKILL)
+        except (ProcessLookupError, OSError):
+            pass
+        await self._exited(process)
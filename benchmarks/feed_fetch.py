@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+"""
+SAKHI - RSS fetch benchmark for ArticleFetcher.fetch_all.
+
+Serves synthetic RSS feeds from local HTTP servers, each answering after a
+fixed delay, and times fetch_all sequentially against concurrently. Every
+feed gets its own server (and so its own host:port), like the real news
+sources, so the per-host limit does not serialise them. Concurrent wall
+time should come out close to the slowest feed, sequential close to the
+sum of all delays.
+
+Usage, from the repository root:
+  python -m benchmarks.feed_fetch [--feeds 13] [--min-delay 0.2] [--max-delay 1.5] [--runs 3]
+"""
+
+import argparse
+import statistics
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from hackathon_sakhi.news.fetcher import ArticleFetcher
+
+ITEM = """<item><title>Incident {n} reported in Delhi</title><link>http://news.example/{feed}/{n}</link>
+<guid>{feed}-{n}</guid><description>Police registered a case of harassment near the metro.</description>
+<pubDate>Mon, 19 Oct 2026 08:{minute:02d}:00 +0530</pubDate></item>"""
+
+
+def build_feed(feed: int, items: int) -> bytes:
+    body = "".join(ITEM.format(feed=feed, n=n, minute=n % 60) for n in range(items))
+    return (f'<?xml version="1.0"?><rss version="2.0"><channel><title>Feed {feed}</title>'
+            f"{body}</channel></rss>").encode()
+
+
+class DelayedFeedServer(ThreadingHTTPServer):
+    """Answers every GET with one feed after `delay` seconds."""
+
+    daemon_threads = True
+
+    def __init__(self, body: bytes, delay: float):
+        super().__init__(("127.0.0.1", 0), _FeedHandler)
+        self.body = body
+        self.delay = delay
+
+    @property
+    def url(self) -> str:
+        return f"http://127.0.0.1:{self.server_address[1]}/rss.xml"
+
+
+class _FeedHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        time.sleep(self.server.delay)
+        self.send_response(200)
+        self.send_header("Content-Type", "application/rss+xml")
+        self.send_header("Content-Length", str(len(self.server.body)))
+        self.end_headers()
+        self.wfile.write(self.server.body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def timed(fetcher: ArticleFetcher, sources, concurrent: bool, runs: int):
+    samples = []
+    for _ in range(runs):
+        started = time.perf_counter()
+        articles = fetcher.fetch_all(sources, concurrent=concurrent)
+        samples.append(time.perf_counter() - started)
+    return samples, len(articles)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0].strip())
+    parser.add_argument("--feeds", type=int, default=13, help="Feeds served (IndianNewsSources has 13)")
+    parser.add_argument("--min-delay", type=float, default=0.2, help="Delay of the fastest feed in seconds")
+    parser.add_argument("--max-delay", type=float, default=1.5, help="Delay of the slowest feed in seconds")
+    parser.add_argument("--items", type=int, default=30, help="Items per feed")
+    parser.add_argument("--runs", type=int, default=3)
+    args = parser.parse_args()
+
+    step = (args.max_delay - args.min_delay) / max(1, args.feeds - 1)
+    delays = [args.min_delay + i * step for i in range(args.feeds)]
+    servers = [DelayedFeedServer(build_feed(i, args.items), delay) for i, delay in enumerate(delays)]
+    for server in servers:
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+
+    try:
+        sources = {"local": [server.url for server in servers]}
+        # Without a cache every run downloads every feed in full
+        fetcher = ArticleFetcher(deadline=args.max_delay * 2 + 5)
+        print(f"{args.feeds} feeds, delays {args.min_delay:.2f}-{args.max_delay:.2f}s "
+              f"(sum {sum(delays):.1f}s), {args.items} items each")
+        for name, concurrent in (("sequential", False), ("concurrent", True)):
+            samples, count = timed(fetcher, sources, concurrent, args.runs)
+            print(f"{name:<11} median {statistics.median(samples):6.2f} s   min {min(samples):6.2f} s   "
+                  f"({count} articles, n={len(samples)})")
+    finally:
+        for server in servers:
+            server.shutdown()
+            server.server_close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,132 @@
+#!/usr/bin/env python3
+"""
+SAKHI - Keyword classification benchmark on synthetic news articles.
+
+Classifies the same synthetic articles (safety relevance, city, category)
+three ways and reports time and agreement:
+
+  substring   the original three passes: `keyword in text` over the safety
+              keywords, the cities and every category list
+  classify    ArticleProcessor.classify (KeywordMatcher: the same substring
+              probes on one normalised text, plus word-boundary checks)
+  regex       one precompiled alternation per keyword group, scanned once,
+              keeping the highest-priority keyword found; kept here as the
+              single-pass alternative that was measured and not adopted
+
+Articles are normalised before timing, so only matching is measured.
+
+Usage, from the repository root:
+  python -m benchmarks.keyword_matching [--articles 100000]
+"""
+
+import argparse
+import random
+import re
+import time
+
+from hackathon_sakhi.news.models import Article
+from hackathon_sakhi.news.processor import ArticleProcessor
+from hackathon_sakhi.news.profiles import WOMEN_SAFETY
+
+FILLER = ("the a police said on monday that in city road market station near local officials "
+          "reported people were after").split()
+# Words that contain a keyword without being one ("rape" in "grape", "kota" in "kotak")
+TRAPS = ["grape", "kotak", "dakota", "drapes", "sparta", "claw"]
+
+
+def make_articles(count: int):
+    rng = random.Random(42)
+    profile = WOMEN_SAFETY
+    keywords = profile.safety_keywords + profile.cities + [k for ks in profile.categories.values() for k in ks]
+    articles = []
+    for i in range(count):
+        words = [rng.choice(FILLER) for _ in range(rng.randint(20, 60))]
+        for _ in range(rng.randint(0, 3)):
+            words.insert(rng.randrange(len(words)), rng.choice(keywords))
+        if rng.random() < 0.1:
+            words.insert(rng.randrange(len(words)), rng.choice(TRAPS))
+        articles.append(Article(title=" ".join(words[:8]).capitalize(), summary=" ".join(words[8:]),
+                                published="", url=f"http://news.example/{i}", source="Synthetic"))
+    return articles
+
+
+def substring(processor: ArticleProcessor, text: str):
+    profile = processor.profile
+    if not any(keyword in text for keyword in profile.safety_keywords):
+        return None
+    city = next((city for city in profile.cities if city in text), None)
+    category = next((name for name, keywords in profile.categories.items()
+                     if any(keyword in text for keyword in keywords)), profile.default_category)
+    return (city.title() if city else "Unknown", category)
+
+
+class RegexMatcher:
+    """Per-group alternation; priority is the keyword's position in its group."""
+
+    def __init__(self, processor: ArticleProcessor):
+        self.groups = {}
+        profile = processor.profile
+        self.default_category = profile.default_category
+        self._add("safety", [(k, k, False) for k in profile.safety_keywords])
+        self._add("location", [(k, k, profile.whole_word_cities) for k in profile.cities])
+        self._add("category", [(k, name, False) for name, ks in profile.categories.items() for k in ks])
+
+    def _add(self, group, entries):
+        alternatives = []
+        for i, (keyword, _, whole_word) in enumerate(entries):
+            end = r"(?![^\W_])" if whole_word else ""
+            alternatives.append(f"(?P<k{i}>{re.escape(keyword)}{end})")
+        # Zero-width so overlapping keywords are all seen; starts on a word boundary
+        pattern = re.compile(r"(?<![^\W_])(?=" + "|".join(alternatives) + ")")
+        self.groups[group] = (pattern, [value for _, value, _ in entries])
+
+    def first(self, group, text):
+        pattern, values = self.groups[group]
+        best = None
+        for match in pattern.finditer(text):
+            index = int(match.lastgroup[1:])
+            if best is None or index < best:
+                best = index
+                if index == 0:
+                    break
+        return None if best is None else values[best]
+
+    def classify(self, text):
+        if self.first("safety", text) is None:
+            return None
+        city = self.first("location", text)
+        return (city.title() if city else "Unknown", self.first("category", text) or self.default_category)
+
+
+def timed(name, fn, items):
+    started = time.perf_counter()
+    results = [fn(item) for item in items]
+    seconds = time.perf_counter() - started
+    kept = sum(1 for result in results if result is not None)
+    print(f"{name:<10} {seconds:7.2f} s   {seconds / len(items) * 1e6:6.1f} us/article   ({kept} kept)")
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0].strip())
+    parser.add_argument("--articles", type=int, default=100_000)
+    args = parser.parse_args()
+
+    processor = ArticleProcessor()
+    articles = make_articles(args.articles)
+    texts = [processor._text(article) for article in articles]
+
+    def classify(article):
+        article = processor.classify(article)
+        return (article.location, article.category) if article else None
+
+    baseline = timed("substring", lambda text: substring(processor, text), texts)
+    current = timed("classify", classify, articles)
+    regex = timed("regex", RegexMatcher(processor).classify, texts)
+
+    print(f"classify differs from substring on {sum(a != b for a, b in zip(baseline, current))} articles "
+          f"(word boundaries); regex differs from classify on {sum(a != b for a, b in zip(current, regex))}")
+
+
+if __name__ == "__main__":
+    main()
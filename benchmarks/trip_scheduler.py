@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+"""
+SAKHI - Trip reminder scheduling benchmark on a large trips file.
+
+Generates a trips.json with departures spread over the next 30 days and
+times the reminder bookkeeping both ways:
+
+  json        the old scheduler: load and scan trips.json for due trips,
+              rewrite the whole file (indent=2) to mark one reminder sent
+  store       TripStore: import trips.json once, then indexed queries for
+              the due window and the next departure, single-row mark_sent
+  queue       TripQueue on top of the store: refresh (import + heap build)
+              and pop_due for the reminders due now
+
+Usage, from the repository root:
+  python -m benchmarks.trip_scheduler [--trips 100000] [--updates 1000]
+"""
+
+import argparse
+import json
+import random
+import statistics
+import tempfile
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+from trip_queue import TripQueue
+from trip_store import TripStore, parse_trips_json
+
+REMINDER_HOURS = 4
+CITIES = ["Delhi", "Mumbai", "Bengaluru", "Chennai", "Kolkata", "Hyderabad", "Pune", "Jaipur", "Lucknow", "Kota"]
+
+
+def make_trips(count: int, now: datetime):
+    rng = random.Random(42)
+    trips = []
+    for i in range(count):
+        departure = now + timedelta(seconds=rng.uniform(60, 30 * 24 * 3600))
+        trips.append({
+            "source": rng.choice(CITIES),
+            "destination": f"{rng.choice(CITIES)} stop {i}",
+            "datetime": departure.replace(microsecond=0).isoformat(),
+            "reminder_sent": False,
+        })
+    return trips
+
+
+def timed(fn, repeat: int = 1):
+    """Median seconds per call over `repeat` calls, and the last result."""
+    samples = []
+    result = None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = fn()
+        samples.append(time.perf_counter() - started)
+    return statistics.median(samples), result
+
+
+def json_due(path: Path, now: datetime):
+    with open(path, "r") as f:
+        trips = parse_trips_json(json.load(f))
+    window = timedelta(hours=REMINDER_HOURS)
+    return [trip for trip in trips if not trip.get("reminder_sent")
+            and datetime.fromisoformat(trip["datetime"]) - window <= now < datetime.fromisoformat(trip["datetime"])]
+
+
+def json_mark_sent(path: Path, index: int):
+    with open(path, "r") as f:
+        data = json.load(f)
+    data["trips"][index]["reminder_sent"] = True
+    data["trips"][index]["reminder_sent_at"] = datetime.now().isoformat()
+    with open(path, "w") as f:
+        json.dump(data, f, indent=2)
+
+
+def report(name: str, seconds: float, detail: str = ""):
+    unit, value = ("ms", seconds * 1000) if seconds >= 0.001 else ("us", seconds * 1e6)
+    print(f"{name:<28} {value:9.2f} {unit}  {detail}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0].strip())
+    parser.add_argument("--trips", type=int, default=100_000)
+    parser.add_argument("--updates", type=int, default=1000, help="mark_sent calls timed on the store")
+    parser.add_argument("--json-updates", type=int, default=5, help="Whole-file rewrites timed on trips.json")
+    args = parser.parse_args()
+
+    now = datetime.now()
+    trips = make_trips(args.trips, now)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        trips_file = Path(tmp) / "trips.json"
+        trips_file.write_text(json.dumps({"trips": trips}, indent=2))
+        print(f"{args.trips} trips, trips.json {trips_file.stat().st_size / 1e6:.1f} MB")
+
+        seconds, due = timed(lambda: json_due(trips_file, now), repeat=3)
+        report("json: load + scan due", seconds, f"({len(due)} due)")
+        seconds, _ = timed(lambda: json_mark_sent(trips_file, random.randrange(args.trips)), repeat=args.json_updates)
+        report("json: mark one sent", seconds, "(whole-file rewrite)")
+
+        store = TripStore(Path(tmp) / "trips.db")
+        try:
+            seconds, imported = timed(lambda: store.import_json(trips_file))
+            report("store: import trips.json", seconds, f"({imported} trips)")
+            seconds, _ = timed(lambda: store.import_json(trips_file))
+            report("store: re-import", seconds, "(all conflicts)")
+            window = lambda: store.pending_trips(now, now + timedelta(hours=REMINDER_HOURS))
+            seconds, due = timed(window, repeat=20)
+            report("store: due window", seconds, f"({len(due)} due)")
+            seconds, _ = timed(lambda: store.next_departure(now), repeat=100)
+            report("store: next departure", seconds)
+
+            ids = random.Random(7).sample(range(1, args.trips + 1), min(args.updates, args.trips))
+            started = time.perf_counter()
+            for trip_id in ids:
+                store.mark_sent(trip_id)
+            report("store: mark one sent", (time.perf_counter() - started) / len(ids), f"(mean of {len(ids)})")
+
+            queue = TripQueue(trips_file, store, REMINDER_HOURS, lambda message: None)
+            seconds, _ = timed(queue.refresh)
+            report("queue: refresh", seconds, f"({len(queue)} pending)")
+            seconds, due = timed(lambda: queue.pop_due(now))
+            report("queue: pop due", seconds, f"({len(due)} due)")
+        finally:
+            store.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -5,25 +5,42 @@ Works on Windows, Mac, and Linux without crontab setup.
 Just run: python scheduler.py
 
 Judges can simply run this script and it handles everything automatically.
+The Telegram client is shared with the packaged MCP servers, so install the
+package first, e.g. `pip install -e .` from the repository root.
 """
 
+import asyncio
 import json
-import subprocess
 import shutil
 import os
 import sys
-import time
 import signal
-import urllib.request
 import urllib.parse
 from datetime import datetime, timedelta
 from pathlib import Path
 
+from hackathon_sakhi.telegram_media import FileIdCache
+from hackathon_sakhi.telegram_outbox import FAILED, TelegramOutbox
+from hackathon_sakhi.telegram_sender import TelegramSender
+from agent_pool import AgentPool, build_warm_command
+from agent_runner import AgentRunner
+from trip_queue import TripQueue
+from trip_store import TripStore
+
 # Configuration
 TRIPS_FILE = Path(__file__).parent / "trips.json"
+TRIPS_DB = Path(__file__).parent / "trips.db"  # Reminder state; trips.json is imported into it
+OUTBOX_DB = Path(__file__).parent / "telegram-outbox.db"  # Reminders are committed here, then sent in the background
+REPORTS_DIR = Path(__file__).parent  # Where the agent writes trip-safety-report-*.html
 AGENT_NAME = "women-safety-guardian"
-CHECK_INTERVAL_MINUTES = 30  # How often to check for trips (configurable)
+WATCH_INTERVAL_SECONDS = 5  # How often the daemon checks trips.json for changes
+RETRY_MINUTES = 30  # Retry delay after a failed reminder
 REMINDER_HOURS_BEFORE = 4
+AGENT_TIMEOUT_SECONDS = 300
+AGENT_POOL_SIZE = 1  # Pre-spawned agent sessions kept warm in daemon mode (0 disables)
+MAX_CONCURRENT_REPORTS = 3  # Agent-generated safety reports running at once
+MAX_CONCURRENT_TELEGRAM = 20  # Direct Telegram reminders sent at once
+OUTBOX_FLUSH_SECONDS = 60  # --once waits this long for queued reminders to go out before exiting
 
 # WSL kiro-cli path - UPDATE THIS TO YOUR WSL USERNAME
 # Find your path by running in WSL: which kiro-cli
@@ -34,6 +51,10 @@ KIRO_CLI_WSL_PATH = "/home/YOUR_WSL_USERNAME/.local/bin/kiro-cli"
 TELEGRAM_BOT_TOKEN = os.environ.get("TELEGRAM_BOT_TOKEN", "YOUR_TELEGRAM_BOT_TOKEN")
 TELEGRAM_CHAT_ID = os.environ.get("TELEGRAM_CHAT_ID", "YOUR_TELEGRAM_CHAT_ID")
 
+# One keep-alive, rate-limited client for every reminder; 429s and network errors are retried
+# Uploaded reports are remembered by file_id, so re-sends don't upload them again
+telegram_sender = TelegramSender(TELEGRAM_BOT_TOKEN, pool_size=MAX_CONCURRENT_TELEGRAM, file_ids=FileIdCache())
+
 # Track running state
 running = True
 
@@ -73,22 +94,63 @@ def get_kiro_command(agent_query):
             agent_query
         ]
 
-def send_telegram_message(message):
-    """Send message directly via Telegram Bot API"""
+def get_warm_kiro_command():
+    """Launcher for pooled sessions - waits for the query on stdin, then runs kiro-cli"""
+    if sys.platform == "win32":
+        # UPDATE THIS PATH to your workspace location (same as get_kiro_command)
+        wsl_workspace = "/mnt/c/Users/YOUR_USERNAME/path/to/hackathon-project"
+        return build_warm_command(KIRO_CLI_WSL_PATH, AGENT_NAME, wsl=True,
+                                  wsl_workspace=wsl_workspace, login_shell=True)
+    kiro_path = shutil.which("kiro-cli") or str(Path.home() / ".local" / "bin" / "kiro-cli")
+    return build_warm_command(kiro_path, AGENT_NAME)
+
+def open_outbox():
+    """Outbox for reminders, with its background sender running"""
+    outbox = TelegramOutbox(telegram_sender, OUTBOX_DB, workers=MAX_CONCURRENT_TELEGRAM)
+    outbox.start()
+    pending = outbox.pending_count()
+    if pending:
+        log(f"📤 Resuming {pending} unsent Telegram message(s)")
+    return outbox
+
+def queue_telegram_message(outbox, message, key):
+    """Commit a message to the outbox; sent in the background.
+    True once it is pending or was already sent - a key that failed before is queued again"""
     try:
-        url = f"https://api.telegram.org/bot{TELEGRAM_BOT_TOKEN}/sendMessage"
-        data = urllib.parse.urlencode({
-            "chat_id": TELEGRAM_CHAT_ID,
-            "text": message,
-            "parse_mode": "HTML"
-        }).encode('utf-8')
-        
-        req = urllib.request.Request(url, data=data)
-        with urllib.request.urlopen(req, timeout=10) as response:
-            result = json.loads(response.read().decode())
-            return result.get("ok", False)
+        outbox.send_message(TELEGRAM_CHAT_ID, message, key=key)
+        state = outbox.status(key)
     except Exception as e:
-        log(f"⚠️ Telegram error: {e}")
+        log(f"⚠️ Telegram outbox error: {e}")
+        return False
+    if state is None or state["status"] == FAILED:
+        log(f"⚠️ Telegram message {key} is not queued: {(state or {}).get('last_error')}")
+        return False
+    return True
+
+def reminder_key(trip):
+    """Idempotency key of a trip's reminder - one reminder per trip, even across restarts"""
+    return f"trip-reminder:{trip['source']}|{trip['destination']}|{trip['datetime']}"
+
+def report_filename(trip):
+    """Name of the HTML safety report the agent creates for a trip"""
+    return f"trip-safety-report-{trip['destination']}-{trip.get('date', trip['datetime'][:10])}.html"
+
+def queue_report_document(outbox, trip):
+    """Queue the trip's generated HTML report as a Telegram document. True once stored"""
+    path = REPORTS_DIR / report_filename(trip)
+    if not path.is_file():
+        log(f"⚠️ Safety report {path.name} not found - not sent to Telegram")
+        return False
+    try:
+        outbox.send_document(
+            TELEGRAM_CHAT_ID, path,
+            caption=f"📄 <b>SAKHI safety report</b>: {trip['source']} → {trip['destination']}",
+            key=f"trip-report:{trip['source']}|{trip['destination']}|{trip['datetime']}"
+        )
+        log(f"📤 Safety report queued for Telegram: {path.name}")
+        return True
+    except Exception as e:
+        log(f"⚠️ Telegram outbox error: {e}")
         return False
 
 def log(message):
@@ -96,178 +158,250 @@ def log(message):
     timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
     print(f"[{timestamp}] {message}")
 
-def check_and_send_reminders():
-    """Check trips.json and send reminders for upcoming trips"""
-    
-    if not TRIPS_FILE.exists():
-        log("📋 No trips.json found - nothing to check")
-        return
-    
-    try:
-        with open(TRIPS_FILE, 'r') as f:
-            data = json.load(f)
-    except json.JSONDecodeError:
-        log("❌ Error reading trips.json")
-        return
-    
-    # Handle both formats: {"trips": [...]} or [...]
-    if isinstance(data, dict):
-        trips = data.get("trips", [])
+def build_reminder_message(trip):
+    """Telegram reminder text for a trip"""
+    maps_link = f"https://www.google.com/maps/dir/{urllib.parse.quote(trip['source'])}/{urllib.parse.quote(trip['destination'])}"
+    return f"""🛡️ <b>SAKHI SAFETY REMINDER</b>
+
+📍 <b>Trip:</b> {trip['source']} → {trip['destination']}
+📅 <b>Date:</b> {trip.get('date', trip['datetime'][:10])}
+⏰ <b>Time:</b> {trip.get('time', trip['datetime'][11:16])}
+
+🗺️ <a href="{maps_link}">View Route on Google Maps</a>
+
+📄 Safety report is being prepared. Stay safe! 💪"""
+
+async def send_reminder_telegram(trip, outbox):
+    """Fast path - commit the reminder to the Telegram outbox. Returns True once it is stored"""
+    queued = await asyncio.to_thread(queue_telegram_message, outbox, build_reminder_message(trip), reminder_key(trip))
+    if queued:
+        log(f"✅ Telegram reminder queued: {trip['source']} → {trip['destination']}")
     else:
-        trips = data
-    
-    if not trips:
-        log("📋 No trips scheduled")
-        return
-    
-    now = datetime.now()
-    updated = False
-    
-    log(f"🔍 Checking {len(trips)} trip(s)...")
+        log(f"⚠️ Could not queue Telegram reminder for trip to {trip['destination']}")
+    return queued
+
+async def generate_trip_report(trip, label, runner, pool=None):
+    """Slow path - have the agent build the weather/news safety report. Returns True on success"""
     
-    for i, trip in enumerate(trips):
-        # Skip if reminder already sent
-        if trip.get("reminder_sent", False):
-            continue
-        
-        # Parse trip datetime
-        try:
-            trip_time = datetime.fromisoformat(trip["datetime"])
-        except (KeyError, ValueError) as e:
-            log(f"⚠️ Invalid datetime for trip {i+1}: {e}")
-            continue
-        
-        # Calculate reminder time (4 hours before trip)
-        reminder_time = trip_time - timedelta(hours=REMINDER_HOURS_BEFORE)
-        
-        # Check if we're in the reminder window
-        if now >= reminder_time and now < trip_time:
-            log(f"🚨 REMINDER TIME! Trip: {trip['source']} → {trip['destination']}")
-            
-            # Build agent query - Telegram FIRST to ensure it sends
-            agent_query = f"""URGENT: Send SAKHI safety reminder for upcoming trip.
+    # The reminder itself has already gone out on the fast path
+    agent_query = f"""Create a SAKHI safety report for an upcoming trip.
 
 Trip: {trip['source']} → {trip['destination']}
 Date: {trip.get('date', trip['datetime'][:10])} at {trip.get('time', trip['datetime'][11:16])}
 
-STEP 1 - SEND TELEGRAM IMMEDIATELY:
-Use sakhi-telegram send_message tool to send this alert:
-"🛡️ SAKHI REMINDER - Trip to {trip['destination']} in 4 hours! 📍 Route: https://www.google.com/maps/dir/{trip['source']}/{trip['destination']} Stay safe! 💪"
+The Telegram reminder has ALREADY been sent - do not send another one.
 
-STEP 2 - Get weather using sakhi-weather for {trip['destination']}
+STEP 1 - Get weather using sakhi-weather for {trip['destination']}
 
-STEP 3 - Get safety news using sakhi-news for {trip['destination']}
+STEP 2 - Get safety news using sakhi-news for {trip['destination']}
 
-STEP 4 - Create HTML report: trip-safety-report-{trip['destination']}-{trip.get('date', trip['datetime'][:10])}.html
+STEP 3 - Create HTML report: {report_filename(trip)}
 
-TELEGRAM IS MANDATORY - DO NOT SKIP!"""
+The scheduler sends the report file to Telegram itself once you are done."""
+    
+    try:
+        log(f"🤖 Invoking {AGENT_NAME} agent for {label}...")
+        
+        if pool:
+            result = await pool.run(agent_query, timeout=AGENT_TIMEOUT_SECONDS, label=label)
+        else:
+            # Get command - same pattern as sos_scheduler
+            cmd = get_kiro_command(agent_query)
+            log(f"📝 Command: {cmd[0]} {cmd[1]} {cmd[2][:50]}...")
             
-            try:
-                log(f"🤖 Invoking {AGENT_NAME} agent via WSL...")
-                
-                # Get command - same pattern as sos_scheduler
-                cmd = get_kiro_command(agent_query)
-                log(f"📝 Command: {cmd[0]} {cmd[1]} {cmd[2][:50]}...")
-                
-                result = subprocess.run(
-                    cmd,
-                    capture_output=True,
-                    text=True,
-                    timeout=300,
-                    env={**os.environ, "KIRO_AUTO_APPROVE": "true"},
-                    encoding='utf-8',
-                    errors='replace'
-                )
-                
-                log(f"📤 Return code: {result.returncode}")
-                if result.stdout:
-                    log(f"📤 Stdout (first 500 chars): {result.stdout[:500]}")
-                if result.stderr:
-                    log(f"📤 Stderr (first 500 chars): {result.stderr[:500]}")
-                
-                if result.returncode == 0:
-                    # Mark as sent
-                    trips[i]["reminder_sent"] = True
-                    trips[i]["reminder_sent_at"] = datetime.now().isoformat()
-                    updated = True
-                    log(f"✅ Agent completed!")
-                    
-                    # Send Telegram directly as backup (agent may not send in non-interactive mode)
-                    log(f"📱 Sending Telegram notification directly...")
-                    maps_link = f"https://www.google.com/maps/dir/{urllib.parse.quote(trip['source'])}/{urllib.parse.quote(trip['destination'])}"
-                    telegram_msg = f"""🛡️ <b>SAKHI SAFETY REMINDER</b>
-
-📍 <b>Trip:</b> {trip['source']} → {trip['destination']}
-📅 <b>Date:</b> {trip.get('date', trip['datetime'][:10])}
-⏰ <b>Time:</b> {trip.get('time', trip['datetime'][11:16])}
-
-🗺️ <a href="{maps_link}">View Route on Google Maps</a>
+            result = await runner.run(
+                AGENT_NAME,
+                cmd,
+                timeout=AGENT_TIMEOUT_SECONDS,
+                label=label
+            )
+        
+        if result.ok:
+            log(f"✅ Safety report for {label} completed in {result.elapsed:.1f}s!")
+            return True
+        elif result.timed_out:
+            log(f"⏰ Agent timed out after {AGENT_TIMEOUT_SECONDS // 60} minutes")
+        else:
+            log(f"❌ Agent returned error: {result.error_summary()}")
+        
+    except FileNotFoundError:
+        log(f"❌ kiro-cli not found. Update KIRO_CLI_WSL_PATH in scheduler.py")
+        log(f"   Current path: {KIRO_CLI_WSL_PATH}")
+    except Exception as e:
+        log(f"❌ Error: {e}")
+    return False
 
-✅ Safety report generated! Stay safe! 💪"""
-                    
-                    if send_telegram_message(telegram_msg):
-                        log(f"✅ Telegram sent successfully!")
-                    else:
-                        log(f"⚠️ Telegram send failed - check bot token/chat ID")
-                else:
-                    log(f"❌ Agent returned error: {result.stderr[:200] if result.stderr else 'unknown'}")
-                
-            except subprocess.TimeoutExpired:
-                log("⏰ Agent timed out after 5 minutes")
-            except FileNotFoundError:
-                log(f"❌ kiro-cli not found. Update KIRO_CLI_WSL_PATH in scheduler.py")
-                log(f"   Current path: {KIRO_CLI_WSL_PATH}")
-            except Exception as e:
-                log(f"❌ Error: {e}")
+class ReminderPipeline:
+    """Fans due reminders out: Telegram immediately, agent reports on a bounded pool"""
+    
+    def __init__(self, runner, outbox, pool=None):
+        self.runner = runner
+        self.outbox = outbox
+        self.pool = pool
+        self.report_slots = asyncio.Semaphore(MAX_CONCURRENT_REPORTS)
+        self.reports = set()
+    
+    async def dispatch(self, trips):
+        """Queue Telegram for every trip concurrently and queue their reports.
+        Returns one delivered flag per trip (delivery itself is retried by the outbox)"""
+        if not trips:
+            return []
         
-        elif now < reminder_time:
-            time_until = reminder_time - now
-            hours, remainder = divmod(int(time_until.total_seconds()), 3600)
-            minutes = remainder // 60
-            log(f"⏳ Trip to {trip['destination']}: reminder in {hours}h {minutes}m")
+        log(f"🚨 {len(trips)} reminder(s) due")
+        delivered = await asyncio.gather(*(send_reminder_telegram(t, self.outbox) for t in trips))
+        
+        for trip, ok in zip(trips, delivered):
+            if ok:
+                task = asyncio.create_task(self._report(trip))
+                self.reports.add(task)
+                task.add_done_callback(self.reports.discard)
+        return delivered
+    
+    async def _report(self, trip):
+        async with self.report_slots:
+            ok = await generate_trip_report(trip, f"trip to {trip['destination']}", self.runner, self.pool)
+        if ok:
+            await asyncio.to_thread(queue_report_document, self.outbox, trip)
+    
+    async def drain(self):
+        """Wait for every queued report to finish"""
+        if self.reports:
+            log(f"⏳ Waiting for {len(self.reports)} safety report(s)...")
+            await asyncio.gather(*self.reports, return_exceptions=True)
+    
+    async def cancel(self):
+        """Abort reports still running, e.g. on shutdown"""
+        for task in list(self.reports):
+            task.cancel()
+        await asyncio.gather(*self.reports, return_exceptions=True)
+
+async def check_and_send_reminders(runner, pool=None):
+    """Import trips.json once and send reminders for upcoming trips"""
     
-    # Save updated trips
-    if updated:
-        with open(TRIPS_FILE, 'w') as f:
-            json.dump(trips, f, indent=2)
-        log("💾 trips.json updated")
+    store = TripStore(TRIPS_DB)
+    outbox = open_outbox()
+    pipeline = ReminderPipeline(runner, outbox, pool)
+    try:
+        if TRIPS_FILE.exists():
+            try:
+                await asyncio.to_thread(store.import_json, TRIPS_FILE)
+            except json.JSONDecodeError:
+                log("❌ Error reading trips.json")
+                return
+        
+        trips = await asyncio.to_thread(store.pending_trips)
+        if not trips:
+            log("📋 No trips scheduled")
+            return
+        
+        now = datetime.now()
+        log(f"🔍 Checking {len(trips)} pending trip(s)...")
+        
+        due = []
+        for trip in trips:
+            trip_time = datetime.fromisoformat(trip["datetime"])
+            
+            # Calculate reminder time (4 hours before trip)
+            reminder_time = trip_time - timedelta(hours=REMINDER_HOURS_BEFORE)
+            
+            # Check if we're in the reminder window
+            if now >= reminder_time:
+                due.append(trip)
+            else:
+                time_until = reminder_time - now
+                hours, remainder = divmod(int(time_until.total_seconds()), 3600)
+                minutes = remainder // 60
+                log(f"⏳ Trip to {trip['destination']}: reminder in {hours}h {minutes}m")
+        
+        delivered = await pipeline.dispatch(due)
+        for trip, ok in zip(due, delivered):
+            if ok:
+                await asyncio.to_thread(store.mark_sent, trip["id"])
+        await pipeline.drain()
+        if not await asyncio.to_thread(outbox.wait_idle, OUTBOX_FLUSH_SECONDS):
+            log("📤 Some Telegram messages are still queued; they go out on the next run")
+    finally:
+        await pipeline.cancel()
+        outbox.close()
+        store.close()
+
+async def process_due_trips(queue, pipeline):
+    """Dispatch every trip the queue reports as due. Returns how many were handled"""
+    due = queue.pop_due(datetime.now())
+    delivered = await pipeline.dispatch(due)
+    for trip, ok in zip(due, delivered):
+        if ok:
+            await asyncio.to_thread(queue.mark_sent, trip)
+        else:
+            log(f"🔁 Retrying trip to {trip['destination']} in {RETRY_MINUTES} minutes")
+            queue.retry_later(trip, RETRY_MINUTES * 60)
+    return len(due)
 
 def run_once():
     """Run a single check"""
     log("🔄 Running single check...")
-    check_and_send_reminders()
+    asyncio.run(check_and_send_reminders(AgentRunner(log)))
     log("✅ Check complete")
 
 def run_daemon():
     """Run continuously as a background scheduler"""
+    asyncio.run(daemon_loop())
+
+async def daemon_loop():
+    """Async daemon loop - agent runs stream output while the loop stays responsive"""
     global running
+    runner = AgentRunner(log)
+    pool = None
     
     print("""
 ╔══════════════════════════════════════════════════════════════╗
 ║          🛡️  SAKHI - Women Safety Guardian Scheduler         ║
 ║                                                              ║
-║  Running in daemon mode - checking every 30 minutes          ║
+║  Running in daemon mode - reminders fire on time             ║
 ║  Press Ctrl+C to stop                                        ║
 ╚══════════════════════════════════════════════════════════════╝
 """)
     
     log(f"📁 Watching: {TRIPS_FILE}")
-    log(f"⏰ Check interval: {CHECK_INTERVAL_MINUTES} minutes")
+    log(f"🗄️ Trips store: {TRIPS_DB}")
+    log(f"👀 File watch interval: {WATCH_INTERVAL_SECONDS} seconds")
     log(f"🔔 Reminder window: {REMINDER_HOURS_BEFORE} hours before trip")
     
+    if AGENT_POOL_SIZE > 0:
+        pool = AgentPool(runner, AGENT_NAME, get_warm_kiro_command(), log, size=AGENT_POOL_SIZE)
+        await pool.start()
+    
+    queue = TripQueue(TRIPS_FILE, TripStore(TRIPS_DB), REMINDER_HOURS_BEFORE, log)
+    outbox = open_outbox()
+    pipeline = ReminderPipeline(runner, outbox, pool)
+    
+    try:
+        await watch_trips(queue, pipeline)
+    finally:
+        await pipeline.cancel()
+        outbox.close()
+        if pool:
+            await pool.close()
+
+async def watch_trips(queue, pipeline):
+    """Fire reminders as they fall due; report generation continues in the background"""
     while running:
-        check_and_send_reminders()
+        changed = await asyncio.to_thread(queue.refresh)
+        handled = await process_due_trips(queue, pipeline)
         
         if not running:
             break
-            
-        log(f"💤 Sleeping for {CHECK_INTERVAL_MINUTES} minutes...")
         
-        # Sleep in small intervals to allow quick Ctrl+C response
-        for _ in range(CHECK_INTERVAL_MINUTES * 60):
-            if not running:
-                break
-            time.sleep(1)
+        # Sleep exactly until the next reminder, waking periodically to pick up trips.json edits
+        wait = queue.seconds_until_next(datetime.now())
+        if changed or handled:
+            if wait is None:
+                log("💤 No pending reminders")
+            else:
+                hours, remainder = divmod(int(wait), 3600)
+                log(f"💤 {len(queue)} reminder(s) pending, next in {hours}h {remainder // 60}m")
+        
+        await asyncio.sleep(WATCH_INTERVAL_SECONDS if wait is None else min(wait, WATCH_INTERVAL_SECONDS))
 
 def print_help():
     """Print usage help"""
@@ -284,7 +418,8 @@ Environment:
 
 Configuration:
   Edit the constants at the top of this file:
-  - CHECK_INTERVAL_MINUTES = 30   How often to check (in minutes)
+  - WATCH_INTERVAL_SECONDS = 5    How often trips.json is checked for changes
+  - RETRY_MINUTES = 30            Retry delay after a failed reminder
   - REMINDER_HOURS_BEFORE = 4     Send reminder X hours before trip
 """)
 
@@ -5,10 +5,9 @@ Polls SOS server every 30 seconds and invokes uber-emergency-booker agent for pe
 Just run: python sos_scheduler.py
 """
 
+import asyncio
 import json
-import subprocess
 import shutil
-import os
 import sys
 import time
 import signal
@@ -17,6 +16,9 @@ import urllib.error
 from datetime import datetime
 from pathlib import Path
 
+from agent_pool import AgentPool, build_warm_command
+from agent_runner import AgentRunner
+
 # Sound alert for Windows
 def play_alert_sound():
     """Play alert sound on SOS detection"""
@@ -37,6 +39,8 @@ def play_alert_sound():
 SOS_SERVER_URL = "https://serverforridebooking.onrender.com"
 AGENT_NAME = "uber-emergency-booker"
 CHECK_INTERVAL_SECONDS = 30  # How often to poll for SOS (configurable)
+AGENT_TIMEOUT_SECONDS = 180  # 3 minutes timeout for Uber booking
+AGENT_POOL_SIZE = 2  # Pre-spawned agent sessions kept warm in daemon mode (0 disables)
 
 # WSL kiro-cli path - UPDATE THIS to your WSL kiro-cli location
 # Find your path by running in WSL: which kiro-cli
@@ -103,6 +107,12 @@ def get_kiro_command(agent_query):
             agent_query
         ]
 
+def get_warm_kiro_command():
+    """Launcher for pooled sessions - waits for the query on stdin, then runs kiro-cli"""
+    if sys.platform == 'win32':
+        return build_warm_command(KIRO_CLI_WSL_PATH, AGENT_NAME, wsl=True)
+    return build_warm_command(find_kiro_cli(), AGENT_NAME)
+
 def log(message):
     """Print with timestamp"""
     timestamp = datetime.now().strftime("%H:%M:%S")
@@ -134,11 +144,11 @@ def mark_completed(request_id):
         log(f"⚠️ Could not mark {request_id} as complete: {e}")
         return False
 
-def process_sos_request(request):
+async def process_sos_request(request, runner, pool=None):
     """Invoke uber-emergency-booker agent for a single SOS request"""
     
     # Play alert sound
-    play_alert_sound()
+    await asyncio.to_thread(play_alert_sound)
     
     request_id = request.get('id', 'unknown')
     lat = request.get('latitude', 0)
@@ -175,63 +185,77 @@ This is a real emergency - act quickly and efficiently!"""
     try:
         log(f"🤖 Invoking {AGENT_NAME} agent via WSL...")
         
-        cmd = get_kiro_command(agent_query)
-        
-        result = subprocess.run(
-            cmd,
-            capture_output=True,
-            text=True,
-            timeout=180,  # 3 minutes timeout for Uber booking
-            env={**os.environ, "KIRO_AUTO_APPROVE": "true"},
-            encoding='utf-8',
-            errors='replace'
-        )
+        if pool:
+            result = await pool.run(agent_query, timeout=AGENT_TIMEOUT_SECONDS, label=f"SOS #{request_id}")
+        else:
+            cmd = get_kiro_command(agent_query)
+            
+            result = await runner.run(
+                AGENT_NAME,
+                cmd,
+                timeout=AGENT_TIMEOUT_SECONDS,
+                label=f"SOS #{request_id}"
+            )
         
-        if result.returncode == 0:
-            log(f"✅ Agent completed for request #{request_id}")
+        if result.ok:
+            log(f"✅ Agent completed for request #{request_id} in {result.elapsed:.1f}s")
             # Mark as completed on server
-            if mark_completed(request_id):
+            if await asyncio.to_thread(mark_completed, request_id):
                 log(f"✅ Request #{request_id} marked as completed")
             return True
+        elif result.timed_out:
+            log(f"⏰ Agent timed out for request #{request_id}")
+            return False
         else:
-            log(f"❌ Agent error: {result.stderr[:200] if result.stderr else 'unknown'}")
+            log(f"❌ Agent error: {result.error_summary()}")
             return False
             
-    except subprocess.TimeoutExpired:
-        log(f"⏰ Agent timed out for request #{request_id}")
-        return False
     except Exception as e:
         log(f"❌ Error: {e}")
         return False
 
-def check_and_process_sos():
-    """Main loop - check for pending SOS requests and process them"""
+async def dispatch_pending(runner, in_flight, pool=None):
+    """Start an agent task for every pending request not already being handled"""
     
-    pending = get_pending_requests()
+    pending = await asyncio.to_thread(get_pending_requests)
+    new_requests = [r for r in pending if r.get('id', 'unknown') not in in_flight]
     
-    if not pending:
-        return
+    if not new_requests:
+        return []
     
-    log(f"🚨 {len(pending)} PENDING SOS REQUEST(S)!")
+    log(f"🚨 {len(new_requests)} PENDING SOS REQUEST(S)!")
     
-    for request in pending:
-        if not running:
-            break
-        process_sos_request(request)
-        
-        # Small delay between requests to avoid overwhelming the system
-        if running and len(pending) > 1:
-            time.sleep(2)
+    tasks = []
+    for request in new_requests:
+        request_id = request.get('id', 'unknown')
+        task = asyncio.create_task(process_sos_request(request, runner, pool))
+        in_flight[request_id] = task
+        task.add_done_callback(lambda _, rid=request_id: in_flight.pop(rid, None))
+        tasks.append(task)
+    return tasks
+
+async def check_and_process_sos(runner):
+    """Check for pending SOS requests and process them concurrently"""
+    tasks = await dispatch_pending(runner, {})
+    if tasks:
+        await asyncio.gather(*tasks)
 
 def run_once():
     """Run a single check"""
     log("🔄 Running single SOS check...")
-    check_and_process_sos()
+    asyncio.run(check_and_process_sos(AgentRunner(log)))
     log("✅ Check complete")
 
 def run_daemon():
     """Run continuously as a background scheduler"""
+    asyncio.run(daemon_loop())
+
+async def daemon_loop():
+    """Async daemon loop - keeps polling while agents book rides in the background"""
     global running
+    runner = AgentRunner(log)
+    in_flight = {}
+    pool = None
     
     print("""
 ╔══════════════════════════════════════════════════════════════╗
@@ -246,29 +270,31 @@ def run_daemon():
     log(f"⏰ Check interval: {CHECK_INTERVAL_SECONDS} seconds")
     log(f"🤖 Agent: {AGENT_NAME}")
     
-    while running:
-        pending = get_pending_requests()
-        
-        if pending:
-            log(f"🚨 {len(pending)} PENDING SOS REQUEST(S)!")
+    if AGENT_POOL_SIZE > 0:
+        pool = AgentPool(runner, AGENT_NAME, get_warm_kiro_command(), log, size=AGENT_POOL_SIZE)
+        await pool.start()
+    
+    try:
+        while running:
+            started = await dispatch_pending(runner, in_flight, pool)
+            
+            if not started and not in_flight:
+                log("✓ No pending SOS requests")
+            elif in_flight:
+                log(f"🤖 {len(in_flight)} agent run(s) in progress")
             
-            for request in pending:
-                if not running:
-                    break
-                process_sos_request(request)
-                if running and len(pending) > 1:
-                    time.sleep(2)
-        else:
-            log("✓ No pending SOS requests")
-        
-        if not running:
-            break
-        
-        # Sleep in small intervals for quick Ctrl+C response
-        for _ in range(CHECK_INTERVAL_SECONDS):
             if not running:
                 break
-            time.sleep(1)
+            
+            # Sleep in small intervals for quick Ctrl+C response
+            for _ in range(CHECK_INTERVAL_SECONDS):
+                if not running:
+                    break
+                await asyncio.sleep(1)
+    finally:
+        if pool:
+            await pool.close()
+        await runner.cancel_all()
 
 def print_help():
     """Print usage help"""
@@ -1,5 +1,6 @@
 """News Dashboard MCP Server - Women Safety News Aggregation."""
 
 from .server import main, WomenSafetyNewsMCP
+from .profiles import KeywordProfile, WOMEN_SAFETY, LEGACY_DASHBOARD, get_profile
 
-__all__ = ["main", "WomenSafetyNewsMCP"]
+__all__ = ["main", "WomenSafetyNewsMCP", "KeywordProfile", "WOMEN_SAFETY", "LEGACY_DASHBOARD", "get_profile"]
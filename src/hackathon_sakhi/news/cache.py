@@ -0,0 +1,89 @@
+"""Persistent per-feed cache for conditional GET requests."""
+
+import os
+import json
+import logging
+import threading
+from dataclasses import asdict
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from ..paths import default_cache_dir
+from .models import Article
+
+
+class FeedCache:
+    """Stores ETag / Last-Modified validators and parsed entries per feed URL."""
+
+    def __init__(self, path: Optional[Path] = None):
+        self.path = path or default_cache_dir() / "feeds.json"
+        self.logger = logging.getLogger(f"{__name__}.{self.__class__.__name__}")
+        self._lock = threading.Lock()
+        self._dirty = False
+        self._entries: Dict[str, Dict] = self._load()
+
+    def _load(self) -> Dict[str, Dict]:
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return {}
+        except (OSError, json.JSONDecodeError) as e:
+            self.logger.warning(f"Ignoring unreadable feed cache {self.path}: {str(e)}")
+            return {}
+
+    def request_headers(self, url: str) -> Dict[str, str]:
+        """Conditional request headers for a feed, empty if it was never fetched."""
+        with self._lock:
+            entry = self._entries.get(url)
+        if not entry:
+            return {}
+        headers = {}
+        if entry.get("etag"):
+            headers["If-None-Match"] = entry["etag"]
+        if entry.get("last_modified"):
+            headers["If-Modified-Since"] = entry["last_modified"]
+        return headers
+
+    def get_articles(self, url: str) -> Optional[List[Article]]:
+        """Fresh Article objects for the cached entries of a feed, None if not cached or unreadable."""
+        with self._lock:
+            entry = self._entries.get(url)
+        if entry is None:
+            return None
+        try:
+            return [Article(**data) for data in entry["articles"]]
+        except (KeyError, TypeError) as e:
+            self.logger.warning(f"Ignoring unreadable cache entry for {url}: {str(e)}")
+            return None
+
+    def discard(self, url: str):
+        """Forget a feed's validators and entries, so its next request is unconditional."""
+        with self._lock:
+            if self._entries.pop(url, None) is not None:
+                self._dirty = True
+
+    def store(self, url: str, articles: List[Article], etag: Optional[str], last_modified: Optional[str]):
+        """Remember a feed's validators and parsed entries."""
+        with self._lock:
+            self._entries[url] = {
+                "etag": etag,
+                "last_modified": last_modified,
+                "articles": [asdict(article) for article in articles]
+            }
+            self._dirty = True
+
+    def save(self):
+        """Write the cache to disk if it changed."""
+        with self._lock:
+            if not self._dirty:
+                return
+            data = json.dumps(self._entries)
+            self._dirty = False
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = self.path.with_suffix(".tmp")
+            tmp_path.write_text(data, encoding="utf-8")
+            os.replace(tmp_path, self.path)
+        except OSError as e:
+            self.logger.warning(f"Could not save feed cache {self.path}: {str(e)}")
@@ -1,40 +1,112 @@
-"""Article clustering by location and category."""
+"""Article clustering into incidents."""
 
+import time
 import logging
-from typing import List
-from collections import defaultdict
+from typing import List, Optional
+from collections import Counter, defaultdict
 
 from .models import Article, ArticleCluster
+from .incidents import IncidentClusterer, assign_incidents
+from .processor import normalize_text
 
 
 class ArticleClusterer:
-    """Clusters articles by location and category."""
+    """Clusters articles into incidents."""
     
-    def __init__(self):
+    def __init__(self, half_life_hours: float = 24.0):
+        """
+        Args:
+            half_life_hours: Age at which an incident's ranking weight halves
+        """
+        self.half_life_hours = half_life_hours
         self.logger = logging.getLogger(f"{__name__}.{self.__class__.__name__}")
     
-    def cluster_articles(self, articles: List[Article]) -> List[ArticleCluster]:
-        """Cluster articles by location and category."""
-        # Group by location and category
-        groups = defaultdict(list)
+    def collapse_duplicates(self, articles: List[Article]) -> List[Article]:
+        """One article per story: syndicated copies move into their original's also_reported_by."""
+        originals = {}
+        for article in articles:
+            if article.duplicate_of is None:
+                article.also_reported_by = []
+                originals[article.key] = article
         
+        stories = []
         for article in articles:
-            key = (article.location or "Unknown", article.category or "general")
-            groups[key].append(article)
+            original = originals.get(article.duplicate_of) if article.duplicate_of else None
+            if original is not None:
+                original.also_reported_by.append(article)
+            else:
+                # Originals, and copies whose original is filtered out or pruned
+                stories.append(article)
+        return stories
+    
+    def cluster_articles(self, articles: List[Article], now: Optional[float] = None) -> List[ArticleCluster]:
+        """Cluster articles into incidents by content, counting syndicated copies once.
+        
+        Articles keep the incident assigned at ingest time; any without one
+        are clustered here, in order, with a fresh IncidentClusterer.
+        Clusters are ranked by report count weighted by recency (see rank).
+        """
+        stories = self.collapse_duplicates(articles)
+        
+        unassigned = [article for article in stories if article.incident_id is None]
+        if unassigned:
+            assign_incidents(
+                IncidentClusterer(),
+                unassigned,
+                [article.normalized or normalize_text(article.title, article.summary) for article in unassigned]
+            )
+        
+        # Group by incident
+        groups = defaultdict(list)
+        for article in stories:
+            groups[article.incident_id].append(article)
         
         # Create clusters
         clusters = []
-        for (location, category), group_articles in groups.items():
+        for incident_id, group_articles in groups.items():
+            published = [
+                report.published_at
+                for a in group_articles
+                for report in [a, *a.also_reported_by]
+                if report.published_at is not None
+            ]
+            location = self._most_common([a.location for a in group_articles if a.location], "Unknown")
+            category = self._most_common([a.category for a in group_articles if a.category], "general")
             cluster = ArticleCluster(
-                cluster_title=f"{category.title()} incidents in {location}",
+                cluster_title=group_articles[0].title,
                 location=location,
                 category=category,
-                incident_count=len(group_articles),
-                articles=group_articles
+                incident_count=1,
+                articles=group_articles,
+                incident_id=incident_id,
+                report_count=sum(1 + len(a.also_reported_by) for a in group_articles),
+                latest_published=max(published) if published else None
             )
             clusters.append(cluster)
         
-        # Sort by incident count
-        clusters.sort(key=lambda x: x.incident_count, reverse=True)
+        return self.rank(clusters, now)
+    
+    def rank(self, clusters: List[ArticleCluster], now: Optional[float] = None) -> List[ArticleCluster]:
+        """Set each cluster's score and sort best first.
         
+        score = report_count * 0.5 ** (age / half-life), with age taken from
+        the cluster's newest article. Undated clusters count as one half-life old.
+        """
+        now = time.time() if now is None else now
+        half_life = self.half_life_hours * 3600
+        # Ages for all clusters in one pass, then the weights, as flat lists
+        ages = [
+            half_life if c.latest_published is None else max(0.0, now - c.latest_published)
+            for c in clusters
+        ]
+        weights = [0.5 ** (age / half_life) for age in ages]
+        for cluster, weight in zip(clusters, weights):
+            cluster.score = cluster.report_count * weight
+        clusters.sort(key=lambda x: x.score, reverse=True)
         return clusters
+    
+    @staticmethod
+    def _most_common(values: List[str], default: str) -> str:
+        """Most frequent value, preferring known locations over "Unknown"."""
+        known = [value for value in values if value != "Unknown"] or values
+        return Counter(known).most_common(1)[0][0] if known else default
@@ -0,0 +1,44 @@
+"""Parsing of article publication dates."""
+
+import time
+import calendar
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Optional
+
+
+def parse_date(value: Optional[str]) -> Optional[float]:
+    """Epoch seconds for an RFC 822 (RSS) or ISO 8601 date string, or None if unparseable.
+
+    Dates without a timezone are taken as UTC.
+    """
+    if not value:
+        return None
+    value = value.strip()
+    try:
+        parsed = parsedate_to_datetime(value)
+    except (TypeError, ValueError, IndexError):
+        try:
+            parsed = datetime.fromisoformat(value.replace("Z", "+00:00"))
+        except ValueError:
+            return None
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return parsed.timestamp()
+
+
+def struct_to_epoch(value: Optional[time.struct_time]) -> Optional[float]:
+    """Epoch seconds for a UTC struct_time such as feedparser's *_parsed fields."""
+    if not value:
+        return None
+    try:
+        return float(calendar.timegm(value))
+    except (TypeError, ValueError, OverflowError):
+        return None
+
+
+def to_iso(epoch: Optional[float]) -> Optional[str]:
+    """ISO 8601 UTC timestamp for epoch seconds."""
+    if epoch is None:
+        return None
+    return datetime.fromtimestamp(epoch, tz=timezone.utc).isoformat(timespec="seconds")
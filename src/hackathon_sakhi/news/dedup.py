@@ -0,0 +1,104 @@
+"""Near-duplicate detection for syndicated stories (MinHash + LSH)."""
+
+import re
+import random
+import zlib
+from collections import defaultdict
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+_MERSENNE_PRIME = (1 << 61) - 1
+_WORD_RE = re.compile(r"\w+")
+
+
+class NearDuplicateDetector:
+    """Finds stories already seen under a different URL or feed.
+
+    Texts are split into word shingles and summarised as MinHash
+    signatures. Signatures are split into bands and indexed in LSH
+    buckets, so a new text is only compared with the few stored texts
+    that share a bucket, not with everything seen so far.
+    """
+
+    def __init__(self, num_perm: int = 64, bands: int = 16, shingle_size: int = 2,
+                 threshold: float = 0.5, seed: int = 1):
+        """
+        Args:
+            num_perm: MinHash signature length
+            bands: LSH bands; num_perm must be divisible by it
+            shingle_size: Words per shingle
+            threshold: Estimated Jaccard similarity at which texts count as duplicates
+        """
+        if num_perm % bands:
+            raise ValueError("num_perm must be divisible by bands")
+        self.num_perm = num_perm
+        self.bands = bands
+        self.rows = num_perm // bands
+        self.shingle_size = shingle_size
+        self.threshold = threshold
+        rng = random.Random(seed)
+        self._perms = [
+            (rng.randrange(1, _MERSENNE_PRIME), rng.randrange(0, _MERSENNE_PRIME))
+            for _ in range(num_perm)
+        ]
+        self._buckets: List[Dict[Tuple[int, ...], List[str]]] = [defaultdict(list) for _ in range(bands)]
+        self._signatures: Dict[str, Tuple[int, ...]] = {}
+
+    def __len__(self) -> int:
+        return len(self._signatures)
+
+    def _shingles(self, text: str) -> Set[int]:
+        words = _WORD_RE.findall(text)
+        size = min(self.shingle_size, len(words)) or 1
+        return {
+            zlib.crc32(" ".join(words[i:i + size]).encode("utf-8"))
+            for i in range(max(len(words) - size + 1, 1))
+        }
+
+    def signature(self, text: str) -> Tuple[int, ...]:
+        """MinHash signature of a normalised text."""
+        shingles = self._shingles(text)
+        return tuple(
+            min([(a * s + b) % _MERSENNE_PRIME for s in shingles])
+            for a, b in self._perms
+        )
+
+    def similarity(self, sig_a: Tuple[int, ...], sig_b: Tuple[int, ...]) -> float:
+        """Estimated Jaccard similarity of two signatures."""
+        return sum(1 for x, y in zip(sig_a, sig_b) if x == y) / self.num_perm
+
+    def find_or_add(self, key: str, text: str) -> Optional[str]:
+        """Return the key of a stored near-duplicate of `text`, or index it under `key` and return None."""
+        signature = self.signature(text)
+        bands = [signature[i * self.rows:(i + 1) * self.rows] for i in range(self.bands)]
+
+        candidates: Set[str] = set()
+        for band, bucket in zip(bands, self._buckets):
+            candidates.update(bucket.get(band, ()))
+
+        best_key, best_score = None, self.threshold
+        for candidate in candidates:
+            score = self.similarity(signature, self._signatures[candidate])
+            if score >= best_score:
+                best_key, best_score = candidate, score
+        if best_key is not None:
+            return best_key
+
+        self._signatures[key] = signature
+        for band, bucket in zip(bands, self._buckets):
+            bucket[band].append(key)
+        return None
+
+    def remove(self, keys: Iterable[str]):
+        """Forget indexed texts, e.g. articles pruned from the store; unknown keys are ignored."""
+        for key in keys:
+            signature = self._signatures.pop(key, None)
+            if signature is None:
+                continue
+            for i, bucket in enumerate(self._buckets):
+                band = signature[i * self.rows:(i + 1) * self.rows]
+                members = bucket.get(band)
+                if members is None:
+                    continue
+                members.remove(key)
+                if not members:
+                    del bucket[band]
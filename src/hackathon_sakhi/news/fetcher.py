@@ -1,44 +1,144 @@
 """Article fetcher from RSS feeds."""
 
 import logging
-from typing import List, Dict
+import threading
+from concurrent.futures import ThreadPoolExecutor, wait
+from typing import List, Dict, Optional
+from urllib.parse import urlparse
+
 import feedparser
+import requests
 
+from .cache import FeedCache
+from .dates import parse_date, struct_to_epoch
 from .models import Article
 
 
 class ArticleFetcher:
     """Fetches articles from RSS feeds."""
-    
-    def __init__(self):
+
+    def __init__(self, max_workers: int = 8, max_per_host: int = 2,
+                 deadline: float = 15.0, timeout: float = 10.0,
+                 cache: Optional[FeedCache] = None):
+        """
+        Args:
+            max_workers: Feeds fetched in parallel
+            max_per_host: Parallel requests allowed against a single host
+            deadline: Seconds fetch_all waits before returning what has finished
+            timeout: Per-request HTTP timeout in seconds
+            cache: Optional feed cache enabling conditional GET (ETag / Last-Modified)
+        """
+        self.max_workers = max_workers
+        self.max_per_host = max_per_host
+        self.deadline = deadline
+        self.timeout = timeout
+        self.cache = cache
+        self.session = requests.Session()
+        self.session.headers["User-Agent"] = feedparser.USER_AGENT
+        self._host_limits: Dict[str, threading.Semaphore] = {}
+        self._host_lock = threading.Lock()
         self.logger = logging.getLogger(f"{__name__}.{self.__class__.__name__}")
-    
+
     def fetch_rss(self, url: str) -> List[Article]:
         """Fetch articles from a single RSS feed."""
         try:
-            feed = feedparser.parse(url)
+            headers = self.cache.request_headers(url) if self.cache else {}
+            with self._host_limit(url):
+                response = self.session.get(url, headers=headers, timeout=self.timeout)
+
+            if response.status_code == 304:
+                cached = self.cache.get_articles(url) if self.cache else None
+                if cached is not None:
+                    self.logger.debug(f"Feed not modified: {url}")
+                    return cached
+                # The validators outlived the cached entries; an empty 304 body is not the feed
+                self.logger.info(f"Feed not modified but no cached copy, fetching it again: {url}")
+                if self.cache:
+                    self.cache.discard(url)
+                with self._host_limit(url):
+                    response = self.session.get(url, timeout=self.timeout)
+
+            response.raise_for_status()
+            feed = feedparser.parse(
+                response.content,
+                response_headers={"content-location": url, **response.headers}
+            )
             articles = []
-            
+
             for entry in feed.entries:
+                published = entry.get("published", "")
                 article = Article(
                     title=entry.title,
                     summary=entry.get("summary", ""),
-                    published=entry.get("published", ""),
+                    published=published,
                     url=entry.link,
-                    source=feed.feed.get("title", "Unknown")
+                    source=feed.feed.get("title", "Unknown"),
+                    guid=entry.get("id"),
+                    # feedparser has already normalised the date to UTC where it could parse it
+                    published_at=(
+                        struct_to_epoch(entry.get("published_parsed"))
+                        or struct_to_epoch(entry.get("updated_parsed"))
+                        or parse_date(published)
+                    )
                 )
                 articles.append(article)
-            
+
+            if self.cache:
+                self.cache.store(
+                    url,
+                    articles,
+                    etag=response.headers.get("ETag"),
+                    last_modified=response.headers.get("Last-Modified")
+                )
+                # Callers mutate articles during processing; keep the cached copy pristine
+                return self.cache.get_articles(url)
+
             return articles
         except Exception as e:
             self.logger.error(f"Error fetching RSS from {url}: {str(e)}")
             return []
-    
-    def fetch_all(self, sources: Dict[str, List[str]]) -> List[Article]:
-        """Fetch articles from all RSS sources."""
-        all_articles = []
-        for urls in sources.values():
+
+    def fetch_all(self, sources: Dict[str, List[str]], concurrent: bool = True) -> List[Article]:
+        """Fetch articles from all RSS sources.
+
+        In concurrent mode feeds are fetched in parallel and whatever has
+        finished when the deadline passes is returned; slower feeds are dropped.
+        """
+        urls = [url for group in sources.values() for url in group]
+
+        if not concurrent:
+            all_articles = []
             for url in urls:
-                articles = self.fetch_rss(url)
-                all_articles.extend(articles)
+                all_articles.extend(self.fetch_rss(url))
+            self._save_cache()
+            return all_articles
+
+        executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="rss")
+        try:
+            futures = [executor.submit(self.fetch_rss, url) for url in urls]
+            done, not_done = wait(futures, timeout=self.deadline)
+        finally:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+        if not_done:
+            late = [url for url, future in zip(urls, futures) if future in not_done]
+            self.logger.warning(f"Deadline of {self.deadline}s passed, skipping {len(late)} feed(s): {late}")
+
+        # Keep source order so results are stable between calls
+        all_articles = []
+        for future in futures:
+            if future in done:
+                all_articles.extend(future.result())
+        self._save_cache()
         return all_articles
+
+    def _save_cache(self):
+        if self.cache:
+            self.cache.save()
+
+    def _host_limit(self, url: str) -> threading.Semaphore:
+        host = urlparse(url).netloc
+        with self._host_lock:
+            if host not in self._host_limits:
+                self._host_limits[host] = threading.Semaphore(self.max_per_host)
+            return self._host_limits[host]
@@ -0,0 +1,215 @@
+"""Online content clustering of articles into incidents."""
+
+import re
+import math
+import zlib
+from collections import Counter, defaultdict
+from typing import Dict, List, Optional, Set
+
+from .models import Article
+
+_WORD_RE = re.compile(r"[a-z][a-z0-9]+")
+
+STOP_WORDS = frozenset("""
+a about after against all also an and any are as at be been being but by can could did do
+does for from had has have he her him his how i if in into is it its last more new no not
+of on one or our over said says she so than that the their them there these they this to
+two up was we were what when where which while who will with would year years you
+""".split())
+
+
+class IncidentClusterer:
+    """Assigns articles to incidents one at a time.
+
+    Each article becomes a hashed TF-IDF vector (sparse dict, no vocabulary
+    to grow) with document frequencies learned as articles arrive. It joins
+    the incident whose centroid is most similar by cosine, or starts a new
+    incident. Candidate incidents come from an inverted index over each
+    article's highest-weighted terms, so an article is compared with the
+    few incidents sharing a distinctive term rather than with all of them.
+    """
+
+    def __init__(self, dimensions: int = 1 << 20, threshold: float = 0.3, top_terms: int = 10,
+                 max_postings: int = 32):
+        """
+        Args:
+            dimensions: Size of the hashed feature space
+            threshold: Minimum cosine similarity to join an existing incident
+            top_terms: Highest-weighted terms per article used to index and find incidents
+            max_postings: Most recent incidents kept per indexed term, bounding candidates per article
+        """
+        self.dimensions = dimensions
+        self.threshold = threshold
+        self.top_terms = top_terms
+        self.max_postings = max_postings
+        self._doc_freq: Counter = Counter()
+        self._docs = 0
+        self._centroids: Dict[str, Dict[int, float]] = {}
+        self._norms: Dict[str, float] = {}
+        self._locations: Dict[str, Optional[str]] = {}
+        self._postings: Dict[int, Dict[str, None]] = defaultdict(dict)
+        self._incident_of: Dict[str, str] = {}
+        self._members: Counter = Counter()
+
+    def __len__(self) -> int:
+        return len(self._centroids)
+
+    def incident_of(self, key: str) -> Optional[str]:
+        """Incident id an article key was assigned to."""
+        return self._incident_of.get(key)
+
+    def _features(self, text: str) -> Counter:
+        return Counter(
+            zlib.crc32(word.encode("utf-8")) % self.dimensions
+            for word in _WORD_RE.findall(text)
+            if word not in STOP_WORDS
+        )
+
+    def vectorize(self, text: str, learn: bool = True) -> Dict[int, float]:
+        """L2-normalised TF-IDF vector of a normalised text, optionally updating document frequencies."""
+        counts = self._features(text)
+        if learn:
+            self._docs += 1
+            self._doc_freq.update(counts.keys())
+        docs = self._docs
+        vector = {
+            feature: (1 + math.log(count)) * (math.log((1 + docs) / (1 + self._doc_freq[feature])) + 1)
+            for feature, count in counts.items()
+        }
+        norm = math.sqrt(sum(weight * weight for weight in vector.values()))
+        if norm:
+            for feature in vector:
+                vector[feature] /= norm
+        return vector
+
+    def assign(self, key: str, text: str, location: Optional[str] = None,
+               incident: Optional[str] = None) -> str:
+        """Add an article and return its incident id (the key of the incident's first article).
+
+        Args:
+            key: Article key
+            text: Normalised title and summary
+            location: Known location; incidents in a different known location are never joined
+            incident: Join this incident instead of searching (e.g. for a syndicated copy)
+        """
+        if key in self._incident_of:
+            return self._incident_of[key]
+
+        vector = self.vectorize(text)
+        if not vector:
+            return self._add(key, key, vector, location)
+        top = sorted(vector, key=vector.get, reverse=True)[:self.top_terms]
+
+        if incident is None or incident not in self._centroids:
+            incident = None
+            candidates: Set[str] = set()
+            for feature in top:
+                candidates.update(self._postings.get(feature, ()))
+
+            best = self.threshold
+            for candidate in candidates:
+                if not self._compatible(self._locations[candidate], location):
+                    continue
+                norm = self._norms[candidate]
+                if not norm:
+                    continue
+                centroid = self._centroids[candidate]
+                # Key-view intersection runs in C; few terms are shared with most candidates
+                dot = sum(vector[feature] * centroid[feature] for feature in vector.keys() & centroid.keys())
+                score = dot / norm
+                if score >= best:
+                    incident, best = candidate, score
+
+        self._index(top, incident or key)
+        return self._add(key, incident or key, vector, location)
+
+    def restore(self, key: str, text: str, incident: str, location: Optional[str] = None) -> str:
+        """Add an article to a known incident without searching, e.g. when reloading stored ids.
+
+        The incident is created under the given id if it does not exist yet,
+        so ids handed out before a restart stay valid.
+        """
+        if key in self._incident_of:
+            return self._incident_of[key]
+        vector = self.vectorize(text)
+        self._index(sorted(vector, key=vector.get, reverse=True)[:self.top_terms], incident)
+        return self._add(key, incident, vector, location)
+
+    def remove(self, key: str, text: str):
+        """Forget an article, e.g. one pruned from the store; unknown keys are ignored.
+
+        Document frequencies drop the article's terms. An incident left without
+        articles is deleted; one that still has articles keeps its id and its
+        centroid, so later reports of the same incident still join it.
+        """
+        incident = self._incident_of.pop(key, None)
+        if incident is None:
+            return
+        self._docs -= 1
+        for feature in self._features(text):
+            count = self._doc_freq[feature] - 1
+            if count > 0:
+                self._doc_freq[feature] = count
+            else:
+                del self._doc_freq[feature]
+
+        self._members[incident] -= 1
+        if self._members[incident] > 0:
+            return
+        del self._members[incident]
+        centroid = self._centroids.pop(incident, {})
+        self._norms.pop(incident, None)
+        self._locations.pop(incident, None)
+        for feature in centroid:
+            posting = self._postings.get(feature)
+            if posting is not None:
+                posting.pop(incident, None)
+                if not posting:
+                    del self._postings[feature]
+
+    def _index(self, top: List[int], incident: str):
+        for feature in top:
+            # Insertion-ordered dict as an ordered set: oldest incidents drop off first
+            posting = self._postings[feature]
+            posting.pop(incident, None)
+            posting[incident] = None
+            if len(posting) > self.max_postings:
+                del posting[next(iter(posting))]
+
+    def _add(self, key: str, incident: str, vector: Dict[int, float], location: Optional[str]) -> str:
+        centroid = self._centroids.setdefault(incident, {})
+        if self._locations.get(incident) is None:
+            self._locations[incident] = location
+
+        # |c + v|^2 = |c|^2 + 2 c.v + |v|^2, with |v| = 1 (or 0 for an empty text)
+        norm_sq = self._norms.get(incident, 0.0) ** 2
+        for feature, weight in vector.items():
+            previous = centroid.get(feature, 0.0)
+            norm_sq += 2 * previous * weight + weight * weight
+            centroid[feature] = previous + weight
+        self._norms[incident] = math.sqrt(max(norm_sq, 0.0))
+        self._incident_of[key] = incident
+        self._members[incident] += 1
+        return incident
+
+    @staticmethod
+    def _compatible(a: Optional[str], b: Optional[str]) -> bool:
+        return a is None or b is None or a == b
+
+
+def known_location(location: Optional[str]) -> Optional[str]:
+    """Location usable as a clustering constraint (None for missing or "Unknown")."""
+    if not location or location.lower() == "unknown":
+        return None
+    return location
+
+
+def assign_incidents(clusterer: IncidentClusterer, articles: List[Article], texts: List[str]):
+    """Set incident_id on articles in order, keeping syndicated copies with their original."""
+    for article, text in zip(articles, texts):
+        article.incident_id = clusterer.assign(
+            article.key,
+            text,
+            location=known_location(article.location),
+            incident=clusterer.incident_of(article.duplicate_of) if article.duplicate_of else None
+        )
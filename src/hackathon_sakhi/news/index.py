@@ -0,0 +1,192 @@
+"""In-memory inverted index over stored safety articles."""
+
+import re
+import math
+import heapq
+import bisect
+import logging
+import threading
+from collections import Counter, defaultdict
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from .dates import parse_date
+from .incidents import STOP_WORDS
+from .models import Article
+from .processor import normalize_text
+
+_TERM_RE = re.compile(r"[a-z0-9]+")
+
+
+def tokenize(text: str) -> List[str]:
+    """Index terms of a normalised text."""
+    return [term for term in _TERM_RE.findall(text) if term not in STOP_WORDS]
+
+
+class ArticleIndex:
+    """Postings for terms, city, category and source, plus a sorted date list.
+
+    Filters are answered with set operations on postings and results are
+    ranked with BM25 over the query terms, so a query costs time in the
+    size of the matching postings rather than the size of the archive.
+    """
+
+    FIELDS = ("city", "category", "source")
+
+    def __init__(self, k1: float = 1.2, b: float = 0.75):
+        self.k1 = k1
+        self.b = b
+        self.logger = logging.getLogger(f"{__name__}.{self.__class__.__name__}")
+        self._lock = threading.Lock()
+        self._clear()
+
+    def _clear(self):
+        self._articles: Dict[int, Article] = {}
+        self._keys: Dict[str, int] = {}
+        self._lengths: Dict[int, int] = {}
+        self._total_length = 0
+        self._terms: Dict[str, Dict[int, int]] = defaultdict(dict)
+        self._fields: Dict[str, Dict[str, Set[int]]] = {field: defaultdict(set) for field in self.FIELDS}
+        self._dates: List[Tuple[float, int]] = []
+        self._published: Dict[int, float] = {}
+        self._next_id = 0
+
+    def __len__(self) -> int:
+        return len(self._articles)
+
+    def rebuild(self, articles: Iterable[Article]):
+        """Replace the index contents, e.g. after the store pruned old articles."""
+        with self._lock:
+            self._clear()
+            self._add(articles)
+        self.logger.debug(f"Rebuilt article index with {len(self._articles)} article(s)")
+
+    def add(self, articles: Iterable[Article]):
+        """Index articles; ones already indexed (by key) are skipped."""
+        with self._lock:
+            self._add(articles)
+
+    def remove(self, keys: Iterable[str]):
+        """Drop articles by key, e.g. after the store pruned them; unknown keys are ignored."""
+        with self._lock:
+            docs = {self._keys.pop(key) for key in keys if key in self._keys}
+            if not docs:
+                return
+            for doc in docs:
+                article = self._articles.pop(doc)
+                for term in set(tokenize(article.normalized or normalize_text(article.title, article.summary))):
+                    postings = self._terms.get(term)
+                    if postings is not None:
+                        postings.pop(doc, None)
+                        if not postings:
+                            del self._terms[term]
+                self._total_length -= self._lengths.pop(doc, 0)
+                for field, value in zip(self.FIELDS, (article.location, article.category, article.source)):
+                    if value:
+                        postings = self._fields[field].get(value.lower())
+                        if postings is not None:
+                            postings.discard(doc)
+                            if not postings:
+                                del self._fields[field][value.lower()]
+                self._published.pop(doc, None)
+            self._dates = [entry for entry in self._dates if entry[1] not in docs]
+
+    def _add(self, articles: Iterable[Article]):
+        dated = []
+        for article in articles:
+            if article.key in self._keys:
+                continue
+            doc = self._next_id
+            self._next_id += 1
+            self._articles[doc] = article
+            self._keys[article.key] = doc
+
+            terms = Counter(tokenize(article.normalized or normalize_text(article.title, article.summary)))
+            for term, count in terms.items():
+                self._terms[term][doc] = count
+            length = sum(terms.values())
+            self._lengths[doc] = length
+            self._total_length += length
+
+            for field, value in zip(self.FIELDS, (article.location, article.category, article.source)):
+                if value:
+                    self._fields[field][value.lower()].add(doc)
+
+            published = article.published_at
+            if published is None:
+                published = parse_date(article.published)
+            if published is not None:
+                self._published[doc] = published
+                dated.append((published, doc))
+        if dated:
+            # One sort per batch; timsort merges the already sorted runs cheaply
+            self._dates.extend(dated)
+            self._dates.sort()
+
+    def search(self, all_terms: str = "", any_terms: str = "", exclude_terms: str = "",
+               cities: Optional[List[str]] = None, categories: Optional[List[str]] = None,
+               sources: Optional[List[str]] = None, since: Optional[float] = None,
+               until: Optional[float] = None, limit: int = 10) -> Tuple[int, List[Tuple[float, Article]]]:
+        """Find articles matching boolean filters, best first.
+
+        Args:
+            all_terms: Words that must all appear
+            any_terms: Words of which at least one must appear
+            exclude_terms: Words that must not appear
+            cities, categories, sources: Allowed values per field (any of, case-insensitive)
+            since, until: Published date range in epoch seconds (undated articles are excluded)
+            limit: Number of results to return
+
+        Returns:
+            Total number of matches and the top `limit` (score, article) pairs.
+            Without query terms, matches are ordered newest first with a score of 0.
+        """
+        required = tokenize(normalize_text(all_terms, ""))
+        optional = tokenize(normalize_text(any_terms, ""))
+        excluded = tokenize(normalize_text(exclude_terms, ""))
+
+        with self._lock:
+            candidates: Optional[Set[int]] = None
+
+            def narrow(docs: Iterable[int]):
+                nonlocal candidates
+                candidates = set(docs) if candidates is None else candidates.intersection(docs)
+
+            # Smallest postings first keeps the intersections cheap
+            for term in sorted(set(required), key=lambda t: len(self._terms.get(t, ()))):
+                narrow(self._terms.get(term, {}).keys())
+            if optional:
+                narrow(set().union(*(self._terms.get(term, {}).keys() for term in optional)))
+            for field, values in zip(self.FIELDS, (cities, categories, sources)):
+                if values:
+                    postings = self._fields[field]
+                    narrow(set().union(*(postings.get(value.lower(), set()) for value in values)))
+            if since is not None or until is not None:
+                low = bisect.bisect_left(self._dates, (since if since is not None else -math.inf, -1))
+                high = bisect.bisect_right(self._dates, (until if until is not None else math.inf, math.inf))
+                narrow({doc for _, doc in self._dates[low:high]})
+
+            if candidates is None:
+                candidates = set(self._articles)
+            for term in excluded:
+                candidates.difference_update(self._terms.get(term, {}).keys())
+
+            query_terms = set(required) | set(optional)
+            if query_terms:
+                top = heapq.nlargest(limit, ((self._bm25(doc, query_terms), doc) for doc in candidates))
+            else:
+                newest = heapq.nlargest(limit, candidates, key=lambda doc: self._published.get(doc, 0.0))
+                top = [(0.0, doc) for doc in newest]
+            return len(candidates), [(score, self._articles[doc]) for score, doc in top]
+
+    def _bm25(self, doc: int, terms: Set[str]) -> float:
+        count = len(self._articles)
+        average = self._total_length / count if count else 0.0
+        norm = self.k1 * (1 - self.b + self.b * self._lengths[doc] / (average or 1.0))
+        score = 0.0
+        for term in terms:
+            postings = self._terms.get(term)
+            tf = postings.get(doc) if postings else None
+            if tf:
+                idf = math.log(1 + (count - len(postings) + 0.5) / (len(postings) + 0.5))
+                score += idf * tf * (self.k1 + 1) / (tf + norm)
+        return score
@@ -0,0 +1,147 @@
+"""Background ingestion of RSS feeds into the article store."""
+
+import logging
+import threading
+from typing import List, Optional
+
+from .sources import RSSSourcesInterface
+from .fetcher import ArticleFetcher
+from .processor import ArticleProcessor, normalize_text
+from .store import ArticleStore
+from .dedup import NearDuplicateDetector
+from .incidents import IncidentClusterer, assign_incidents, known_location
+from .index import ArticleIndex
+from .models import Article
+
+
+class NewsIngester:
+    """Polls RSS sources and processes each new article exactly once."""
+
+    def __init__(self, sources: RSSSourcesInterface, fetcher: ArticleFetcher,
+                 processor: ArticleProcessor, store: ArticleStore, interval: float = 900,
+                 retention_days: float = 7, workers: int = 0,
+                 index: Optional[ArticleIndex] = None):
+        """
+        Args:
+            interval: Seconds between polls of the RSS sources
+            retention_days: Articles no feed has served for this long are dropped from the store
+            workers: Processes used for large batches (0 = process in the ingester thread)
+            index: Optional search index kept in step with the store's safety articles
+        """
+        self.sources = sources
+        self.fetcher = fetcher
+        self.processor = processor
+        self.store = store
+        self.interval = interval
+        self.retention_seconds = retention_days * 86400
+        self.workers = workers
+        self.index = index
+        self.logger = logging.getLogger(f"{__name__}.{self.__class__.__name__}")
+        self._detector: Optional[NearDuplicateDetector] = None
+        self._incidents: Optional[IncidentClusterer] = None
+        self._ingest_lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def ingest_once(self) -> int:
+        """Fetch all feeds and store the articles not seen before. Returns how many were new."""
+        with self._ingest_lock:
+            articles = self.fetcher.fetch_all(self.sources.get_sources())
+
+            # Deduplicate within the batch (syndicated feeds repeat items) and against the store
+            unique = {}
+            for article in articles:
+                unique.setdefault(article.key, article)
+            known = self.store.existing_keys(unique.keys())
+            self.store.mark_seen(known)
+            new_articles = [a for key, a in unique.items() if key not in known]
+
+            processed = self.processor.process_batch(new_articles, workers=self.workers)
+            safety_keys = {article.key for article in processed}
+            others = [a for a in new_articles if a.key not in safety_keys]
+
+            # Syndicated copies of a story get different guids/URLs; link them to the first copy
+            texts = [a.normalized or normalize_text(a.title, a.summary) for a in processed]
+            detector = self._duplicate_detector()
+            duplicates = 0
+            for article, text in zip(processed, texts):
+                article.duplicate_of = detector.find_or_add(article.key, text)
+                if article.duplicate_of:
+                    duplicates += 1
+            assign_incidents(self._incident_clusterer(), processed, texts)
+
+            self.store.add(processed + others, safety_keys)
+            if self.index is not None:
+                self.index.add(processed)
+            pruned = self.store.prune(self.retention_seconds)
+            if pruned:
+                self._forget(pruned)
+            self.logger.info(
+                f"Ingested {len(new_articles)} new article(s) "
+                f"({len(safety_keys)} safety related, {duplicates} syndicated copies) "
+                f"from {len(articles)} fetched"
+            )
+            return len(new_articles)
+
+    def _duplicate_detector(self) -> NearDuplicateDetector:
+        """Detector indexing the stored safety articles that are not themselves copies."""
+        if self._detector is None:
+            detector = NearDuplicateDetector()
+            for article in self.store.safety_articles():
+                if article.duplicate_of is None:
+                    detector.find_or_add(article.key, normalize_text(article.title, article.summary))
+            self._detector = detector
+        return self._detector
+
+    def _incident_clusterer(self) -> IncidentClusterer:
+        """Incident clusterer reloaded from the stored safety articles, oldest first.
+
+        Articles keep the incident id stored with them, so ids already handed
+        to clients stay valid; only articles stored without one are clustered.
+        """
+        if self._incidents is None:
+            clusterer = IncidentClusterer()
+            unassigned, texts = [], []
+            for article in self.store.safety_articles():
+                text = normalize_text(article.title, article.summary)
+                if article.incident_id:
+                    clusterer.restore(article.key, text, article.incident_id, known_location(article.location))
+                else:
+                    unassigned.append(article)
+                    texts.append(text)
+            if unassigned:
+                assign_incidents(clusterer, unassigned, texts)
+                self.store.set_incident_ids({a.key: a.incident_id for a in unassigned})
+            self._incidents = clusterer
+        return self._incidents
+
+    def _forget(self, articles: List[Article]):
+        """Drop pruned safety articles from the duplicate, incident and search indexes."""
+        keys = [article.key for article in articles]
+        if self._detector is not None:
+            self._detector.remove(keys)
+        if self._incidents is not None:
+            for article in articles:
+                self._incidents.remove(article.key, normalize_text(article.title, article.summary))
+        if self.index is not None:
+            self.index.remove(keys)
+
+    def start(self):
+        """Start polling in a daemon thread."""
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="news-ingester", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """Stop polling after the current ingestion finishes."""
+        self._stop.set()
+
+    def _run(self):
+        while not self._stop.is_set():
+            try:
+                self.ingest_once()
+            except Exception as e:
+                self.logger.error(f"News ingestion failed: {str(e)}")
+            self._stop.wait(self.interval)
@@ -0,0 +1,99 @@
+"""Multi-group keyword matcher with word-boundary awareness."""
+
+from typing import Dict, List, Optional, Tuple
+
+
+class KeywordMatcher:
+    """Matches keyword groups against lowercase text.
+
+    Keywords are registered in groups (e.g. safety, location, category)
+    and each group reports the value of its first matching keyword in
+    registration order, mirroring the original keyword-list scans.
+
+    A match must start at a word boundary, so "rape" does not fire inside
+    "grape". Whole-word keywords must also end at one, so "kota" does not
+    fire inside "kotak" or "dakota". Other keywords still match inflected
+    forms ("kidnap" in "kidnapped").
+
+    Each keyword is probed with a plain substring search and a group stops
+    at its first hit, so matching costs about the same as the keyword-list
+    scans it replaced; the point is boundary-correct matching, not speed.
+    """
+
+    def __init__(self):
+        self._groups: Dict[str, List[Tuple[str, str, bool]]] = {}
+        self._tables: Dict[str, Tuple[Tuple[str, str, bool], ...]] = {}
+
+    def add(self, group: str, keywords: List[str], value: Optional[str] = None,
+            whole_word: bool = False):
+        """Register keywords for a group, reporting `value` (default: the keyword itself)."""
+        entries = self._groups.setdefault(group, [])
+        for keyword in keywords:
+            keyword = keyword.lower()
+            entries.append((keyword, value if value is not None else keyword, whole_word))
+        self._tables = {}
+
+    def freeze(self):
+        """Build each group's table: its keywords in registration order, duplicates dropped.
+
+        Called automatically on first use after add().
+        """
+        tables = {}
+        for group, entries in self._groups.items():
+            seen = set()
+            table = []
+            for keyword, value, whole_word in entries:
+                if keyword not in seen:
+                    seen.add(keyword)
+                    table.append((keyword, value, whole_word))
+            tables[group] = tuple(table)
+        self._tables = tables
+
+    def first(self, group: str, text: str) -> Optional[str]:
+        """Value of the first keyword of `group` found in `text` (already lowercase)."""
+        if not self._tables:
+            self.freeze()
+        if group not in self._tables:
+            return None
+
+        for keyword, value, whole_word in self._tables[group]:
+            # Locate and boundary-check only keywords that occur at all
+            if keyword in text and self._bounded(text, keyword, text.find(keyword), whole_word):
+                return value
+        return None
+
+    def match(self, text: str, gate: Optional[str] = None) -> Dict[str, str]:
+        """First value per group found in `text` (already lowercase).
+
+        If `gate` is given and that group has no match, the other groups are
+        not scanned and an empty dict is returned.
+        """
+        if not self._tables:
+            self.freeze()
+
+        matches = {}
+        if gate is not None:
+            value = self.first(gate, text)
+            if value is None:
+                return matches
+            matches[gate] = value
+
+        for group in self._tables:
+            if group != gate:
+                value = self.first(group, text)
+                if value is not None:
+                    matches[group] = value
+        return matches
+
+    @staticmethod
+    def _bounded(text: str, keyword: str, start: int, whole_word: bool) -> bool:
+        """True if keyword occurs at or after `start` on the required word boundaries."""
+        length = len(keyword)
+        end_of_text = len(text)
+        while start >= 0:
+            if start == 0 or not text[start - 1].isalnum():
+                end = start + length
+                if not whole_word or end == end_of_text or not text[end].isalnum():
+                    return True
+            start = text.find(keyword, start + 1)
+        return False
@@ -14,6 +14,22 @@ class Article:
     source: str
     location: Optional[str] = None
     category: Optional[str] = None
+    guid: Optional[str] = None
+    # `published` as epoch seconds, parsed once when the feed is fetched
+    published_at: Optional[float] = None
+    # Lowercased, HTML-stripped, accent-folded title + summary; filled by ArticleProcessor
+    normalized: Optional[str] = field(default=None, repr=False, compare=False)
+    # Key of the earlier article this one is a syndicated copy of, if any
+    duplicate_of: Optional[str] = None
+    # Syndicated copies collapsed into this article by ArticleClusterer
+    also_reported_by: List["Article"] = field(default_factory=list, repr=False, compare=False)
+    # Incident this article reports on; the key of the incident's first article
+    incident_id: Optional[str] = None
+
+    @property
+    def key(self) -> str:
+        """Deduplication key: the feed guid, falling back to the URL."""
+        return self.guid or self.url
 
 
 @dataclass
@@ -24,3 +40,10 @@ class ArticleCluster:
     category: str
     incident_count: int
     articles: List[Article] = field(default_factory=list)
+    incident_id: Optional[str] = None
+    # Articles reporting the cluster's incidents, syndicated copies included
+    report_count: int = 0
+    # Newest publication time among the cluster's articles (epoch seconds)
+    latest_published: Optional[float] = None
+    # Ranking score: report_count decayed by the age of latest_published
+    score: float = 0.0
@@ -1,64 +1,113 @@
 """Article processor for filtering and categorization."""
 
 import re
+import html
 import logging
-from typing import Optional
+import unicodedata
+from concurrent.futures import ProcessPoolExecutor
+from typing import List, Optional
 
+from .matcher import KeywordMatcher
 from .models import Article
+from .profiles import KeywordProfile, WOMEN_SAFETY
+
+_TAG_RE = re.compile(r"<[^>]+>")
+_SPACE_RE = re.compile(r"\s+")
+
+
+def normalize_text(title: str, summary: str) -> str:
+    """Lowercase, HTML-strip and Unicode-fold an article's title and summary."""
+    summary = html.unescape(_TAG_RE.sub(" ", summary))
+    text = f"{title} {summary}"
+    if not text.isascii():
+        text = unicodedata.normalize("NFKD", text)
+        text = "".join(ch for ch in text if not unicodedata.combining(ch))
+    return _SPACE_RE.sub(" ", text.casefold()).strip()
+
+
+def _process_chunk(processor: "ArticleProcessor", articles: List[Article],
+                   filter_location: Optional[str]) -> List[Article]:
+    """Process-pool worker for ArticleProcessor.process_batch."""
+    return processor.process_batch(articles, filter_location)
 
 
 class ArticleProcessor:
     """Processes and filters articles for women safety relevance."""
     
-    SAFETY_KEYWORDS = [
-        "women", "woman", "girl", "female", "lady",
-        "rape", "assault", "harassment", "molest", "abuse",
-        "murder", "killed", "attack", "violence", "crime",
-        "safety", "security", "stalking", "kidnap", "abduct",
-        "domestic violence", "dowry", "acid attack", "eve teasing"
-    ]
+    def __init__(self, profile: KeywordProfile = WOMEN_SAFETY):
+        """
+        Args:
+            profile: Keywords, cities and categories to classify with
+        """
+        self.profile = profile
+        self.logger = logging.getLogger(f"{__name__}.{self.__class__.__name__}")
+        self.matcher = KeywordMatcher()
+        self.matcher.add("safety", profile.safety_keywords)
+        self.matcher.add("location", profile.cities, whole_word=profile.whole_word_cities)
+        for category, keywords in profile.categories.items():
+            self.matcher.add("category", keywords, value=category)
+        self.matcher.freeze()
     
-    INDIAN_CITIES = [
-        "delhi", "mumbai", "bangalore", "bengaluru", "chennai",
-        "kolkata", "hyderabad", "pune", "ahmedabad", "jaipur",
-        "lucknow", "kanpur", "nagpur", "indore", "thane",
-        "bhopal", "visakhapatnam", "patna", "vadodara", "ghaziabad",
-        "ludhiana", "agra", "nashik", "faridabad", "meerut",
-        "rajkot", "varanasi", "srinagar", "aurangabad", "dhanbad",
-        "amritsar", "allahabad", "ranchi", "howrah", "coimbatore",
-        "jabalpur", "gwalior", "vijayawada", "jodhpur", "madurai",
-        "raipur", "kota", "chandigarh", "guwahati", "solapur",
-        "noida", "gurugram", "gurgaon"
-    ]
+    def _text(self, article: Article) -> str:
+        if article.normalized is None:
+            article.normalized = normalize_text(article.title, article.summary)
+        return article.normalized
     
-    CATEGORIES = {
-        "assault": ["rape", "assault", "molest", "attack", "violence"],
-        "harassment": ["harassment", "stalking", "eve teasing", "abuse"],
-        "kidnapping": ["kidnap", "abduct", "missing"],
-        "murder": ["murder", "killed", "death", "body found"],
-        "domestic": ["domestic violence", "dowry", "husband", "in-laws"],
-        "policy": ["law", "court", "police", "investigation", "arrest"]
-    }
+    def process_batch(self, articles: List[Article], filter_location: Optional[str] = None,
+                      workers: int = 0, chunk_size: int = 2000) -> List[Article]:
+        """Filter, locate and categorise a batch of articles.
+        
+        Args:
+            articles: Articles to process; each is normalised once and the text cached on it
+            filter_location: Optional location filter, as in extract_location
+            workers: Spread batches larger than chunk_size across this many processes (0 = in-process)
+            chunk_size: Articles per process-pool task
+            
+        Returns:
+            The women safety articles with location and category set, in input order
+        """
+        if workers > 1 and len(articles) > chunk_size:
+            chunks = [articles[i:i + chunk_size] for i in range(0, len(articles), chunk_size)]
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                results = executor.map(
+                    _process_chunk,
+                    [self] * len(chunks),
+                    chunks,
+                    [filter_location] * len(chunks)
+                )
+                return [article for chunk in results for article in chunk]
+        
+        processed = []
+        for article in articles:
+            if self.classify(article, filter_location):
+                processed.append(article)
+        return processed
     
-    def __init__(self):
-        self.logger = logging.getLogger(f"{__name__}.{self.__class__.__name__}")
+    def classify(self, article: Article, filter_location: Optional[str] = None) -> Optional[Article]:
+        """Safety check, location and category from a single normalised text.
+        
+        Returns the article with location and category set, or None if it is
+        not safety related or does not match filter_location.
+        """
+        matches = self.matcher.match(self._text(article), gate="safety")
+        if "safety" not in matches:
+            return None
+        
+        article.location = matches.get("location", "Unknown").title()
+        if filter_location and filter_location.lower() not in article.location.lower():
+            return None
+        
+        article.category = matches.get("category", self.profile.default_category)
+        return article
     
     def is_safety_related(self, article: Article) -> bool:
         """Check if article is related to women safety."""
-        text = f"{article.title} {article.summary}".lower()
-        return any(keyword in text for keyword in self.SAFETY_KEYWORDS)
+        return self.matcher.first("safety", self._text(article)) is not None
     
     def extract_location(self, article: Article, filter_location: Optional[str] = None) -> Optional[Article]:
         """Extract location from article and optionally filter by location."""
-        text = f"{article.title} {article.summary}".lower()
-        
-        for city in self.INDIAN_CITIES:
-            if city in text:
-                article.location = city.title()
-                break
-        
-        if not article.location:
-            article.location = "Unknown"
+        city = self.matcher.first("location", self._text(article))
+        article.location = city.title() if city else "Unknown"
         
         # Filter by location if specified
         if filter_location:
@@ -69,10 +118,4 @@ class ArticleProcessor:
     
     def determine_category(self, article: Article) -> str:
         """Determine the category of the article."""
-        text = f"{article.title} {article.summary}".lower()
-        
-        for category, keywords in self.CATEGORIES.items():
-            if any(keyword in text for keyword in keywords):
-                return category
-        
-        return "general"
+        return self.matcher.first("category", self._text(article)) or self.profile.default_category
@@ -0,0 +1,95 @@
+"""Keyword profiles for the news pipeline."""
+
+from dataclasses import dataclass
+from typing import Dict, List
+
+
+@dataclass(frozen=True)
+class KeywordProfile:
+    """Keywords and categories used to classify articles.
+
+    Attributes:
+        name: Profile name; also separates the article stores of different profiles
+        safety_keywords: An article is kept if any of these appears
+        cities: Known locations, first match wins
+        categories: Category name -> keywords, first matching category wins
+        default_category: Category of kept articles that match no category keyword
+        whole_word_cities: Cities must match whole words ("kota" not in "kotak")
+        location_in_text: Dashboard location filters match the article text rather than
+            the detected city, and the filter becomes the reported location
+    """
+    name: str
+    safety_keywords: List[str]
+    cities: List[str]
+    categories: Dict[str, List[str]]
+    default_category: str = "general"
+    whole_word_cities: bool = True
+    location_in_text: bool = False
+
+
+WOMEN_SAFETY = KeywordProfile(
+    name="women_safety",
+    safety_keywords=[
+        "women", "woman", "girl", "female", "lady",
+        "rape", "assault", "harassment", "molest", "abuse",
+        "murder", "killed", "attack", "violence", "crime",
+        "safety", "security", "stalking", "kidnap", "abduct",
+        "domestic violence", "dowry", "acid attack", "eve teasing"
+    ],
+    cities=[
+        "delhi", "mumbai", "bangalore", "bengaluru", "chennai",
+        "kolkata", "hyderabad", "pune", "ahmedabad", "jaipur",
+        "lucknow", "kanpur", "nagpur", "indore", "thane",
+        "bhopal", "visakhapatnam", "patna", "vadodara", "ghaziabad",
+        "ludhiana", "agra", "nashik", "faridabad", "meerut",
+        "rajkot", "varanasi", "srinagar", "aurangabad", "dhanbad",
+        "amritsar", "allahabad", "ranchi", "howrah", "coimbatore",
+        "jabalpur", "gwalior", "vijayawada", "jodhpur", "madurai",
+        "raipur", "kota", "chandigarh", "guwahati", "solapur",
+        "noida", "gurugram", "gurgaon"
+    ],
+    categories={
+        "assault": ["rape", "assault", "molest", "attack", "violence"],
+        "harassment": ["harassment", "stalking", "eve teasing", "abuse"],
+        "kidnapping": ["kidnap", "abduct", "missing"],
+        "murder": ["murder", "killed", "death", "body found"],
+        "domestic": ["domestic violence", "dowry", "husband", "in-laws"],
+        "policy": ["law", "court", "police", "investigation", "arrest"]
+    }
+)
+
+# Keyword sets of the original mcp-servers/news-dashboard server
+LEGACY_DASHBOARD = KeywordProfile(
+    name="legacy_dashboard",
+    safety_keywords=[
+        "rape", "sexual", "harassment", "molestation",
+        "woman", "women", "girl", "assault", "stalking",
+        "abuse", "violence", "attack", "molest"
+    ],
+    cities=[
+        "delhi", "mumbai", "bangalore", "chennai", "kolkata",
+        "hyderabad", "pune", "ahmedabad", "jaipur", "lucknow",
+        "south delhi", "north delhi", "dwarka", "rohini"
+    ],
+    categories={
+        "sexual_harassment": ["harassment", "molest", "grope", "inappropriate"],
+        "rape": ["rape", "sexual assault", "gang rape"],
+        "stalking": ["stalk", "follow", "chase"],
+        "domestic_violence": ["domestic", "husband", "family", "home"],
+        "assault": ["assault", "attack", "beat", "violence"],
+        "abuse": ["abuse", "torture", "cruelty"]
+    },
+    default_category="women_safety_incident",
+    whole_word_cities=False,
+    location_in_text=True
+)
+
+PROFILES = {profile.name: profile for profile in (WOMEN_SAFETY, LEGACY_DASHBOARD)}
+
+
+def get_profile(name: str) -> KeywordProfile:
+    """Profile by name; raises ValueError for unknown names."""
+    try:
+        return PROFILES[name]
+    except KeyError:
+        raise ValueError(f"Unknown news profile '{name}', choose from {sorted(PROFILES)}") from None
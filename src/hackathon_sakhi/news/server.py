@@ -3,31 +3,65 @@
 News Dashboard MCP Server for Hackathon Sakhi.
 
 Aggregates and clusters women safety news from Indian RSS feeds.
-No API keys required - uses public RSS feeds.
+No API keys required - uses public RSS feeds. Feeds are ingested in the
+background into a local article store; the dashboard tool queries it.
 
 Environment Variables:
     LOG_LEVEL: Logging level (optional, default: INFO)
+    SAKHI_CACHE_DIR: Feed cache and article store directory (optional, default: ~/.cache/hackathon-sakhi)
+    NEWS_POLL_SECONDS: Seconds between background feed polls (optional, default: 900)
+    NEWS_PROFILE: Keyword profile, "women_safety" or "legacy_dashboard" (optional, default: women_safety)
 """
 
+import os
+import time
 import logging
-from typing import Dict, Any
+from typing import Dict, Any, List, Optional
 
 from mcp.server.fastmcp import FastMCP
 
 from .sources import IndianNewsSources
+from ..paths import default_cache_dir
+from .cache import FeedCache
 from .fetcher import ArticleFetcher
 from .processor import ArticleProcessor
 from .clustering import ArticleClusterer
+from .store import ArticleStore
+from .ingester import NewsIngester
+from .index import ArticleIndex
+from .dates import parse_date, to_iso
+from .models import Article, ArticleCluster
+from .profiles import KeywordProfile, WOMEN_SAFETY, get_profile
+
+ARTICLE_FIELDS = ("title", "summary", "url", "source", "published", "also_reported_by")
 
 
 class WomenSafetyNewsMCP:
     """MCP Server for women safety news dashboard."""
     
-    def __init__(self):
+    def __init__(self, profile: KeywordProfile = WOMEN_SAFETY):
+        """
+        Args:
+            profile: Keyword profile used to select, locate and categorise articles
+        """
+        self.profile = profile
         self.sources = IndianNewsSources()
-        self.fetcher = ArticleFetcher()
-        self.processor = ArticleProcessor()
+        self.fetcher = ArticleFetcher(cache=FeedCache())
+        self.processor = ArticleProcessor(profile)
         self.clusterer = ArticleClusterer()
+        # Safety flags and categories depend on the profile, so each profile gets its own store
+        db_name = "articles.db" if profile is WOMEN_SAFETY else f"articles-{profile.name}.db"
+        self.store = ArticleStore(default_cache_dir() / db_name)
+        self.index = ArticleIndex()
+        self.index.rebuild(self.store.safety_articles())
+        self.ingester = NewsIngester(
+            self.sources,
+            self.fetcher,
+            self.processor,
+            self.store,
+            interval=float(os.getenv("NEWS_POLL_SECONDS", "900")),
+            index=self.index
+        )
         self.mcp = FastMCP("hackathon-women-safety-news")
         self.logger = logging.getLogger(f"{__name__}.{self.__class__.__name__}")
         self._register_tools()
@@ -36,32 +70,56 @@ class WomenSafetyNewsMCP:
         """Register MCP tools."""
         
         @self.mcp.tool()
-        def hackathon_women_safety_news_dashboard(location: str = None) -> Dict[str, Any]:
+        def hackathon_women_safety_news_dashboard(
+            location: str = None,
+            since_hours: Optional[float] = None,
+            page: int = 1,
+            max_clusters: int = 10,
+            max_articles_per_cluster: int = 3,
+            summary_chars: int = 200,
+            fields: Optional[List[str]] = None
+        ) -> Dict[str, Any]:
             """
             Generate a clustered women safety news dashboard with links.
-            Fetches RSS feeds, filters women safety incidents, clusters by location.
+            Queries pre-processed women safety incidents from monitored RSS feeds, one cluster per incident,
+            most reported recent incidents first. Responses are paged; use hackathon_women_safety_news_cluster for an incident's full detail.
             
             Args:
                 location: Optional location to filter articles (e.g., "delhi", "mumbai", "bangalore")
+                since_hours: Only articles published within this many hours (e.g. 24)
+                page: Page of clusters to return, starting at 1 (see "next_page" in the response)
+                max_clusters: Clusters per page
+                max_articles_per_cluster: Articles listed per cluster
+                summary_chars: Truncate summaries to this many characters (0 omits summaries)
+                fields: Article fields to include (title, summary, url, source, published, also_reported_by);
+                    all by default
                 
             Returns:
-                A dictionary with clustered news articles
+                A dictionary with one page of clustered news articles
             """
             try:
-                self.logger.info(f"Generating news dashboard for location: {location}")
+                self.logger.info(f"Generating news dashboard for location: {location} (page {page})")
                 
-                # Fetch articles
-                rss_sources = self.sources.get_sources()
-                raw_articles = self.fetcher.fetch_all(rss_sources)
+                unknown = set(fields or ()) - set(ARTICLE_FIELDS)
+                if unknown:
+                    return {
+                        "message": f"Unknown fields: {sorted(unknown)}; choose from {list(ARTICLE_FIELDS)}",
+                        "error": "invalid fields",
+                        "clusters": []
+                    }
                 
-                # Process articles
-                processed_articles = []
-                for article in raw_articles:
-                    if self.processor.is_safety_related(article):
-                        processed_article = self.processor.extract_location(article, location)
-                        if processed_article:
-                            processed_article.category = self.processor.determine_category(processed_article)
-                            processed_articles.append(processed_article)
+                self._ensure_ingested()
+                
+                # Articles were filtered, located and categorised at ingest time
+                published_since = time.time() - since_hours * 3600 if since_hours else None
+                if self.profile.location_in_text and location:
+                    processed_articles = self.store.safety_articles(
+                        published_since=published_since, mention=location
+                    )
+                    for article in processed_articles:
+                        article.location = location.title()
+                else:
+                    processed_articles = self.store.safety_articles(location, published_since)
                 
                 if not processed_articles:
                     return {
@@ -72,30 +130,24 @@ class WomenSafetyNewsMCP:
                 # Cluster articles
                 clusters = self.clusterer.cluster_articles(processed_articles)
                 
-                # Convert to dict format for JSON serialization
-                cluster_dicts = []
-                for cluster in clusters:
-                    article_dicts = []
-                    for article in cluster.articles:
-                        article_dicts.append({
-                            "title": article.title,
-                            "summary": article.summary,
-                            "url": article.url,
-                            "source": article.source,
-                            "published": article.published
-                        })
-                    
-                    cluster_dicts.append({
-                        "cluster_title": cluster.cluster_title,
-                        "location": cluster.location,
-                        "category": cluster.category,
-                        "incident_count": cluster.incident_count,
-                        "articles": article_dicts
-                    })
+                page = max(1, page)
+                max_clusters = max(1, max_clusters)
+                start = (page - 1) * max_clusters
+                page_clusters = clusters[start:start + max_clusters]
                 
+                incident_count = sum(cluster.incident_count for cluster in clusters)
                 return {
-                    "message": f"Found {len(processed_articles)} articles in {len(clusters)} clusters",
-                    "clusters": cluster_dicts
+                    "message": (
+                        f"Found {incident_count} incidents ({len(processed_articles)} articles) "
+                        f"in {len(clusters)} clusters, showing {len(page_clusters)}"
+                    ),
+                    "total_clusters": len(clusters),
+                    "page": page,
+                    "next_page": page + 1 if start + max_clusters < len(clusters) else None,
+                    "clusters": [
+                        self._cluster_dict(cluster, max_articles_per_cluster, summary_chars, fields)
+                        for cluster in page_clusters
+                    ]
                 }
                 
             except Exception as e:
@@ -105,11 +157,175 @@ class WomenSafetyNewsMCP:
                     "error": str(e),
                     "clusters": []
                 }
+        
+        @self.mcp.tool()
+        def hackathon_women_safety_news_cluster(incident_id: str) -> Dict[str, Any]:
+            """
+            Get every article of one incident cluster from the news dashboard, with full summaries.
+            
+            Args:
+                incident_id: The cluster's "incident_id" from hackathon_women_safety_news_dashboard
+                
+            Returns:
+                A dictionary with the cluster and all of its articles
+            """
+            try:
+                articles = self.store.incident_articles(incident_id)
+                if not articles:
+                    return {
+                        "message": f"No incident found with id {incident_id}",
+                        "error": "not found",
+                        "cluster": None
+                    }
+                
+                cluster = self.clusterer.cluster_articles(articles)[0]
+                return {
+                    "message": f"Incident with {cluster.report_count} reports",
+                    "cluster": self._cluster_dict(cluster)
+                }
+                
+            except Exception as e:
+                self.logger.error(f"Error getting news cluster: {str(e)}")
+                return {
+                    "message": f"Error getting news cluster: {str(e)}",
+                    "error": str(e),
+                    "cluster": None
+                }
+    
+        @self.mcp.tool()
+        def hackathon_women_safety_news_search(
+            all_terms: str = "",
+            any_terms: str = "",
+            exclude_terms: str = "",
+            cities: Optional[List[str]] = None,
+            categories: Optional[List[str]] = None,
+            sources: Optional[List[str]] = None,
+            published_after: Optional[str] = None,
+            published_before: Optional[str] = None,
+            limit: int = 10
+        ) -> Dict[str, Any]:
+            """
+            Search indexed women safety news articles with boolean filters.
+            
+            Args:
+                all_terms: Words that must all appear (e.g. "metro assault")
+                any_terms: Words of which at least one must appear (e.g. "stalking harassment")
+                exclude_terms: Words that must not appear
+                cities: Only these cities (e.g. ["Delhi", "Mumbai"])
+                categories: Only these categories (e.g. assault, harassment, kidnapping, murder, domestic, policy)
+                sources: Only these feed titles
+                published_after: Earliest publication date (ISO 8601, e.g. "2025-01-31")
+                published_before: Latest publication date (ISO 8601)
+                limit: Maximum number of results (best matches first; newest first without search words)
+                
+            Returns:
+                A dictionary with the total number of matches and the top results
+            """
+            try:
+                since = parse_date(published_after) if published_after else None
+                until = parse_date(published_before) if published_before else None
+                if (published_after and since is None) or (published_before and until is None):
+                    return {
+                        "message": "Dates must be ISO 8601, e.g. 2025-01-31",
+                        "error": "invalid date",
+                        "results": []
+                    }
+                
+                self._ensure_ingested()
+                total, results = self.index.search(
+                    all_terms=all_terms,
+                    any_terms=any_terms,
+                    exclude_terms=exclude_terms,
+                    cities=cities,
+                    categories=categories,
+                    sources=sources,
+                    since=since,
+                    until=until,
+                    limit=max(1, limit)
+                )
+                
+                return {
+                    "message": f"Found {total} matching articles, showing {len(results)}",
+                    "total": total,
+                    "results": [
+                        {
+                            "title": article.title,
+                            "summary": article.summary,
+                            "url": article.url,
+                            "source": article.source,
+                            "published": article.published,
+                            "location": article.location,
+                            "category": article.category,
+                            "incident_id": article.incident_id,
+                            "score": round(score, 3)
+                        }
+                        for score, article in results
+                    ]
+                }
+                
+            except Exception as e:
+                self.logger.error(f"Error searching news: {str(e)}")
+                return {
+                    "message": f"Error searching news: {str(e)}",
+                    "error": str(e),
+                    "results": []
+                }
+    
+    @staticmethod
+    def _article_dict(article: Article, summary_chars: Optional[int] = None,
+                      fields: Optional[List[str]] = None) -> Dict[str, Any]:
+        """JSON-ready article, optionally with a truncated summary and only some fields."""
+        summary = article.summary
+        if summary_chars is not None and len(summary) > summary_chars:
+            summary = summary[:summary_chars].rstrip() + "…" if summary_chars > 0 else ""
+        values = {
+            "title": article.title,
+            "summary": summary,
+            "url": article.url,
+            "source": article.source,
+            "published": article.published,
+            "also_reported_by": [
+                {"source": copy.source, "url": copy.url}
+                for copy in article.also_reported_by
+            ]
+        }
+        if summary_chars == 0:
+            del values["summary"]
+        if fields:
+            values = {field: value for field, value in values.items() if field in fields}
+        return values
+    
+    def _cluster_dict(self, cluster: ArticleCluster, max_articles: Optional[int] = None,
+                      summary_chars: Optional[int] = None,
+                      fields: Optional[List[str]] = None) -> Dict[str, Any]:
+        """JSON-ready cluster; the article list is cut to max_articles if given."""
+        articles = cluster.articles if max_articles is None else cluster.articles[:max(0, max_articles)]
+        return {
+            "incident_id": cluster.incident_id,
+            "cluster_title": cluster.cluster_title,
+            "location": cluster.location,
+            "category": cluster.category,
+            "incident_count": cluster.incident_count,
+            "report_count": cluster.report_count,
+            "latest_published": to_iso(cluster.latest_published),
+            "score": round(cluster.score, 3),
+            "article_count": len(cluster.articles),
+            "articles": [self._article_dict(article, summary_chars, fields) for article in articles]
+        }
+    
+    def _ensure_ingested(self):
+        """Ingest synchronously on a first call before the background ingester has filled the store."""
+        if self.store.count() == 0:
+            self.ingester.ingest_once()
     
     def run(self):
         """Start the MCP server."""
         self.logger.info("Starting Women Safety News MCP Server...")
-        self.mcp.run(transport="stdio")
+        self.ingester.start()
+        try:
+            self.mcp.run(transport="stdio")
+        finally:
+            self.ingester.stop()
 
 
 def setup_logging(log_level: str = "INFO"):
@@ -121,9 +337,12 @@ def setup_logging(log_level: str = "INFO"):
     )
 
 
-def main():
-    """Main entry point for the news MCP server."""
-    import os
+def main(profile: Optional[str] = None):
+    """Main entry point for the news MCP server.
+    
+    Args:
+        profile: Keyword profile name; defaults to NEWS_PROFILE or "women_safety"
+    """
     from dotenv import load_dotenv
     
     try:
@@ -131,7 +350,7 @@ def main():
         log_level = os.getenv("LOG_LEVEL", "INFO")
         setup_logging(log_level)
         
-        server = WomenSafetyNewsMCP()
+        server = WomenSafetyNewsMCP(get_profile(profile or os.getenv("NEWS_PROFILE", WOMEN_SAFETY.name)))
         server.run()
         
     except Exception as e:
@@ -0,0 +1,194 @@
+"""SQLite store for ingested and processed news articles."""
+
+import time
+import sqlite3
+import logging
+import threading
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Set
+
+from ..paths import default_cache_dir
+from .dates import parse_date
+from .models import Article
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS articles (
+    id INTEGER PRIMARY KEY,
+    key TEXT NOT NULL UNIQUE,
+    title TEXT NOT NULL,
+    summary TEXT NOT NULL,
+    published TEXT NOT NULL,
+    url TEXT NOT NULL,
+    source TEXT NOT NULL,
+    location TEXT,
+    category TEXT,
+    safety INTEGER NOT NULL,
+    ingested_at REAL NOT NULL,
+    duplicate_of TEXT,
+    incident_id TEXT,
+    published_at REAL,
+    seen_at REAL
+);
+CREATE INDEX IF NOT EXISTS idx_articles_safety_location ON articles (safety, location);
+CREATE INDEX IF NOT EXISTS idx_articles_ingested ON articles (ingested_at);
+"""
+
+# Indexes on columns added after the first release; created once _migrate has run
+INDEXES = """
+CREATE INDEX IF NOT EXISTS idx_articles_incident ON articles (incident_id);
+CREATE INDEX IF NOT EXISTS idx_articles_published ON articles (safety, published_at);
+CREATE INDEX IF NOT EXISTS idx_articles_seen ON articles (seen_at);
+"""
+
+
+class ArticleStore:
+    """Articles keyed by guid/URL, with the processor's results stored alongside."""
+
+    def __init__(self, path: Optional[Path] = None):
+        self.path = path or default_cache_dir() / "articles.db"
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.logger = logging.getLogger(f"{__name__}.{self.__class__.__name__}")
+        self._lock = threading.Lock()
+        # Shared between the ingester thread and the MCP tool; guarded by _lock
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(SCHEMA)
+        self._migrate()
+
+    def _migrate(self):
+        columns = {row[1] for row in self._conn.execute("PRAGMA table_info(articles)")}
+        for column, kind in (("duplicate_of", "TEXT"), ("incident_id", "TEXT"), ("published_at", "REAL"),
+                             ("seen_at", "REAL")):
+            if column not in columns:
+                self._conn.execute(f"ALTER TABLE articles ADD COLUMN {column} {kind}")
+        if "seen_at" not in columns:
+            with self._conn:
+                self._conn.execute("UPDATE articles SET seen_at = ingested_at")
+        if "published_at" not in columns:
+            # Rows stored before dates were parsed at ingest
+            rows = self._conn.execute("SELECT id, published FROM articles").fetchall()
+            with self._conn:
+                self._conn.executemany(
+                    "UPDATE articles SET published_at = ? WHERE id = ?",
+                    [(parse_date(published), row_id) for row_id, published in rows]
+                )
+        self._conn.executescript(INDEXES)
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+    def count(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM articles").fetchone()[0]
+
+    def existing_keys(self, keys: Iterable[str]) -> Set[str]:
+        """Subset of keys already in the store."""
+        keys = list(keys)
+        found: Set[str] = set()
+        with self._lock:
+            # Stay under SQLite's bound-parameter limit
+            for start in range(0, len(keys), 500):
+                chunk = keys[start:start + 500]
+                placeholders = ",".join("?" * len(chunk))
+                rows = self._conn.execute(
+                    f"SELECT key FROM articles WHERE key IN ({placeholders})", chunk
+                )
+                found.update(row[0] for row in rows)
+        return found
+
+    def mark_seen(self, keys: Iterable[str]):
+        """Record that feeds still serve these articles, so prune keeps them."""
+        keys = list(keys)
+        now = time.time()
+        with self._lock, self._conn:
+            for start in range(0, len(keys), 500):
+                chunk = keys[start:start + 500]
+                placeholders = ",".join("?" * len(chunk))
+                self._conn.execute(f"UPDATE articles SET seen_at = ? WHERE key IN ({placeholders})", [now, *chunk])
+
+    def add(self, articles: Iterable[Article], safety_keys: Set[str]):
+        """Insert processed articles; those not in safety_keys are kept only for deduplication."""
+        now = time.time()
+        rows = [
+            (
+                article.key, article.title, article.summary, article.published,
+                article.url, article.source, article.location, article.category,
+                1 if article.key in safety_keys else 0, now, article.duplicate_of,
+                article.incident_id, article.published_at, now
+            )
+            for article in articles
+        ]
+        with self._lock, self._conn:
+            self._conn.executemany(
+                """
+                INSERT OR IGNORE INTO articles
+                    (key, title, summary, published, url, source, location, category, safety,
+                     ingested_at, duplicate_of, incident_id, published_at, seen_at)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                """,
+                rows
+            )
+
+    def set_incident_ids(self, incident_ids: Dict[str, str]):
+        """Update the incident id of articles by key."""
+        with self._lock, self._conn:
+            self._conn.executemany(
+                "UPDATE articles SET incident_id = ? WHERE key = ?",
+                [(incident, key) for key, incident in incident_ids.items()]
+            )
+
+    def prune(self, max_age_seconds: float) -> List[Article]:
+        """Drop articles no feed has served for max_age_seconds.
+
+        Articles a feed still serves are kept (see mark_seen); dropping their
+        keys would make the next poll ingest and announce them as new.
+        Returns the removed safety articles, so in-memory indexes can drop them too.
+        """
+        cutoff = time.time() - max_age_seconds
+        removed = self._select("WHERE safety = 1 AND seen_at < ?", [cutoff])
+        with self._lock, self._conn:
+            cursor = self._conn.execute("DELETE FROM articles WHERE seen_at < ?", (cutoff,))
+        if cursor.rowcount:
+            self.logger.debug(f"Pruned {cursor.rowcount} article(s) not seen for {max_age_seconds:.0f}s")
+        return removed
+
+    def safety_articles(self, location: Optional[str] = None,
+                        published_since: Optional[float] = None,
+                        mention: Optional[str] = None) -> List[Article]:
+        """Processed women safety articles, optionally filtered by location substring and publication time.
+
+        Articles without a parseable publication date are left out when published_since is given.
+        `mention` keeps only articles whose title or summary contains it (case-insensitive).
+        """
+        query = "WHERE safety = 1"
+        params: list = []
+        if location:
+            query += " AND instr(lower(location), ?) > 0"
+            params.append(location.lower())
+        if mention:
+            query += " AND instr(lower(title || ' ' || summary), ?) > 0"
+            params.append(mention.lower())
+        if published_since is not None:
+            query += " AND published_at >= ?"
+            params.append(published_since)
+        return self._select(query, params)
+
+    def incident_articles(self, incident_id: str) -> List[Article]:
+        """Safety articles assigned to one incident, syndicated copies included."""
+        return self._select("WHERE safety = 1 AND incident_id = ?", [incident_id])
+
+    def _select(self, where: str, params: list) -> List[Article]:
+        query = ("SELECT title, summary, published, url, source, location, category, key, "
+                 f"duplicate_of, incident_id, published_at FROM articles {where} ORDER BY id")
+        with self._lock:
+            rows = self._conn.execute(query, params).fetchall()
+        return [
+            Article(
+                title=row[0], summary=row[1], published=row[2], url=row[3], source=row[4],
+                location=row[5], category=row[6], guid=row[7], duplicate_of=row[8],
+                incident_id=row[9], published_at=row[10]
+            )
+            for row in rows
+        ]
@@ -0,0 +1,23 @@
+"""Filesystem locations shared by the Sakhi servers."""
+
+import os
+from pathlib import Path
+
+
+def default_cache_dir() -> Path:
+    """Cache directory, overridable with SAKHI_CACHE_DIR."""
+    path = os.getenv("SAKHI_CACHE_DIR")
+    if path:
+        return Path(path)
+    return Path.home() / ".cache" / "hackathon-sakhi"
+
+
+def default_reports_dir() -> Path:
+    """Directory the agent writes trip safety reports to, overridable with SAKHI_REPORTS_DIR.
+
+    Defaults to the working directory the agent started the server in.
+    """
+    path = os.getenv("SAKHI_REPORTS_DIR")
+    if path:
+        return Path(path)
+    return Path.cwd()
@@ -7,18 +7,46 @@ Sends alerts and messages via Telegram bot.
 Environment Variables:
     TELEGRAM_BOT_TOKEN: Your Telegram bot token (required)
     TELEGRAM_CHAT_ID: Default chat ID to send messages (required)
+    TELEGRAM_API_URL: Bot API server (optional, default: https://api.telegram.org)
+    LOCATION_API_URL: Location API polled for live locations (optional, default: https://sakhi-location-api.onrender.com)
+    TELEGRAM_OUTBOX: Queue messages in a durable outbox sent in the background (optional, default: 1, 0 sends synchronously)
+    SAKHI_CACHE_DIR: Directory of the outbox database, contact groups and uploaded file ids (optional, default: ~/.cache/hackathon-sakhi)
+    SAKHI_REPORTS_DIR: The only directory files are sent from (optional, default: the working directory)
     LOG_LEVEL: Logging level (optional, default: INFO)
 """
 
 import os
+import time
+import signal
+import uuid
+import sqlite3
 import logging
+import threading
 from abc import ABC, abstractmethod
-from typing import Dict, Any
-from dataclasses import dataclass
-import requests
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Dict, Any, Callable, List, Optional
+from dataclasses import dataclass, asdict
 from dotenv import load_dotenv
 from mcp.server.fastmcp import FastMCP
 
+from .paths import default_reports_dir
+from .telegram_contacts import ContactGroupRegistry
+from .telegram_live import LiveLocationStreamer
+from .telegram_media import FileIdCache
+from .telegram_outbox import FAILED, SENT, TelegramOutbox
+from .telegram_sender import DEFAULT_API_URL, TelegramError, TelegramSender
+
+# Seconds the server waits at shutdown for queued messages to be delivered
+OUTBOX_FLUSH_SECONDS = 30
+# Kinds of file the agent may send: generated reports and map screenshots
+REPORT_EXTENSIONS = (".html", ".pdf", ".png", ".jpg", ".jpeg")
+# The same when terminated; the agent runner sends SIGKILL 5 seconds after SIGTERM
+TERMINATE_FLUSH_SECONDS = 2
+# Seconds at shutdown for ending live locations, and for the outbox's drainer to finish its pass
+LIVE_STOP_SECONDS = 1.5
+OUTBOX_CLOSE_SECONDS = 1
+
 
 @dataclass
 class TelegramMessage:
@@ -26,6 +54,19 @@ class TelegramMessage:
     text: str
     chat_id: str
     parse_mode: str = "HTML"
+    idempotency_key: Optional[str] = None
+
+
+@dataclass
+class DeliveryResult:
+    """Outcome of one recipient of a broadcast.
+    
+    status is "sent", "queued" (in the outbox, not yet acknowledged) or "failed".
+    """
+    chat_id: str
+    status: str
+    message_id: Optional[int] = None
+    error: Optional[str] = None
 
 
 class TelegramServiceInterface(ABC):
@@ -35,47 +76,236 @@ class TelegramServiceInterface(ABC):
     def send_message(self, message: TelegramMessage) -> bool:
         """Send message via Telegram."""
         pass
+    
+    def deliver(self, message: TelegramMessage) -> DeliveryResult:
+        """Send message and report whether it was sent, is still queued or failed."""
+        return DeliveryResult(message.chat_id, SENT if self.send_message(message) else FAILED)
+    
+    @abstractmethod
+    def broadcast(self, text: str, chat_ids: List[str], parse_mode: str = "HTML",
+                  idempotency_key: Optional[str] = None, max_workers: int = 20) -> List[DeliveryResult]:
+        """Send one message to several chats concurrently; one result per distinct chat.
+        
+        Repeating a call with the same idempotency_key does not message a chat twice.
+        """
+        pass
+    
+    @abstractmethod
+    def send_file(self, path: str, chat_ids: List[str], caption: Optional[str] = None,
+                  as_photo: bool = False, idempotency_key: Optional[str] = None) -> List[DeliveryResult]:
+        """Send a local file (a document, or a photo if as_photo) to several chats."""
+        pass
 
 
 class TelegramBotService(TelegramServiceInterface):
     """Telegram Bot API implementation."""
     
-    def __init__(self, bot_token: str, default_chat_id: str):
-        self.bot_token = bot_token
+    def __init__(self, bot_token: str, default_chat_id: str, sender: Optional[TelegramSender] = None):
+        """
+        Args:
+            bot_token: Bot token from @BotFather
+            default_chat_id: Chat used for messages without a chat_id
+            sender: Shared rate-limited API client; one is created for bot_token if omitted
+        """
         self.default_chat_id = default_chat_id
-        self.base_url = f"https://api.telegram.org/bot{bot_token}"
+        self.sender = sender or TelegramSender(bot_token)
         self.logger = logging.getLogger(f"{__name__}.{self.__class__.__name__}")
+        # Idempotency keys already delivered; without an outbox they are only remembered by this process
+        self._delivered: Dict[str, DeliveryResult] = {}
+        self._delivered_lock = threading.Lock()
     
     def send_message(self, message: TelegramMessage) -> bool:
-        """Send message via Telegram Bot API."""
+        """Send message via Telegram Bot API, waiting out rate limits and retrying transient errors.
+        
+        A message whose idempotency_key was already sent by this process is not sent again.
+        """
+        chat_id = message.chat_id or self.default_chat_id
+        if self._already_delivered(message.idempotency_key):
+            self.logger.info(f"Message {message.idempotency_key} was already sent; not sending again")
+            return True
         try:
-            url = f"{self.base_url}/sendMessage"
-            
-            payload = {
-                "chat_id": message.chat_id or self.default_chat_id,
-                "text": message.text,
-                "parse_mode": message.parse_mode
-            }
-            
-            response = requests.post(url, json=payload, timeout=10)
-            response.raise_for_status()
-            
-            self.logger.info(f"Message sent successfully to chat {message.chat_id}")
+            sent = self.sender.send_message(chat_id, message.text, parse_mode=message.parse_mode)
+            self._remember(message.idempotency_key,
+                           DeliveryResult(chat_id, SENT, message_id=(sent or {}).get("message_id")))
+            self.logger.info(f"Message sent successfully to chat {chat_id}")
             return True
             
-        except requests.exceptions.RequestException as e:
+        except TelegramError as e:
             self.logger.error(f"Failed to send Telegram message: {str(e)}")
             return False
         except Exception as e:
             self.logger.error(f"Unexpected error sending message: {str(e)}")
             return False
+    
+    def broadcast(self, text: str, chat_ids: List[str], parse_mode: str = "HTML",
+                  idempotency_key: Optional[str] = None, max_workers: int = 20) -> List[DeliveryResult]:
+        """Send to every chat concurrently; the shared sender keeps each chat within its rate limit.
+        
+        Chats this process already messaged under the same idempotency_key are skipped.
+        """
+        unique = list(dict.fromkeys(chat_ids))
+        return self._fan_out(unique, lambda chat_id: self.sender.send_message(chat_id, text, parse_mode=parse_mode),
+                             max_workers, idempotency_key)
+    
+    def send_file(self, path: str, chat_ids: List[str], caption: Optional[str] = None,
+                  as_photo: bool = False, idempotency_key: Optional[str] = None) -> List[DeliveryResult]:
+        """Upload the file once and send it to every chat; the other chats reuse its cached file_id."""
+        send = self.sender.send_photo if as_photo else self.sender.send_document
+        return self._fan_out(list(dict.fromkeys(chat_ids)), lambda chat_id: send(chat_id, path, caption=caption),
+                             idempotency_key=idempotency_key)
+    
+    def _fan_out(self, chat_ids: List[str], send: Callable[[str], Any], max_workers: int = 20,
+                 idempotency_key: Optional[str] = None) -> List[DeliveryResult]:
+        """Run send for every chat concurrently; one result per chat."""
+        if not chat_ids:
+            return []
+        
+        def deliver(chat_id: str) -> DeliveryResult:
+            key = f"{idempotency_key}:{chat_id}" if idempotency_key else None
+            previous = self._already_delivered(key)
+            if previous:
+                return previous
+            try:
+                sent = send(chat_id)
+                result = DeliveryResult(chat_id, SENT, message_id=(sent or {}).get("message_id"))
+                self._remember(key, result)
+                return result
+            except Exception as e:
+                self.logger.error(f"Failed to send to Telegram chat {chat_id}: {str(e)}")
+                return DeliveryResult(chat_id, FAILED, error=str(e))
+        
+        with ThreadPoolExecutor(max_workers=min(max_workers, len(chat_ids)),
+                                thread_name_prefix="telegram-broadcast") as executor:
+            return list(executor.map(deliver, chat_ids))
+    
+    def _already_delivered(self, key: Optional[str]) -> Optional[DeliveryResult]:
+        if not key:
+            return None
+        with self._delivered_lock:
+            return self._delivered.get(key)
+    
+    def _remember(self, key: Optional[str], result: DeliveryResult):
+        if key:
+            with self._delivered_lock:
+                self._delivered[key] = result
+
+
+class QueuedTelegramService(TelegramServiceInterface):
+    """Commits messages to a durable outbox; its background drainer delivers them."""
+    
+    def __init__(self, outbox: TelegramOutbox, default_chat_id: str, wait: float = 5.0):
+        """
+        Args:
+            outbox: Started outbox that delivers the messages
+            default_chat_id: Chat used for messages without a chat_id
+            wait: Seconds send_message waits for Telegram to acknowledge a message
+        """
+        self.outbox = outbox
+        self.default_chat_id = default_chat_id
+        self.wait = wait
+        self.logger = logging.getLogger(f"{__name__}.{self.__class__.__name__}")
+    
+    def send_message(self, message: TelegramMessage) -> bool:
+        """Queue message and wait briefly for delivery; False only if it failed or could not be stored."""
+        return self.deliver(message).status != FAILED
+    
+    def deliver(self, message: TelegramMessage) -> DeliveryResult:
+        """Queue message and wait up to `wait` seconds for Telegram to acknowledge it.
+        
+        A message still unacknowledged by then (rate limited, network down) is
+        reported as queued; the outbox keeps retrying it in the background.
+        """
+        chat_id = message.chat_id or self.default_chat_id
+        payload = {"chat_id": chat_id, "text": message.text}
+        if message.parse_mode:
+            payload["parse_mode"] = message.parse_mode
+        key = message.idempotency_key or uuid.uuid4().hex
+        result = self._enqueue_and_wait([("sendMessage", payload, key, None)], self.wait)[0]
+        if result.status == FAILED:
+            self.logger.error(f"Telegram message {key} to chat {chat_id} failed: {result.error}")
+        else:
+            self.logger.info(f"Telegram message {key} {result.status} to chat {chat_id}")
+        return result
+    
+    def broadcast(self, text: str, chat_ids: List[str], parse_mode: str = "HTML",
+                  idempotency_key: Optional[str] = None, max_workers: int = 20,
+                  wait: float = 5.0) -> List[DeliveryResult]:
+        """Queue the message for every chat in one transaction, then wait up to `wait`
+        seconds for the outbox to deliver it; chats still pending are reported as queued."""
+        unique = list(dict.fromkeys(chat_ids))
+        if not unique:
+            return []
+        
+        prefix = idempotency_key or uuid.uuid4().hex
+        return self._enqueue_and_wait([
+            ("sendMessage", {"chat_id": chat_id, "text": text, "parse_mode": parse_mode}, f"{prefix}:{chat_id}", None)
+            for chat_id in unique
+        ], wait)
+    
+    def send_file(self, path: str, chat_ids: List[str], caption: Optional[str] = None,
+                  as_photo: bool = False, idempotency_key: Optional[str] = None,
+                  wait: float = 10.0) -> List[DeliveryResult]:
+        """Queue the file for every chat and wait up to `wait` seconds for delivery, as for broadcast.
+        
+        The outbox stores only the path, so the file must not be removed before it is sent.
+        """
+        unique = list(dict.fromkeys(chat_ids))
+        if not unique:
+            return []
+        if not os.path.isfile(path):
+            return [DeliveryResult(chat_id, FAILED, error=f"No such file: {path}") for chat_id in unique]
+        
+        method = "sendPhoto" if as_photo else "sendDocument"
+        prefix = idempotency_key or uuid.uuid4().hex
+        payload = {"caption": caption, "parse_mode": "HTML"} if caption else {}
+        return self._enqueue_and_wait([
+            (method, {"chat_id": chat_id, **payload}, f"{prefix}:{chat_id}", path) for chat_id in unique
+        ], wait)
+    
+    def _enqueue_and_wait(self, calls: List[tuple], wait: float) -> List[DeliveryResult]:
+        """Queue (method, payload, key, file_path) calls in one transaction, then report
+        each chat's state once all are delivered or `wait` seconds have passed."""
+        chat_ids = [payload["chat_id"] for _, payload, _, _ in calls]
+        try:
+            keys = self.outbox.enqueue_many(calls)
+        except sqlite3.Error as e:
+            self.logger.error(f"Failed to queue Telegram messages: {str(e)}")
+            return [DeliveryResult(chat_id, FAILED, error=str(e)) for chat_id in chat_ids]
+        
+        deadline = time.monotonic() + wait
+        while True:
+            states = self.outbox.statuses(keys)
+            done = all(states.get(key, {}).get("status") in (SENT, FAILED) for key in keys)
+            if done or time.monotonic() >= deadline:
+                break
+            time.sleep(0.1)
+        
+        results = []
+        for chat_id, key in zip(chat_ids, keys):
+            state = states.get(key, {})
+            if state.get("status") == SENT:
+                results.append(DeliveryResult(chat_id, SENT, message_id=(state["result"] or {}).get("message_id")))
+            elif state.get("status") == FAILED:
+                results.append(DeliveryResult(chat_id, FAILED, error=state.get("last_error")))
+            else:
+                results.append(DeliveryResult(chat_id, "queued", error=state.get("last_error")))
+        return results
 
 
 class TelegramMCPServer:
     """MCP Server for Telegram messaging."""
     
-    def __init__(self, telegram_service: TelegramServiceInterface):
+    def __init__(self, telegram_service: TelegramServiceInterface,
+                 contacts: Optional[ContactGroupRegistry] = None,
+                 live_location: Optional[LiveLocationStreamer] = None,
+                 default_chat_id: Optional[str] = None,
+                 reports_dir: Optional[Path] = None):
         self.telegram_service = telegram_service
+        self.contacts = contacts or ContactGroupRegistry()
+        self.live_location = live_location
+        self.default_chat_id = default_chat_id
+        # The agent reads untrusted news text; files are only ever sent from here
+        self.reports_dir = (reports_dir or default_reports_dir()).resolve()
         self.mcp = FastMCP("hackathon-telegram-actions")
         self.logger = logging.getLogger(f"{__name__}.{self.__class__.__name__}")
         self._register_tools()
@@ -84,26 +314,277 @@ class TelegramMCPServer:
         """Register MCP tools."""
         
         @self.mcp.tool()
-        def send_hackathon_telegram_message(message: str) -> str:
+        def send_hackathon_telegram_message(message: str, idempotency_key: Optional[str] = None) -> str:
             """
             Send a Telegram message using a bot.
             Use this for sending alerts, notifications, or safety messages.
             
             Args:
                 message: Message to send on Telegram
+                idempotency_key: Optional unique id for this alert; repeating a call with the same
+                    key does not send the message twice
                 
             Returns:
                 A confirmation message
             """
             self.logger.info(f"Tool called: send_telegram_message")
             
-            telegram_msg = TelegramMessage(text=message, chat_id="")
-            success = self.telegram_service.send_message(telegram_msg)
+            telegram_msg = TelegramMessage(text=message, chat_id="", idempotency_key=idempotency_key)
+            result = self.telegram_service.deliver(telegram_msg)
             
-            if success:
+            if result.status == SENT:
                 return "Telegram message sent successfully ✅"
+            elif result.status == FAILED:
+                return f"Failed to send Telegram message ❌ ({result.error or 'unknown error'})"
             else:
-                return "Failed to send Telegram message ❌"
+                return (
+                    "Telegram message not confirmed yet ⏳ - queued and retrying in the background"
+                    f"{f' (last error: {result.error})' if result.error else ''}; "
+                    "delivery is only guaranteed while this session is running"
+                )
+        
+        @self.mcp.tool()
+        def broadcast_hackathon_telegram_message(
+            message: str,
+            groups: Optional[List[str]] = None,
+            chat_ids: Optional[List[str]] = None,
+            idempotency_key: Optional[str] = None
+        ) -> Dict[str, Any]:
+            """
+            Send one Telegram message to many chats at once, e.g. an SOS to every emergency contact.
+            
+            Args:
+                message: Message to send on Telegram
+                groups: Contact groups to send to (see list_hackathon_telegram_contact_groups)
+                chat_ids: Additional chat ids to send to
+                idempotency_key: Optional unique id for this alert; repeating a call with the same
+                    key does not message anyone twice
+                
+            Returns:
+                A delivery report with the outcome for every recipient
+            """
+            try:
+                self.logger.info(f"Tool called: broadcast_telegram_message")
+                
+                try:
+                    recipients = self.contacts.resolve(groups or (), chat_ids or ())
+                except KeyError as e:
+                    return {
+                        "message": f"Unknown contact group {e}; known groups: {sorted(self.contacts.groups())}",
+                        "error": "unknown group",
+                        "results": []
+                    }
+                if not recipients:
+                    return {
+                        "message": "No recipients; pass contact groups or chat ids",
+                        "error": "no recipients",
+                        "results": []
+                    }
+                
+                started = time.monotonic()
+                results = self.telegram_service.broadcast(message, recipients, idempotency_key=idempotency_key)
+                return self._delivery_report("Broadcast", results, started)
+                
+            except Exception as e:
+                self.logger.error(f"Error broadcasting Telegram message: {str(e)}")
+                return {
+                    "message": f"Error broadcasting Telegram message: {str(e)}",
+                    "error": str(e),
+                    "results": []
+                }
+        
+        @self.mcp.tool()
+        def send_hackathon_telegram_file(
+            path: str,
+            caption: Optional[str] = None,
+            as_photo: bool = False,
+            groups: Optional[List[str]] = None,
+            idempotency_key: Optional[str] = None
+        ) -> Dict[str, Any]:
+            """
+            Send a report on Telegram, e.g. a generated trip-safety-report-*.html or a map screenshot.
+            Only .html, .pdf, .png and .jpg files in the reports directory can be sent.
+            The file is uploaded once; sending it again reuses Telegram's copy.
+            Without groups it goes to the default chat.
+            
+            Args:
+                path: Path of the file, absolute or relative to the reports directory
+                caption: Optional caption shown with the file
+                as_photo: Send an image as a photo instead of a document
+                groups: Contact groups to send to
+                idempotency_key: Optional unique id; repeating a call with the same key does not send twice
+                
+            Returns:
+                A delivery report with the outcome for every recipient
+            """
+            try:
+                self.logger.info(f"Tool called: send_telegram_file")
+                
+                try:
+                    report = self._report_file(path)
+                except ValueError as e:
+                    self.logger.warning(f"Refused to send {path}: {str(e)}")
+                    return {"message": str(e), "error": "file not allowed", "results": []}
+                try:
+                    # Never caller-supplied chat ids: only the configured chat and known groups
+                    recipients = self.contacts.resolve(groups or ())
+                except KeyError as e:
+                    return {"message": f"Unknown contact group {e}", "error": "unknown group", "results": []}
+                if not recipients and self.default_chat_id:
+                    recipients = [self.default_chat_id]
+                if not recipients:
+                    return {"message": "No recipients; pass contact groups",
+                            "error": "no recipients", "results": []}
+                
+                started = time.monotonic()
+                results = self.telegram_service.send_file(
+                    str(report), recipients, caption=caption, as_photo=as_photo, idempotency_key=idempotency_key
+                )
+                return self._delivery_report(f"Sent {report.name}", results, started)
+                
+            except Exception as e:
+                self.logger.error(f"Error sending Telegram file: {str(e)}")
+                return {"message": f"Error sending Telegram file: {str(e)}", "error": str(e), "results": []}
+        
+        @self.mcp.tool()
+        def list_hackathon_telegram_contact_groups() -> Dict[str, Any]:
+            """
+            List the Telegram contact groups available for broadcasts.
+            
+            Returns:
+                A dictionary of group name to member chat ids
+            """
+            return {"groups": self.contacts.groups()}
+        
+        @self.mcp.tool()
+        def set_hackathon_telegram_contact_group(group: str, chat_ids: List[str]) -> Dict[str, Any]:
+            """
+            Create or replace a Telegram contact group, e.g. a user's emergency contacts.
+            
+            Args:
+                group: Group name (e.g. "guardians")
+                chat_ids: Member chat ids; an empty list deletes the group
+                
+            Returns:
+                The group's members
+            """
+            try:
+                members = self.contacts.set_group(group, chat_ids)
+                return {
+                    "message": f"Group {group} has {len(members)} member(s)" if members else f"Group {group} deleted",
+                    "group": group,
+                    "chat_ids": members
+                }
+            except ValueError as e:
+                return {"message": str(e), "error": str(e), "chat_ids": []}
+        
+        @self.mcp.tool()
+        def start_hackathon_telegram_live_location(
+            groups: Optional[List[str]] = None,
+            chat_ids: Optional[List[str]] = None,
+            minutes: int = 60,
+            latitude: Optional[float] = None,
+            longitude: Optional[float] = None
+        ) -> Dict[str, Any]:
+            """
+            Share the device's live location on Telegram during an emergency.
+            Sends one live location message per chat and keeps moving it as the tracked device
+            moves, instead of sending new messages. Without groups or chat ids it goes to the default chat.
+            Sharing lasts only as long as this session: when the session ends the live locations
+            are stopped, even if `minutes` has not run out.
+            
+            Args:
+                groups: Contact groups to share with
+                chat_ids: Additional chat ids to share with
+                minutes: Longest time the location stays live (1 to 1440)
+                latitude: Starting latitude; the latest location snapshot if omitted
+                longitude: Starting longitude; the latest location snapshot if omitted
+                
+            Returns:
+                The chats now receiving the live location and any that failed
+            """
+            if not self.live_location:
+                return {"message": "Live location is not configured", "error": "not configured", "chats": []}
+            try:
+                try:
+                    recipients = self.contacts.resolve(groups or (), chat_ids or ())
+                except KeyError as e:
+                    return {"message": f"Unknown contact group {e}", "error": "unknown group", "chats": []}
+                if not recipients and self.default_chat_id:
+                    recipients = [self.default_chat_id]
+                if not recipients:
+                    return {"message": "No recipients; pass contact groups or chat ids",
+                            "error": "no recipients", "chats": []}
+                
+                results = self.live_location.start(recipients, int(minutes * 60), latitude, longitude)
+                live = [chat_id for chat_id, error in results.items() if error is None]
+                return {
+                    "message": f"Sharing live location with {len(live)} of {len(results)} chats for {minutes} minutes",
+                    "chats": live,
+                    "failed": {chat_id: error for chat_id, error in results.items() if error is not None}
+                }
+                
+            except ValueError as e:
+                return {"message": str(e), "error": str(e), "chats": []}
+            except Exception as e:
+                self.logger.error(f"Error starting live location: {str(e)}")
+                return {"message": f"Error starting live location: {str(e)}", "error": str(e), "chats": []}
+        
+        @self.mcp.tool()
+        def stop_hackathon_telegram_live_location(chat_ids: Optional[List[str]] = None) -> Dict[str, Any]:
+            """
+            Stop sharing live location on Telegram.
+            
+            Args:
+                chat_ids: Chats to stop; all live chats if omitted
+                
+            Returns:
+                The stopped chats with how many position updates each received
+            """
+            if not self.live_location:
+                return {"message": "Live location is not configured", "error": "not configured", "chats": []}
+            stopped = self.live_location.stop(chat_ids)
+            return {
+                "message": f"Stopped live location in {len(stopped)} chat(s)",
+                "chats": [
+                    {
+                        "chat_id": session.chat_id,
+                        "updates_sent": session.updates_sent,
+                        "updates_skipped": session.updates_skipped
+                    }
+                    for session in stopped
+                ]
+            }
+    
+    def _report_file(self, path: str) -> Path:
+        """Resolve a file the agent asked to send, following symlinks.
+        
+        Raises:
+            ValueError: If it is outside the reports directory, not a report or image, or missing
+        """
+        report = (self.reports_dir / Path(path).expanduser()).resolve()
+        if not report.is_relative_to(self.reports_dir):
+            raise ValueError(f"Only files in {self.reports_dir} can be sent")
+        if report.suffix.lower() not in REPORT_EXTENSIONS:
+            raise ValueError(f"Only {', '.join(REPORT_EXTENSIONS)} files can be sent")
+        if not report.is_file():
+            raise ValueError(f"File not found: {path}")
+        return report
+    
+    @staticmethod
+    def _delivery_report(action: str, results: List[DeliveryResult], started: float) -> Dict[str, Any]:
+        """Tool response with per-status counts and every recipient's result."""
+        counts = {status: sum(1 for r in results if r.status == status) for status in (SENT, "queued", FAILED)}
+        return {
+            "message": (
+                f"{action} to {len(results)} chats: {counts[SENT]} sent, "
+                f"{counts['queued']} queued, {counts[FAILED]} failed"
+            ),
+            "total": len(results),
+            **counts,
+            "elapsed_seconds": round(time.monotonic() - started, 2),
+            "results": [asdict(result) for result in results]
+        }
     
     def run(self):
         """Start the MCP server."""
@@ -145,11 +626,66 @@ def main():
         setup_logging(log_level)
         
         # Initialize services
-        telegram_service = TelegramBotService(bot_token, chat_id)
-        server = TelegramMCPServer(telegram_service)
+        sender = TelegramSender(bot_token, api_url=os.getenv("TELEGRAM_API_URL", DEFAULT_API_URL),
+                                file_ids=FileIdCache())
+        outbox = None
+        if os.getenv("TELEGRAM_OUTBOX", "1") != "0":
+            # As many concurrent sends as the sender keeps connections, for broadcasts
+            outbox = TelegramOutbox(sender, workers=20)
+            outbox.start()
+            telegram_service = QueuedTelegramService(outbox, chat_id)
+        else:
+            telegram_service = TelegramBotService(bot_token, chat_id, sender)
+        # Imported here: the location module configures logging on import
+        from .location_v2 import DEFAULT_API_URL as DEFAULT_LOCATION_API_URL, LocationAPIClient
+        location_client = LocationAPIClient(os.getenv("LOCATION_API_URL", DEFAULT_LOCATION_API_URL))
+        
+        def latest_position():
+            snapshots = location_client.get_snapshots(hours=1, limit=1)
+            return (snapshots[0].lat, snapshots[0].lng) if snapshots else None
+        
+        live_location = LiveLocationStreamer(sender, latest_position)
+        server = TelegramMCPServer(telegram_service, live_location=live_location, default_chat_id=chat_id)
+        
+        # Set when stdin closes or on SIGTERM (from the agent runner) or Ctrl+C; the handler does nothing else
+        stopping = threading.Event()
+        terminated = threading.Event()
+        
+        def terminate(sig, frame):
+            terminated.set()
+            stopping.set()
+        
+        def serve():
+            try:
+                server.run()
+            except Exception as e:
+                logging.error(f"Telegram server stopped: {str(e)}")
+            finally:
+                stopping.set()
+        
+        signal.signal(signal.SIGTERM, terminate)
+        signal.signal(signal.SIGINT, terminate)
+        
+        # Start server; the main thread stays free to shut down when told to
+        threading.Thread(target=serve, name="telegram-mcp", daemon=True).start()
+        try:
+            while not stopping.wait(1.0):
+                pass
+        finally:
+            # Every step is bounded: when terminated, SIGKILL follows a few seconds later
+            # Nothing moves the live locations once the server is gone; end them so chats show it
+            live_location.stop(timeout=LIVE_STOP_SECONDS)
+            if outbox:
+                # The server lives only as long as the agent run; give queued alerts a last chance
+                if not outbox.wait_idle(TERMINATE_FLUSH_SECONDS if terminated.is_set() else OUTBOX_FLUSH_SECONDS):
+                    logging.warning(f"{outbox.pending_count()} Telegram message(s) still unsent at shutdown; "
+                                    "they go out the next time the server starts")
+                outbox.close(timeout=OUTBOX_CLOSE_SECONDS)
         
-        # Start server
-        server.run()
+        if terminated.is_set():
+            # The server thread is still blocked reading stdin, which a normal exit would wait for
+            logging.shutdown()
+            os._exit(0)
         
     except Exception as e:
         logging.error(f"Failed to start Telegram server: {str(e)}")
@@ -0,0 +1,88 @@
+"""Named groups of Telegram chats, e.g. a user's emergency contacts."""
+
+import os
+import json
+import logging
+import threading
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional
+
+from .paths import default_cache_dir
+
+
+def normalize_group(name: str) -> str:
+    """Group key: trimmed, single-spaced and casefolded."""
+    return " ".join(name.split()).casefold()
+
+
+class ContactGroupRegistry:
+    """Contact groups persisted to a JSON file of {group: [chat_id, ...]}.
+
+    Chat ids are kept as strings so numeric ids and @channel names can mix.
+    """
+
+    def __init__(self, path: Optional[Path] = None):
+        self.path = path or default_cache_dir() / "telegram_contacts.json"
+        self.logger = logging.getLogger(f"{__name__}.{self.__class__.__name__}")
+        self._lock = threading.Lock()
+        self._groups: Dict[str, List[str]] = self._load()
+
+    def groups(self) -> Dict[str, List[str]]:
+        """Every group with its members."""
+        with self._lock:
+            return {name: list(members) for name, members in self._groups.items()}
+
+    def members(self, group: str) -> Optional[List[str]]:
+        """Chat ids of a group, or None if there is no such group."""
+        with self._lock:
+            members = self._groups.get(normalize_group(group))
+            return list(members) if members is not None else None
+
+    def set_group(self, group: str, chat_ids: Iterable) -> List[str]:
+        """Replace a group's members; an empty list deletes the group. Returns the members."""
+        key = normalize_group(group)
+        if not key:
+            raise ValueError("Group name must not be empty")
+        members = list(dict.fromkeys(str(chat_id).strip() for chat_id in chat_ids if str(chat_id).strip()))
+        with self._lock:
+            if members:
+                self._groups[key] = members
+            else:
+                self._groups.pop(key, None)
+            groups = dict(self._groups)
+        self._save(groups)
+        return members
+
+    def resolve(self, groups: Iterable[str] = (), chat_ids: Iterable = ()) -> List[str]:
+        """Distinct chat ids of the given groups and extra chats, in order.
+
+        Raises:
+            KeyError: For an unknown group
+        """
+        recipients: List[str] = []
+        for group in groups:
+            members = self.members(group)
+            if members is None:
+                raise KeyError(group)
+            recipients.extend(members)
+        recipients.extend(str(chat_id).strip() for chat_id in chat_ids)
+        return list(dict.fromkeys(chat_id for chat_id in recipients if chat_id))
+
+    def _load(self) -> Dict[str, List[str]]:
+        if not self.path.exists():
+            return {}
+        try:
+            raw = json.loads(self.path.read_text(encoding="utf-8"))
+            return {normalize_group(name): [str(chat_id) for chat_id in members] for name, members in raw.items()}
+        except (OSError, ValueError, AttributeError, TypeError) as e:
+            self.logger.warning(f"Ignoring unreadable contact groups {self.path}: {str(e)}")
+            return {}
+
+    def _save(self, groups: Dict[str, List[str]]):
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = self.path.with_name(f"{self.path.name}.{os.getpid()}.tmp")
+            tmp_path.write_text(json.dumps(groups, indent=2), encoding="utf-8")
+            os.replace(tmp_path, self.path)
+        except OSError as e:
+            self.logger.warning(f"Could not save contact groups {self.path}: {str(e)}")
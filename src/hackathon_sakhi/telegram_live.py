@@ -0,0 +1,229 @@
+"""Live location messages kept up to date from the device's location snapshots."""
+
+import math
+import time
+import logging
+import threading
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Optional, Tuple
+
+from .telegram_sender import TelegramError, TelegramSender
+
+# Telegram accepts live periods of 60 seconds to 24 hours
+MIN_LIVE_PERIOD = 60
+MAX_LIVE_PERIOD = 24 * 3600
+
+# (latitude, longitude) of the device, or None if unknown
+LocationSource = Callable[[], Optional[Tuple[float, float]]]
+
+
+def distance_m(lat1: float, lng1: float, lat2: float, lng2: float) -> float:
+    """Great-circle distance in metres."""
+    phi1, phi2 = math.radians(lat1), math.radians(lat2)
+    d_phi = phi2 - phi1
+    d_lambda = math.radians(lng2 - lng1)
+    a = math.sin(d_phi / 2) ** 2 + math.cos(phi1) * math.cos(phi2) * math.sin(d_lambda / 2) ** 2
+    return 2 * 6371000 * math.asin(math.sqrt(min(1.0, a)))
+
+
+@dataclass
+class LiveLocationSession:
+    """One chat's live location message."""
+    chat_id: str
+    message_id: int
+    expires_at: float
+    lat: float
+    lng: float
+    sent_at: float
+    pending: Optional[Tuple[float, float]] = None
+    updates_sent: int = 0
+    updates_skipped: int = 0
+
+
+class LiveLocationStreamer:
+    """Starts Telegram live locations and moves them as new positions arrive.
+
+    Positions are coalesced per chat: moves shorter than min_distance are
+    dropped, and at most one editMessageLiveLocation is sent per chat every
+    min_interval seconds, always with the newest position. A background
+    thread polls the location source and ends expired sessions, so the
+    number of API calls per chat is bounded by live_period / min_interval.
+
+    The thread is a daemon: positions only move while the owning process
+    runs, so that process must stop() the sessions before it exits, or
+    chats keep showing a live location that no longer moves.
+    """
+
+    def __init__(self, sender: TelegramSender, source: Optional[LocationSource] = None,
+                 min_interval: float = 10.0, min_distance: float = 25.0, poll_interval: float = 15.0):
+        """
+        Args:
+            sender: Client used for the Bot API calls
+            source: Returns the device's current position; polled while sessions are live
+            min_interval: Seconds between edits of one chat's message
+            min_distance: Moves shorter than this many metres are not sent
+            poll_interval: Seconds between polls of the source
+        """
+        self.sender = sender
+        self.source = source
+        self.min_interval = min_interval
+        self.min_distance = min_distance
+        self.poll_interval = poll_interval
+        self.logger = logging.getLogger(f"{__name__}.{self.__class__.__name__}")
+        self._sessions: Dict[str, LiveLocationSession] = {}
+        self._lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self, chat_ids: List[str], live_period: int = 3600,
+              lat: Optional[float] = None, lng: Optional[float] = None) -> Dict[str, Optional[str]]:
+        """Send a live location to every chat, replacing sessions already running there.
+
+        Starts at (lat, lng), or the source's current position if not given.
+
+        Returns:
+            Chat id -> None on success or the error message
+
+        Raises:
+            ValueError: If no starting position is available
+        """
+        if lat is None or lng is None:
+            position = self.source() if self.source else None
+            if position is None:
+                raise ValueError("No position given and no location snapshot available")
+            lat, lng = position
+        live_period = int(min(MAX_LIVE_PERIOD, max(MIN_LIVE_PERIOD, live_period)))
+
+        self.stop(chat_ids)
+        results: Dict[str, Optional[str]] = {}
+        for chat_id in dict.fromkeys(chat_ids):
+            try:
+                message = self.sender.call("sendLocation", {
+                    "chat_id": chat_id, "latitude": lat, "longitude": lng, "live_period": live_period
+                })
+            except TelegramError as e:
+                self.logger.error(f"Could not start live location in chat {chat_id}: {str(e)}")
+                results[chat_id] = str(e)
+                continue
+            now = time.time()
+            with self._lock:
+                self._sessions[chat_id] = LiveLocationSession(
+                    chat_id=chat_id, message_id=message["message_id"], expires_at=now + live_period,
+                    lat=lat, lng=lng, sent_at=now
+                )
+            results[chat_id] = None
+
+        if any(error is None for error in results.values()):
+            self._ensure_thread()
+        return results
+
+    def update(self, lat: float, lng: float):
+        """New device position; sent to every live chat now or at its next allowed edit."""
+        with self._lock:
+            for session in self._sessions.values():
+                if distance_m(session.lat, session.lng, lat, lng) < self.min_distance:
+                    session.pending = None
+                    session.updates_skipped += 1
+                else:
+                    # Only the newest position matters; an older pending one is replaced
+                    session.pending = (lat, lng)
+        self.flush()
+
+    def flush(self) -> int:
+        """Send pending positions whose chats may be edited again. Returns how many were sent."""
+        now = time.time()
+        with self._lock:
+            due = [
+                (session.chat_id, session.message_id, session.pending)
+                for session in self._sessions.values()
+                if session.pending and now - session.sent_at >= self.min_interval
+            ]
+        sent = 0
+        for chat_id, message_id, (lat, lng) in due:
+            try:
+                self.sender.call("editMessageLiveLocation", {
+                    "chat_id": chat_id, "message_id": message_id, "latitude": lat, "longitude": lng
+                })
+            except TelegramError as e:
+                if "not modified" in str(e):
+                    pass
+                elif e.error_code == 400:
+                    # Expired, stopped by the user or deleted; nothing left to edit
+                    self.logger.info(f"Live location in chat {chat_id} ended: {str(e)}")
+                    with self._lock:
+                        self._sessions.pop(chat_id, None)
+                    continue
+                else:
+                    self.logger.warning(f"Could not move live location in chat {chat_id}: {str(e)}")
+                    continue
+            with self._lock:
+                session = self._sessions.get(chat_id)
+                if session and session.message_id == message_id:
+                    session.lat, session.lng, session.sent_at = lat, lng, time.time()
+                    if session.pending == (lat, lng):
+                        session.pending = None
+                    session.updates_sent += 1
+            sent += 1
+        return sent
+
+    def stop(self, chat_ids: Optional[List[str]] = None,
+             timeout: Optional[float] = None) -> List[LiveLocationSession]:
+        """Stop live locations (all if chat_ids is None). Returns the stopped sessions.
+
+        With a timeout, e.g. at shutdown, the calls share that many seconds and
+        are not retried; chats not reached in time stay live until their
+        live_period ends.
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._lock:
+            keys = list(self._sessions) if chat_ids is None else [key for key in dict.fromkeys(chat_ids) if key in self._sessions]
+            stopped = [self._sessions.pop(key) for key in keys]
+        for session in stopped:
+            if session.expires_at <= time.time():
+                continue
+            options = {}
+            if deadline is not None:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    self.logger.warning(f"No time left to stop live location in chat {session.chat_id}")
+                    continue
+                options = {"timeout": remaining, "max_retries": 0}
+            try:
+                self.sender.call("stopMessageLiveLocation", {
+                    "chat_id": session.chat_id, "message_id": session.message_id
+                }, **options)
+            except TelegramError as e:
+                self.logger.warning(f"Could not stop live location in chat {session.chat_id}: {str(e)}")
+        return stopped
+
+    def sessions(self) -> List[LiveLocationSession]:
+        with self._lock:
+            return list(self._sessions.values())
+
+    def _ensure_thread(self):
+        with self._lock:
+            if self._thread and self._thread.is_alive():
+                return
+            self._thread = threading.Thread(target=self._run, name="telegram-live-location", daemon=True)
+            self._thread.start()
+
+    def _run(self):
+        next_poll = 0.0
+        while True:
+            now = time.time()
+            with self._lock:
+                for chat_id in [key for key, session in self._sessions.items() if session.expires_at <= now]:
+                    del self._sessions[chat_id]
+                if not self._sessions:
+                    self._thread = None
+                    return
+            try:
+                if self.source and time.monotonic() >= next_poll:
+                    next_poll = time.monotonic() + self.poll_interval
+                    position = self.source()
+                    if position is not None:
+                        self.update(*position)
+                else:
+                    self.flush()
+            except Exception as e:
+                self.logger.error(f"Live location update failed: {str(e)}")
+            time.sleep(min(self.min_interval, self.poll_interval) / 2)
@@ -0,0 +1,173 @@
+"""Streaming file uploads and file_id reuse for the Telegram Bot API."""
+
+import os
+import json
+import uuid
+import logging
+import mimetypes
+import threading
+from pathlib import Path
+from typing import Any, BinaryIO, Dict, List, Optional, Union
+
+from .paths import default_cache_dir
+
+# Bot API upload methods and the form field that carries the file
+FILE_FIELDS = {
+    "sendDocument": "document",
+    "sendPhoto": "photo",
+    "sendVideo": "video",
+    "sendAudio": "audio",
+    "sendAnimation": "animation",
+}
+
+
+class MultipartStream:
+    """multipart/form-data request body that reads files as it is sent.
+
+    Form fields are encoded up front; files are read in chunks by read(),
+    so an upload never holds a whole file in memory. The total size is
+    known in advance (len / __len__) so requests sends a Content-Length
+    instead of a chunked body, which the Bot API requires.
+    """
+
+    def __init__(self, fields: Dict[str, Any], files: Dict[str, Union[str, Path]]):
+        """
+        Args:
+            fields: Form fields; dicts and lists are JSON encoded (e.g. reply_markup)
+            files: Form field -> local file to upload
+        """
+        self.boundary = uuid.uuid4().hex
+        self.content_type = f"multipart/form-data; boundary={self.boundary}"
+        self._parts: List[Union[bytes, Path]] = []
+        for name, value in fields.items():
+            if value is None:
+                continue
+            if isinstance(value, (dict, list)):
+                value = json.dumps(value)
+            self._parts.append(
+                f'--{self.boundary}\r\nContent-Disposition: form-data; name="{name}"\r\n\r\n'.encode()
+                + str(value).encode() + b"\r\n"
+            )
+        for name, path in files.items():
+            path = Path(path)
+            mime_type = mimetypes.guess_type(path.name)[0] or "application/octet-stream"
+            filename = path.name.replace('"', "")
+            self._parts.append(
+                f'--{self.boundary}\r\nContent-Disposition: form-data; name="{name}"; '
+                f'filename="{filename}"\r\nContent-Type: {mime_type}\r\n\r\n'.encode()
+            )
+            self._parts.append(path)
+            self._parts.append(b"\r\n")
+        self._parts.append(f"--{self.boundary}--\r\n".encode())
+
+        self.len = sum(len(part) if isinstance(part, bytes) else part.stat().st_size for part in self._parts)
+        self._index = 0
+        self._offset = 0
+        self._file: Optional[BinaryIO] = None
+
+    def __len__(self) -> int:
+        return self.len
+
+    def read(self, size: int = -1) -> bytes:
+        """Up to size bytes of the body (all remaining if size < 0); b"" at the end."""
+        chunks = []
+        remaining = size if size is not None and size >= 0 else None
+        while self._index < len(self._parts) and (remaining is None or remaining > 0):
+            part = self._parts[self._index]
+            if isinstance(part, bytes):
+                end = len(part) if remaining is None else min(len(part), self._offset + remaining)
+                chunk = part[self._offset:end]
+                self._offset = end
+                done = self._offset >= len(part)
+            else:
+                if self._file is None:
+                    self._file = open(part, "rb")
+                chunk = self._file.read(-1 if remaining is None else remaining)
+                done = not chunk or (remaining is not None and len(chunk) < remaining)
+            chunks.append(chunk)
+            if remaining is not None:
+                remaining -= len(chunk)
+            if done:
+                self._next_part()
+        return b"".join(chunks)
+
+    def close(self):
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def _next_part(self):
+        self.close()
+        self._index += 1
+        self._offset = 0
+
+
+def uploaded_file_id(result: Any, field: str) -> Optional[str]:
+    """file_id Telegram assigned to an upload, from the sent Message."""
+    media = (result or {}).get(field) if isinstance(result, dict) else None
+    if isinstance(media, list):
+        # Photos come back in several sizes, largest last
+        media = media[-1] if media else None
+    return media.get("file_id") if isinstance(media, dict) else None
+
+
+class FileIdCache:
+    """file_ids of uploaded files, persisted to JSON, so re-sends skip the upload.
+
+    Entries are keyed by bot, upload field and the file's path, size and
+    modification time, so an edited file is uploaded again.
+    """
+
+    def __init__(self, path: Optional[Path] = None):
+        self.path = path or default_cache_dir() / "telegram_file_ids.json"
+        self.logger = logging.getLogger(f"{__name__}.{self.__class__.__name__}")
+        self._lock = threading.Lock()
+        self._upload_locks: Dict[str, threading.Lock] = {}
+        self._file_ids: Dict[str, str] = self._load()
+
+    @staticmethod
+    def key(bot_id: str, field: str, path: Union[str, Path]) -> str:
+        path = Path(path).resolve()
+        stat = path.stat()
+        return f"{bot_id}:{field}:{path}:{stat.st_size}:{stat.st_mtime_ns}"
+
+    def get(self, key: str) -> Optional[str]:
+        with self._lock:
+            return self._file_ids.get(key)
+
+    def put(self, key: str, file_id: str):
+        with self._lock:
+            self._file_ids[key] = file_id
+            file_ids = dict(self._file_ids)
+        self._save(file_ids)
+
+    def discard(self, key: str):
+        with self._lock:
+            if self._file_ids.pop(key, None) is None:
+                return
+            file_ids = dict(self._file_ids)
+        self._save(file_ids)
+
+    def upload_lock(self, key: str) -> threading.Lock:
+        """Lock held while a file is uploaded, so concurrent sends upload it only once."""
+        with self._lock:
+            return self._upload_locks.setdefault(key, threading.Lock())
+
+    def _load(self) -> Dict[str, str]:
+        if not self.path.exists():
+            return {}
+        try:
+            return {str(key): str(value) for key, value in
+                    json.loads(self.path.read_text(encoding="utf-8")).items()}
+        except (OSError, ValueError, AttributeError) as e:
+            self.logger.warning(f"Ignoring unreadable file id cache {self.path}: {str(e)}")
+            return {}
+
+    def _save(self, file_ids: Dict[str, str]):
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = self.path.with_name(f"{self.path.name}.{os.getpid()}.tmp")
+            tmp_path.write_text(json.dumps(file_ids), encoding="utf-8")
+            os.replace(tmp_path, self.path)
+        except OSError as e:
+            self.logger.warning(f"Could not save file id cache {self.path}: {str(e)}")
@@ -0,0 +1,366 @@
+"""Durable SQLite outbox for Telegram messages, drained by a background sender."""
+
+import json
+import time
+import uuid
+import sqlite3
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor, wait
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+from .paths import default_cache_dir
+from .telegram_sender import TelegramError, TelegramSender
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS outbox (
+    id INTEGER PRIMARY KEY,
+    idempotency_key TEXT NOT NULL UNIQUE,
+    method TEXT NOT NULL,
+    payload TEXT NOT NULL,
+    status TEXT NOT NULL DEFAULT 'pending',
+    attempts INTEGER NOT NULL DEFAULT 0,
+    next_attempt_at REAL NOT NULL,
+    created_at REAL NOT NULL,
+    sent_at REAL,
+    result TEXT,
+    last_error TEXT,
+    file_path TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_outbox_due ON outbox (status, next_attempt_at);
+"""
+
+PENDING = "pending"
+SENT = "sent"
+FAILED = "failed"
+
+
+class TelegramOutbox:
+    """Messages are committed here before anything is sent.
+
+    A background drainer claims due rows, sends them through a
+    TelegramSender and marks them sent only once Telegram acknowledged
+    them, so delivery is at-least-once: a crash between the two steps
+    resends the message on restart. Claims are leases, renewed while the
+    claiming drainer is still working on them (one send may retry for
+    minutes); a row claimed by a process that died becomes due again when
+    its lease expires.
+
+    Each message has an idempotency key; enqueueing a key that is already
+    pending or sent is a no-op, so callers can retry freely. Enqueueing the
+    key of a message that failed queues it again with the new payload.
+    """
+
+    def __init__(self, sender: TelegramSender, path: Optional[Path] = None, workers: int = 4,
+                 batch_size: int = 50, max_attempts: int = 10, retry_delay: float = 30.0,
+                 max_retry_delay: float = 3600.0, lease: float = 300.0, poll_interval: float = 5.0):
+        """
+        Args:
+            sender: Client used to deliver messages
+            path: SQLite file; defaults to telegram-outbox.db in the cache directory
+            workers: Messages sent concurrently (the sender still rate limits each chat)
+            batch_size: Rows claimed per drain pass
+            max_attempts: Attempts before a message is marked failed
+            retry_delay: Delay before the first re-attempt, doubled after every failure
+            max_retry_delay: Longest delay between attempts
+            lease: Seconds a claimed row stays hidden from other drainers after its last renewal
+            poll_interval: Longest sleep between drain passes when idle
+        """
+        self.sender = sender
+        self.path = path or default_cache_dir() / "telegram-outbox.db"
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.workers = workers
+        self.batch_size = batch_size
+        self.max_attempts = max_attempts
+        self.retry_delay = retry_delay
+        self.max_retry_delay = max_retry_delay
+        self.lease = lease
+        self.poll_interval = poll_interval
+        self.logger = logging.getLogger(f"{__name__}.{self.__class__.__name__}")
+
+        self._lock = threading.Lock()
+        # Shared between callers and the drainer; guarded by _lock
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(SCHEMA)
+        self._migrate()
+
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        # Rows this process has claimed and not finished; guarded by _lock
+        self._leased: Set[int] = set()
+
+    def _migrate(self):
+        columns = {row[1] for row in self._conn.execute("PRAGMA table_info(outbox)")}
+        if "file_path" not in columns:
+            self._conn.execute("ALTER TABLE outbox ADD COLUMN file_path TEXT")
+
+    def enqueue(self, method: str, payload: Dict[str, Any], key: Optional[str] = None,
+                file_path: Optional[Path] = None) -> str:
+        """Durably queue a Bot API call and wake the drainer. Returns its idempotency key.
+
+        file_path is a local file for upload methods such as sendDocument; only
+        the path is stored, so the file must still exist when the call is sent.
+        If a message with this key is already pending or sent, nothing is queued;
+        if it failed, it is queued again.
+        """
+        return self.enqueue_many([(method, payload, key, file_path)])[0]
+
+    def enqueue_many(self, calls: Iterable[Tuple[str, Dict[str, Any], Optional[str], Optional[Path]]]) -> List[str]:
+        """Queue several (method, payload, key, file_path) calls in one transaction. Returns their keys."""
+        now = time.time()
+        rows = [
+            (key or uuid.uuid4().hex, method, json.dumps(payload),
+             str(Path(file_path).resolve()) if file_path else None, now, now)
+            for method, payload, key, file_path in calls
+        ]
+        with self._lock, self._conn:
+            before = self._conn.total_changes
+            self._conn.executemany(
+                """
+                INSERT INTO outbox
+                    (idempotency_key, method, payload, file_path, next_attempt_at, created_at)
+                VALUES (?, ?, ?, ?, ?, ?)
+                ON CONFLICT (idempotency_key) DO UPDATE SET
+                    method = excluded.method,
+                    payload = excluded.payload,
+                    file_path = excluded.file_path,
+                    status = 'pending',
+                    attempts = 0,
+                    next_attempt_at = excluded.next_attempt_at
+                WHERE outbox.status = 'failed'
+                """,
+                rows
+            )
+            queued = self._conn.total_changes - before
+        if queued:
+            self._wake.set()
+        if queued < len(rows):
+            self.logger.debug(f"{len(rows) - queued} message(s) were already pending or sent")
+        return [row[0] for row in rows]
+
+    def send_message(self, chat_id, text: str, parse_mode: Optional[str] = "HTML",
+                     key: Optional[str] = None) -> str:
+        """Queue a text message. Returns its idempotency key."""
+        payload = {"chat_id": chat_id, "text": text}
+        if parse_mode:
+            payload["parse_mode"] = parse_mode
+        return self.enqueue("sendMessage", payload, key)
+
+    def send_document(self, chat_id, path: Path, caption: Optional[str] = None,
+                      parse_mode: Optional[str] = "HTML", key: Optional[str] = None) -> str:
+        """Queue a local file as a document. Returns its idempotency key."""
+        payload = {"chat_id": chat_id}
+        if caption:
+            payload["caption"] = caption
+            if parse_mode:
+                payload["parse_mode"] = parse_mode
+        return self.enqueue("sendDocument", payload, key, file_path=path)
+
+    def status(self, key: str) -> Optional[Dict[str, Any]]:
+        """Delivery state of a message, or None for unknown keys."""
+        return self.statuses([key]).get(key)
+
+    def statuses(self, keys: Iterable[str]) -> Dict[str, Dict[str, Any]]:
+        """Delivery state of several messages by key; unknown keys are left out."""
+        keys = list(keys)
+        found: Dict[str, Dict[str, Any]] = {}
+        with self._lock:
+            # Stay under SQLite's bound-parameter limit
+            for start in range(0, len(keys), 500):
+                chunk = keys[start:start + 500]
+                placeholders = ",".join("?" * len(chunk))
+                rows = self._conn.execute(
+                    f"""
+                    SELECT idempotency_key, status, attempts, created_at, sent_at, result, last_error
+                    FROM outbox WHERE idempotency_key IN ({placeholders})
+                    """,
+                    chunk
+                ).fetchall()
+                for row in rows:
+                    values = dict(row)
+                    key = values.pop("idempotency_key")
+                    values["result"] = json.loads(values["result"]) if values["result"] else None
+                    found[key] = values
+        return found
+
+    def pending_count(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM outbox WHERE status = ?", (PENDING,)).fetchone()[0]
+
+    def prune(self, max_age: float = 7 * 24 * 3600) -> int:
+        """Delete sent and failed messages older than max_age seconds. Returns how many were deleted."""
+        with self._lock, self._conn:
+            cursor = self._conn.execute(
+                "DELETE FROM outbox WHERE status != ? AND created_at < ?", (PENDING, time.time() - max_age)
+            )
+        return cursor.rowcount
+
+    def close(self, timeout: Optional[float] = None):
+        """Stop draining, waiting at most timeout seconds for the current pass, and close the database.
+
+        Rows of a pass still running are left leased; another drainer picks
+        them up once the lease lapses.
+        """
+        self.stop(timeout)
+        with self._lock:
+            self._conn.close()
+
+    def start(self):
+        """Start draining in a daemon thread."""
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="telegram-outbox", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: Optional[float] = None):
+        """Stop draining after the current pass; unsent messages stay queued for the next start."""
+        self._stop.set()
+        self._wake.set()
+        if self._thread and self._thread is not threading.current_thread():
+            self._thread.join(timeout)
+
+    def wait_idle(self, timeout: Optional[float] = None) -> bool:
+        """Wait until no message is being sent or due now. False on timeout.
+
+        Messages waiting out a retry delay do not count; they stay queued.
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while self._busy():
+            if deadline is not None and time.monotonic() >= deadline:
+                return False
+            self._wake.set()
+            time.sleep(0.05)
+        return True
+
+    def drain_once(self) -> int:
+        """Send every message due now. Returns how many were attempted."""
+        rows = self._claim()
+        if not rows:
+            return 0
+        with ThreadPoolExecutor(max_workers=min(self.workers, len(rows)),
+                                thread_name_prefix="telegram-outbox") as executor:
+            pending = {executor.submit(self._deliver, row) for row in rows}
+            while pending:
+                _, pending = wait(pending, timeout=self.lease / 3)
+                if pending:
+                    # Still sending (or queued behind slow sends); keep other drainers off these rows
+                    self._renew()
+        return len(rows)
+
+    def _run(self):
+        self.prune()
+        while not self._stop.is_set():
+            # Cleared before draining so an enqueue during the pass still wakes the next wait
+            self._wake.clear()
+            try:
+                if self.drain_once():
+                    continue
+            except Exception as e:
+                self.logger.error(f"Telegram outbox drain failed: {str(e)}")
+            self._wake.wait(self._seconds_until_due())
+
+    def _claim(self) -> List[sqlite3.Row]:
+        """Lease up to batch_size due rows to this drainer."""
+        now = time.time()
+        with self._lock:
+            # IMMEDIATE takes the write lock up front, so two processes cannot claim the same rows
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                rows = self._conn.execute(
+                    """
+                    SELECT id, idempotency_key, method, payload, file_path, attempts FROM outbox
+                    WHERE status = ? AND next_attempt_at <= ?
+                    ORDER BY next_attempt_at, id LIMIT ?
+                    """,
+                    (PENDING, now, self.batch_size)
+                ).fetchall()
+                self._conn.executemany(
+                    "UPDATE outbox SET next_attempt_at = ?, attempts = attempts + 1 WHERE id = ?",
+                    [(now + self.lease, row["id"]) for row in rows]
+                )
+                self._conn.commit()
+            except BaseException:
+                self._conn.rollback()
+                raise
+            self._leased.update(row["id"] for row in rows)
+        return rows
+
+    def _renew(self):
+        """Extend the lease of every row this process is still working on."""
+        with self._lock, self._conn:
+            expires = time.time() + self.lease
+            self._conn.executemany(
+                "UPDATE outbox SET next_attempt_at = ? WHERE id = ? AND status = ?",
+                [(expires, row_id, PENDING) for row_id in self._leased]
+            )
+
+    def _deliver(self, row: sqlite3.Row):
+        key = row["idempotency_key"]
+        attempts = row["attempts"] + 1
+        try:
+            payload = json.loads(row["payload"])
+            if row["file_path"]:
+                result = self.sender.send_file(row["method"], payload, row["file_path"])
+            else:
+                result = self.sender.call(row["method"], payload)
+        except TelegramError as e:
+            # Rejections other than rate limits (bad chat id, bot blocked, ...) won't succeed later
+            permanent = e.error_code is not None and 400 <= e.error_code < 500 and e.retry_after is None
+            if permanent or attempts >= self.max_attempts:
+                self.logger.error(f"Telegram message {key} failed after {attempts} attempt(s): {str(e)}")
+                self._finish(row["id"], FAILED, last_error=str(e))
+            else:
+                delay = min(self.max_retry_delay, self.retry_delay * 2 ** (attempts - 1))
+                self.logger.warning(f"Telegram message {key} not sent ({str(e)}); retrying in {delay:.0f}s")
+                self._finish(row["id"], PENDING, last_error=str(e), retry_at=time.time() + delay)
+        except Exception as e:
+            self.logger.error(f"Unexpected error sending Telegram message {key}: {str(e)}")
+            self._finish(row["id"], PENDING, last_error=str(e), retry_at=time.time() + self.retry_delay)
+        else:
+            self._finish(row["id"], SENT, result=result)
+
+    def _finish(self, row_id: int, status: str, result: Any = None, last_error: Optional[str] = None,
+                retry_at: Optional[float] = None):
+        with self._lock:
+            with self._conn:
+                if status == SENT:
+                    self._conn.execute(
+                        "UPDATE outbox SET status = ?, sent_at = ?, result = ?, last_error = NULL WHERE id = ?",
+                        (SENT, time.time(), json.dumps(result), row_id)
+                    )
+                elif status == PENDING:
+                    self._conn.execute(
+                        "UPDATE outbox SET next_attempt_at = ?, last_error = ? WHERE id = ?",
+                        (retry_at, last_error, row_id)
+                    )
+                else:
+                    self._conn.execute(
+                        "UPDATE outbox SET status = ?, last_error = ? WHERE id = ?",
+                        (status, last_error, row_id)
+                    )
+            self._leased.discard(row_id)
+
+    def _busy(self) -> bool:
+        """True while a message is being sent or is due now."""
+        with self._lock:
+            # Read together with the due rows: a claim moves rows from one to the other under this lock
+            if self._leased:
+                return True
+            return self._conn.execute(
+                "SELECT 1 FROM outbox WHERE status = ? AND next_attempt_at <= ? LIMIT 1", (PENDING, time.time())
+            ).fetchone() is not None
+
+    def _seconds_until_due(self) -> float:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT MIN(next_attempt_at) FROM outbox WHERE status = ?", (PENDING,)
+            ).fetchone()
+        if row[0] is None:
+            return self.poll_interval
+        return min(self.poll_interval, max(0.0, row[0] - time.time()))
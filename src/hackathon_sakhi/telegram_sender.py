@@ -0,0 +1,312 @@
+"""Rate-limited Telegram Bot API client shared by the Telegram server and the schedulers."""
+
+import time
+import random
+import logging
+import threading
+from pathlib import Path
+from typing import Any, Dict, Optional, Union
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from .telegram_media import FILE_FIELDS, FileIdCache, MultipartStream, uploaded_file_id
+
+DEFAULT_API_URL = "https://api.telegram.org"
+
+# Fragments of Bot API error descriptions meaning a file_id is no longer usable
+FILE_ID_ERRORS = ("wrong file identifier", "file reference")
+
+ChatId = Union[int, str]
+
+
+class TelegramError(Exception):
+    """A Bot API call that failed for good (after any retries).
+
+    Attributes:
+        error_code: HTTP status or Telegram error code, None for network errors
+        retry_after: Seconds Telegram asked us to wait, if it was rate limiting
+    """
+
+    def __init__(self, message: str, error_code: Optional[int] = None,
+                 retry_after: Optional[float] = None):
+        super().__init__(message)
+        self.error_code = error_code
+        self.retry_after = retry_after
+
+
+class TokenBucket:
+    """Thread-safe token bucket.
+
+    Tokens are reserved ahead of time, so callers that arrive while the
+    bucket is empty queue up behind each other in arrival order.
+    """
+
+    def __init__(self, rate: float, capacity: float):
+        """
+        Args:
+            rate: Tokens added per second
+            capacity: Largest burst
+        """
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def reserve(self) -> float:
+        """Take a token; returns the seconds to wait before it may be used."""
+        with self._lock:
+            now = time.monotonic()
+            self._refill(now)
+            self._tokens -= 1
+            return 0.0 if self._tokens >= 0 else -self._tokens / self.rate
+
+    def pause(self, seconds: float):
+        """Hand out no tokens for the next `seconds`, e.g. for Telegram's retry_after."""
+        with self._lock:
+            now = time.monotonic()
+            self._refill(now)
+            self._tokens = min(self._tokens, 0.0) - seconds * self.rate
+
+    def _refill(self, now: float):
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+
+class TelegramSender:
+    """Bot API client with a keep-alive connection pool, rate limiting and retries.
+
+    Every call waits for a token from a bot-wide bucket and from the target
+    chat's bucket, mirroring Telegram's limits (about 30 messages a second
+    overall, one a second per chat and 20 a minute per group). A 429 pauses
+    the chat for the `retry_after` Telegram returns; network errors and 5xx
+    responses are retried with exponential backoff. One instance is safe to
+    share between threads.
+    """
+
+    def __init__(self, bot_token: str, api_url: str = DEFAULT_API_URL,
+                 global_rate: float = 30.0, chat_rate: float = 1.0, group_rate: float = 20 / 60,
+                 max_retries: int = 5, backoff: float = 0.5, max_backoff: float = 30.0,
+                 timeout: float = 10.0, pool_size: int = 20, file_ids: Optional[FileIdCache] = None):
+        """
+        Args:
+            bot_token: Bot token from @BotFather
+            api_url: Bot API server, e.g. a local telegram-bot-api instance
+            global_rate: Calls per second across all chats
+            chat_rate: Calls per second to one private chat
+            group_rate: Calls per second to one group (negative chat id)
+            max_retries: Retries after a rate limit, network error or server error
+            backoff: First retry delay in seconds, doubled on every further retry
+            max_backoff: Longest retry delay
+            timeout: HTTP timeout per request in seconds
+            pool_size: Kept-alive connections, i.e. useful concurrent senders
+            file_ids: Cache of uploaded files' ids; without one every send uploads the file
+        """
+        # The numeric part of the token identifies the bot; file ids are only valid for that bot
+        self.bot_id = bot_token.split(":", 1)[0]
+        self.file_ids = file_ids
+        self.base_url = f"{api_url.rstrip('/')}/bot{bot_token}"
+        self.chat_rate = chat_rate
+        self.group_rate = group_rate
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.timeout = timeout
+        self.logger = logging.getLogger(f"{__name__}.{self.__class__.__name__}")
+
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+
+        self._global = TokenBucket(global_rate, max(1.0, global_rate))
+        self._chats: Dict[str, TokenBucket] = {}
+        self._chats_lock = threading.Lock()
+
+    def send_message(self, chat_id: ChatId, text: str, parse_mode: Optional[str] = "HTML",
+                     **options: Any) -> Dict[str, Any]:
+        """Send a text message; returns the sent Message object.
+
+        Raises:
+            TelegramError: If Telegram rejected the message or retries ran out
+        """
+        payload = {"chat_id": chat_id, "text": text, **options}
+        if parse_mode:
+            payload["parse_mode"] = parse_mode
+        return self.call("sendMessage", payload)
+
+    def send_document(self, chat_id: ChatId, path: Union[str, Path], caption: Optional[str] = None,
+                      parse_mode: Optional[str] = "HTML", **options: Any) -> Dict[str, Any]:
+        """Send a local file as a document; returns the sent Message object.
+
+        Raises:
+            TelegramError: If Telegram rejected the file or retries ran out
+        """
+        return self.send_file("sendDocument", self._media_payload(chat_id, caption, parse_mode, options), path)
+
+    def send_photo(self, chat_id: ChatId, path: Union[str, Path], caption: Optional[str] = None,
+                   parse_mode: Optional[str] = "HTML", **options: Any) -> Dict[str, Any]:
+        """Send a local image as a photo; returns the sent Message object.
+
+        Raises:
+            TelegramError: If Telegram rejected the photo or retries ran out
+        """
+        return self.send_file("sendPhoto", self._media_payload(chat_id, caption, parse_mode, options), path)
+
+    def send_file(self, method: str, payload: Dict[str, Any], path: Union[str, Path]) -> Any:
+        """Call an upload method (sendDocument, sendPhoto, ...) with a local file.
+
+        A file sent before is referenced by its cached file_id instead of being
+        uploaded again; concurrent sends of a new file upload it only once.
+
+        Raises:
+            TelegramError: If Telegram rejected the call or retries ran out
+        """
+        field = FILE_FIELDS[method]
+        if not self.file_ids:
+            return self.call(method, payload, files={field: path})
+
+        try:
+            key = self.file_ids.key(self.bot_id, field, path)
+        except OSError as e:
+            raise TelegramError(f"{method} failed: {e}") from e
+        file_id = self.file_ids.get(key)
+        if file_id is None:
+            with self.file_ids.upload_lock(key):
+                file_id = self.file_ids.get(key)
+                if file_id is None:
+                    result = self.call(method, payload, files={field: path})
+                    file_id = uploaded_file_id(result, field)
+                    if file_id:
+                        self.file_ids.put(key, file_id)
+                    return result
+        try:
+            return self.call(method, {**payload, field: file_id})
+        except TelegramError as e:
+            # Other rejections (bad chat, bad caption, ...) would fail the upload just the same
+            if e.error_code != 400 or not any(error in str(e).lower() for error in FILE_ID_ERRORS):
+                raise
+            # The id is no longer accepted; forget it and upload again
+            self.logger.info(f"Cached file id for {path} rejected ({str(e)}); uploading again")
+            self.file_ids.discard(key)
+            result = self.call(method, payload, files={field: path})
+            file_id = uploaded_file_id(result, field)
+            if file_id:
+                self.file_ids.put(key, file_id)
+            return result
+
+    def call(self, method: str, payload: Dict[str, Any],
+             files: Optional[Dict[str, Union[str, Path]]] = None,
+             timeout: Optional[float] = None, max_retries: Optional[int] = None) -> Any:
+        """Call a Bot API method and return its "result".
+
+        The payload's chat_id (if any) selects the per-chat rate limit.
+        Files (form field -> local path) are streamed as a multipart upload.
+        timeout and max_retries override the client's settings for this call,
+        e.g. for a last call at shutdown.
+
+        Raises:
+            TelegramError: If Telegram rejected the call or retries ran out
+        """
+        timeout = self.timeout if timeout is None else timeout
+        max_retries = self.max_retries if max_retries is None else max_retries
+        chat_id = payload.get("chat_id")
+        url = f"{self.base_url}/{method}"
+        attempt = 0
+        while True:
+            self._wait_turn(chat_id)
+            try:
+                if files:
+                    # A fresh stream per attempt; a retried upload starts from the beginning
+                    body = MultipartStream(payload, files)
+                    try:
+                        response = self.session.post(url, data=body, timeout=timeout,
+                                                     headers={"Content-Type": body.content_type})
+                    finally:
+                        body.close()
+                else:
+                    response = self.session.post(url, json=payload, timeout=timeout)
+                data = self._json(response)
+            except OSError as e:
+                # Includes requests' network errors and unreadable upload files
+                if not isinstance(e, requests.exceptions.RequestException):
+                    raise TelegramError(f"{method} failed: {e}") from e
+                error = TelegramError(f"{method} failed: {e}")
+                delay = None
+            else:
+                if data.get("ok"):
+                    return data.get("result")
+                error = TelegramError(
+                    f"{method} failed: {data.get('description') or response.reason}",
+                    error_code=data.get("error_code", response.status_code),
+                    retry_after=(data.get("parameters") or {}).get("retry_after")
+                )
+                if error.retry_after is not None:
+                    # Telegram says exactly how long to back off; hold the chat (or the bot) until then
+                    delay = float(error.retry_after)
+                    self._bucket(chat_id).pause(delay)
+                elif response.status_code < 500:
+                    raise error
+                else:
+                    delay = None
+
+            if attempt >= max_retries:
+                raise error
+            attempt += 1
+            if delay is not None:
+                # The paused bucket makes the next _wait_turn sleep
+                self.logger.warning(f"{error}; rate limited, retry {attempt}/{max_retries} in {delay:.1f}s")
+                continue
+            delay = min(self.max_backoff, self.backoff * 2 ** (attempt - 1)) * random.uniform(0.5, 1.0)
+            self.logger.warning(f"{error}; retry {attempt}/{max_retries} in {delay:.1f}s")
+            time.sleep(delay)
+
+    @staticmethod
+    def _media_payload(chat_id: ChatId, caption: Optional[str], parse_mode: Optional[str],
+                       options: Dict[str, Any]) -> Dict[str, Any]:
+        payload = {"chat_id": chat_id, **options}
+        if caption:
+            payload["caption"] = caption
+            if parse_mode:
+                payload["parse_mode"] = parse_mode
+        return payload
+
+    def close(self):
+        """Close pooled connections."""
+        self.session.close()
+
+    def _wait_turn(self, chat_id: Optional[ChatId]):
+        """Block until both the bot-wide and the chat's rate limits allow a call."""
+        if chat_id is not None:
+            wait = self._bucket(chat_id).reserve()
+            if wait > 0:
+                time.sleep(wait)
+        # Only now take the bot-wide token; one taken before a long chat wait would be
+        # spent late, together with every other paused chat's, bursting past the limit
+        wait = self._global.reserve()
+        if wait > 0:
+            time.sleep(wait)
+
+    def _bucket(self, chat_id: Optional[ChatId]) -> TokenBucket:
+        if chat_id is None:
+            return self._global
+        key = str(chat_id)
+        with self._chats_lock:
+            bucket = self._chats.get(key)
+            if bucket is None:
+                # Group and channel ids are negative; they get the lower group limit
+                rate = self.group_rate if key.startswith("-") else self.chat_rate
+                bucket = self._chats[key] = TokenBucket(rate, 1.0)
+            return bucket
+
+    @staticmethod
+    def _json(response: requests.Response) -> Dict[str, Any]:
+        """Bot API response body; non-JSON bodies (e.g. proxy errors) become a failure."""
+        try:
+            data = response.json()
+        except ValueError:
+            data = None
+        if not isinstance(data, dict):
+            return {"ok": False, "error_code": response.status_code, "description": response.reason}
+        return data
@@ -7,17 +7,71 @@ Provides weather data for safety planning.
 Environment Variables:
     OPENWEATHER_API_KEY: Your OpenWeatherMap API key (required)
     LOG_LEVEL: Logging level (optional, default: INFO)
+    WEATHER_CACHE_TTL: Seconds a city's weather is reused (optional, default: 600, 0 disables caching)
+    SAKHI_CACHE_DIR: Directory of the persistent weather cache (optional, default: ~/.cache/hackathon-sakhi)
 """
 
 import os
+import json
+import time
 import logging
+import threading
 from abc import ABC, abstractmethod
-from typing import Optional, Dict, Any
-from dataclasses import dataclass
+from concurrent.futures import Future, ThreadPoolExecutor
+from pathlib import Path
+from typing import Optional, Dict, Any, Callable, List, Tuple, Union
+from dataclasses import dataclass, asdict, replace
+from datetime import datetime, timedelta, timezone
 import requests
 from dotenv import load_dotenv
 from mcp.server.fastmcp import FastMCP
 
+from .paths import default_cache_dir
+
+# Alternative and historical names mapped to the name queried upstream
+CITY_ALIASES = {
+    "new delhi": "delhi",
+    "delhi ncr": "delhi",
+    "bombay": "mumbai",
+    "madras": "chennai",
+    "calcutta": "kolkata",
+    "bengaluru": "bangalore",
+    "gurgaon": "gurugram",
+    "prayagraj": "allahabad",
+    "trivandrum": "thiruvananthapuram",
+}
+
+
+_GEOHASH_BASE32 = "0123456789bcdefghjkmnpqrstuvwxyz"
+
+
+def geohash(lat: float, lng: float, precision: int = 5) -> str:
+    """Geohash of a coordinate; precision 5 cells are roughly 5 x 5 km."""
+    lat_range, lng_range = [-90.0, 90.0], [-180.0, 180.0]
+    chars = []
+    bits, bit_count, even = 0, 0, True
+    while len(chars) < precision:
+        value, bounds = (lng, lng_range) if even else (lat, lat_range)
+        middle = (bounds[0] + bounds[1]) / 2
+        bits <<= 1
+        if value >= middle:
+            bits |= 1
+            bounds[0] = middle
+        else:
+            bounds[1] = middle
+        even = not even
+        bit_count += 1
+        if bit_count == 5:
+            chars.append(_GEOHASH_BASE32[bits])
+            bits, bit_count = 0, 0
+    return "".join(chars)
+
+
+def normalize_city(city: str) -> str:
+    """Cache key for a city name: trimmed, single-spaced, casefolded and de-aliased."""
+    key = " ".join(city.split()).casefold()
+    return CITY_ALIASES.get(key, key)
+
 
 @dataclass
 class WeatherData:
@@ -27,9 +81,99 @@ class WeatherData:
     description: str
     humidity: int
     wind_speed: float
+    # OpenWeatherMap city id, when the data came from OpenWeatherMap
+    city_id: Optional[int] = None
+    # Time (epoch seconds) a forecast entry is for; None for current conditions
+    forecast_at: Optional[float] = None
+    visibility: Optional[int] = None         # metres
+    rain_mm_per_hour: float = 0.0
+    clouds: Optional[int] = None             # percent
+    observed_at: Optional[float] = None      # epoch seconds of the measurement
+    sunrise: Optional[float] = None          # epoch seconds
+    sunset: Optional[float] = None           # epoch seconds
+    utc_offset: int = 0                      # seconds east of UTC at the location
+    
+    def is_night(self, at: Optional[float] = None) -> Optional[bool]:
+        """Whether `at` (default: the forecast or observation time, else now) is between sunset and sunrise.
+        
+        Compared by local time of day, so a forecast days ahead uses the
+        nearest known sunrise and sunset. None if they are unknown.
+        """
+        if self.sunrise is None or self.sunset is None:
+            return None
+        if at is None:
+            at = self.forecast_at or self.observed_at or time.time()
+        time_of_day = lambda ts: (ts + self.utc_offset) % 86400
+        return not time_of_day(self.sunrise) <= time_of_day(at) < time_of_day(self.sunset)
+    
+    def travel_risk(self, at: Optional[float] = None) -> Dict[str, Any]:
+        """Night / low-visibility / rain travel risk: score 0-100, level and contributing factors."""
+        score = 0
+        factors = []
+        
+        def add(points: int, factor: str):
+            nonlocal score
+            score += points
+            factors.append(factor)
+        
+        if self.is_night(at):
+            add(35, "after dark")
+        if self.visibility is not None:
+            if self.visibility < 200:
+                add(35, f"very low visibility ({self.visibility} m)")
+            elif self.visibility < 1000:
+                add(25, f"low visibility ({self.visibility} m)")
+            elif self.visibility < 3000:
+                add(10, f"reduced visibility ({self.visibility} m)")
+        elif any(word in self.description.lower() for word in ("fog", "mist", "haze", "smoke")):
+            add(10, self.description)
+        if self.rain_mm_per_hour >= 7.6:
+            add(25, f"heavy rain ({self.rain_mm_per_hour:.1f} mm/h)")
+        elif self.rain_mm_per_hour >= 2.5:
+            add(15, f"moderate rain ({self.rain_mm_per_hour:.1f} mm/h)")
+        elif self.rain_mm_per_hour > 0:
+            add(5, f"light rain ({self.rain_mm_per_hour:.1f} mm/h)")
+        if "thunderstorm" in self.description.lower():
+            add(15, "thunderstorm")
+        if self.wind_speed >= 14:
+            add(10, f"strong wind ({self.wind_speed} m/s)")
+        if self.temperature >= 40 or self.temperature <= 5:
+            add(5, f"extreme temperature ({self.temperature}°C)")
+        
+        score = min(score, 100)
+        level = "low" if score < 25 else "moderate" if score < 50 else "high" if score < 75 else "severe"
+        return {"score": score, "level": level, "factors": factors}
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """Structured weather for tool responses, including the travel risk."""
+        local = timezone(timedelta(seconds=self.utc_offset))
+        iso = lambda ts: (
+            datetime.fromtimestamp(ts, tz=local).isoformat(timespec="minutes") if ts is not None else None
+        )
+        return {
+            "city": self.city,
+            "temperature_c": self.temperature,
+            "description": self.description,
+            "humidity_pct": self.humidity,
+            "wind_speed_ms": self.wind_speed,
+            "visibility_m": self.visibility,
+            "rain_mm_per_hour": self.rain_mm_per_hour,
+            "clouds_pct": self.clouds,
+            "observed_at": iso(self.observed_at),
+            "forecast_at": iso(self.forecast_at),
+            "sunrise": iso(self.sunrise),
+            "sunset": iso(self.sunset),
+            "is_night": self.is_night(),
+            "travel_risk": self.travel_risk()
+        }
     
     def to_string(self) -> str:
         """Convert weather data to human-readable string."""
+        if self.forecast_at is not None:
+            when = datetime.fromtimestamp(self.forecast_at, tz=timezone.utc).strftime("%Y-%m-%d %H:%M UTC")
+            return (f"The weather in {self.city} around {when} is forecast to be {self.description} "
+                    f"with a temperature of {self.temperature}°C. "
+                    f"Humidity {self.humidity}% and wind speed {self.wind_speed} m/s are expected.")
         return (f"The weather in {self.city} is currently {self.description} "
                 f"with a temperature of {self.temperature}°C. "
                 f"Humidity is {self.humidity}% and wind speed is {self.wind_speed} m/s.")
@@ -42,15 +186,54 @@ class WeatherServiceInterface(ABC):
     def get_weather(self, city: str) -> Optional[WeatherData]:
         """Get weather data for a city."""
         pass
+    
+    def get_weather_batch(self, cities: List[str], max_workers: int = 8) -> Dict[str, Optional[WeatherData]]:
+        """Get weather data for several cities concurrently, keyed by the given names."""
+        unique = list(dict.fromkeys(cities))
+        if not unique:
+            return {}
+        with ThreadPoolExecutor(max_workers=min(max_workers, len(unique)),
+                                thread_name_prefix="weather") as executor:
+            return dict(zip(unique, executor.map(self.get_weather, unique)))
+    
+    @abstractmethod
+    def get_weather_at(self, lat: float, lng: float) -> Optional[WeatherData]:
+        """Get current weather data for a coordinate."""
+        pass
+    
+    @abstractmethod
+    def get_forecast_at(self, lat: float, lng: float) -> Optional[List[WeatherData]]:
+        """Get forecast entries (with forecast_at set, in time order) for a coordinate."""
+        pass
+
+
+def pick_forecast(entries: List[WeatherData], target: float) -> Optional[WeatherData]:
+    """Forecast entry closest in time to target (epoch seconds)."""
+    return min(entries, key=lambda entry: abs(entry.forecast_at - target), default=None)
 
 
 class OpenWeatherMapService(WeatherServiceInterface):
     """OpenWeatherMap API implementation."""
     
-    def __init__(self, api_key: str):
+    # Maximum ids per request to the group endpoint
+    GROUP_LIMIT = 20
+    
+    def __init__(self, api_key: str, city_ids_path: Optional[Path] = None):
+        """
+        Args:
+            api_key: OpenWeatherMap API key
+            city_ids_path: Optional JSON file remembering the city ids seen in responses,
+                so later batches can use the group endpoint
+        """
         self.api_key = api_key
         self.base_url = "https://api.openweathermap.org/data/2.5/weather"
+        self.group_url = "https://api.openweathermap.org/data/2.5/group"
+        self.forecast_url = "https://api.openweathermap.org/data/2.5/forecast"
+        self.city_ids_path = city_ids_path
+        self.session = requests.Session()
         self.logger = logging.getLogger(f"{__name__}.{self.__class__.__name__}")
+        self._lock = threading.Lock()
+        self._city_ids: Dict[str, int] = self._load_city_ids()
     
     def get_weather(self, city: str) -> Optional[WeatherData]:
         """Fetch weather data from OpenWeatherMap API."""
@@ -61,17 +244,11 @@ class OpenWeatherMapService(WeatherServiceInterface):
                 "units": "metric"
             }
             
-            response = requests.get(self.base_url, params=params, timeout=10)
+            response = self.session.get(self.base_url, params=params, timeout=10)
             response.raise_for_status()
-            data = response.json()
-            
-            return WeatherData(
-                city=city,
-                temperature=data['main']['temp'],
-                description=data['weather'][0]['description'],
-                humidity=data['main']['humidity'],
-                wind_speed=data['wind']['speed']
-            )
+            weather = self._parse(city, response.json())
+            self._remember_city_id(city, weather.city_id)
+            return weather
             
         except requests.exceptions.RequestException as e:
             self.logger.error(f"Error fetching weather data for {city}: {str(e)}")
@@ -79,6 +256,322 @@ class OpenWeatherMapService(WeatherServiceInterface):
         except KeyError as e:
             self.logger.error(f"Unexpected API response format: {str(e)}")
             return None
+    
+    def get_weather_batch(self, cities: List[str], max_workers: int = 8) -> Dict[str, Optional[WeatherData]]:
+        """Fetch several cities: known city ids via the group endpoint, the rest concurrently."""
+        unique = list(dict.fromkeys(cities))
+        with self._lock:
+            by_id = {city: self._city_ids[normalize_city(city)] for city in unique
+                     if normalize_city(city) in self._city_ids}
+        
+        results: Dict[str, Optional[WeatherData]] = {}
+        groups = list(by_id.items())
+        chunks = [dict(groups[i:i + self.GROUP_LIMIT]) for i in range(0, len(groups), self.GROUP_LIMIT)]
+        for chunk in chunks:
+            results.update(self._get_group(chunk))
+        
+        # Anything the group endpoint did not return is looked up by name
+        remaining = [city for city in unique if results.get(city) is None]
+        results.update(super().get_weather_batch(remaining, max_workers))
+        return results
+    
+    def get_weather_at(self, lat: float, lng: float) -> Optional[WeatherData]:
+        """Fetch current weather data for a coordinate."""
+        try:
+            data = self._get_json(self.base_url, {"lat": lat, "lon": lng})
+            return self._parse(data.get("name") or f"{lat:.3f},{lng:.3f}", data)
+        except requests.exceptions.RequestException as e:
+            self.logger.error(f"Error fetching weather data for {lat},{lng}: {str(e)}")
+            return None
+        except KeyError as e:
+            self.logger.error(f"Unexpected API response format: {str(e)}")
+            return None
+    
+    def get_forecast_at(self, lat: float, lng: float) -> Optional[List[WeatherData]]:
+        """Fetch the 5 day / 3 hour forecast for a coordinate."""
+        try:
+            data = self._get_json(self.forecast_url, {"lat": lat, "lon": lng})
+            city = data.get("city", {})
+            place = city.get("name") or f"{lat:.3f},{lng:.3f}"
+            return [
+                replace(self._parse(place, item, city), forecast_at=float(item["dt"]), observed_at=None)
+                for item in data["list"]
+            ]
+        except requests.exceptions.RequestException as e:
+            self.logger.error(f"Error fetching forecast for {lat},{lng}: {str(e)}")
+            return None
+        except KeyError as e:
+            self.logger.error(f"Unexpected API response format: {str(e)}")
+            return None
+    
+    def _get_json(self, url: str, params: Dict[str, Any]) -> Dict[str, Any]:
+        response = self.session.get(
+            url, params={**params, "appid": self.api_key, "units": "metric"}, timeout=10
+        )
+        response.raise_for_status()
+        return response.json()
+    
+    def _get_group(self, city_ids: Dict[str, int]) -> Dict[str, Optional[WeatherData]]:
+        try:
+            params = {
+                "id": ",".join(str(city_id) for city_id in city_ids.values()),
+                "appid": self.api_key,
+                "units": "metric"
+            }
+            response = self.session.get(self.group_url, params=params, timeout=10)
+            response.raise_for_status()
+            by_id = {item["id"]: item for item in response.json()["list"]}
+            return {
+                city: self._parse(city, by_id[city_id]) if city_id in by_id else None
+                for city, city_id in city_ids.items()
+            }
+        except requests.exceptions.RequestException as e:
+            self.logger.error(f"Error fetching grouped weather data for {list(city_ids)}: {str(e)}")
+            return {}
+        except KeyError as e:
+            self.logger.error(f"Unexpected API response format: {str(e)}")
+            return {}
+    
+    @staticmethod
+    def _parse(city: str, data: Dict[str, Any], sun: Optional[Dict[str, Any]] = None) -> WeatherData:
+        """WeatherData from a current-weather or forecast item; `sun` holds sunrise/sunset/timezone
+        for forecast items, which carry them on the enclosing city instead."""
+        if sun is None:
+            # /weather items carry the offset at the top level, /group items only in sys
+            sys_data = data.get('sys', {})
+            sun = {**sys_data, "timezone": data.get('timezone', sys_data.get('timezone', 0))}
+        rain = data.get('rain') or {}
+        return WeatherData(
+            city=city,
+            temperature=data['main']['temp'],
+            description=data['weather'][0]['description'],
+            humidity=data['main']['humidity'],
+            wind_speed=data['wind']['speed'],
+            city_id=data.get('id'),
+            visibility=data.get('visibility'),
+            rain_mm_per_hour=rain.get('1h', rain.get('3h', 0.0) / 3),
+            clouds=data.get('clouds', {}).get('all'),
+            observed_at=data.get('dt'),
+            sunrise=sun.get('sunrise'),
+            sunset=sun.get('sunset'),
+            utc_offset=sun.get('timezone') or 0
+        )
+    
+    def _load_city_ids(self) -> Dict[str, int]:
+        if not self.city_ids_path or not self.city_ids_path.exists():
+            return {}
+        try:
+            return {key: int(value) for key, value in
+                    json.loads(self.city_ids_path.read_text(encoding="utf-8")).items()}
+        except (OSError, ValueError, AttributeError) as e:
+            self.logger.warning(f"Ignoring unreadable city id file {self.city_ids_path}: {str(e)}")
+            return {}
+    
+    def _remember_city_id(self, city: str, city_id: Optional[int]):
+        key = normalize_city(city)
+        with self._lock:
+            if not city_id or self._city_ids.get(key) == city_id:
+                return
+            self._city_ids[key] = city_id
+            city_ids = dict(self._city_ids)
+        if self.city_ids_path:
+            try:
+                self.city_ids_path.parent.mkdir(parents=True, exist_ok=True)
+                tmp_path = self.city_ids_path.with_name(f"{self.city_ids_path.name}.{os.getpid()}.tmp")
+                tmp_path.write_text(json.dumps(city_ids), encoding="utf-8")
+                os.replace(tmp_path, self.city_ids_path)
+            except OSError as e:
+                self.logger.warning(f"Could not save city ids {self.city_ids_path}: {str(e)}")
+
+
+# Current conditions, or a forecast's entries
+CachedValue = Union[WeatherData, List[WeatherData]]
+
+
+class CachedWeatherService(WeatherServiceInterface):
+    """Caches another weather service's results per normalised city for a TTL.
+
+    Coordinate lookups are cached per geohash cell, so nearby positions
+    share entries. Concurrent lookups of the same key share one upstream
+    request. Entries can be persisted to a JSON file so short-lived server
+    processes (one per agent run) still reuse each other's results.
+    """
+    
+    def __init__(self, service: WeatherServiceInterface, ttl: float = 600,
+                 path: Optional[Path] = None, forecast_ttl: float = 1800,
+                 geohash_precision: int = 5):
+        """
+        Args:
+            service: Upstream weather service
+            ttl: Seconds a result is reused
+            path: Optional JSON file the cache is loaded from and saved to
+            forecast_ttl: Seconds a forecast is reused
+            geohash_precision: Geohash length of the cells coordinate lookups share
+        """
+        self.service = service
+        self.ttl = ttl
+        self.path = path
+        self.forecast_ttl = forecast_ttl
+        self.geohash_precision = geohash_precision
+        self.logger = logging.getLogger(f"{__name__}.{self.__class__.__name__}")
+        self._lock = threading.Lock()
+        self._inflight: Dict[str, Future] = {}
+        self._entries: Dict[str, Tuple[float, CachedValue]] = self._load()
+    
+    def get_weather(self, city: str) -> Optional[WeatherData]:
+        """Cached weather for a city; failed lookups are not cached."""
+        return self.get_weather_batch([city])[city]
+    
+    def get_weather_batch(self, cities: List[str], max_workers: int = 8) -> Dict[str, Optional[WeatherData]]:
+        """Cached weather for several cities; the misses go upstream as one batch."""
+        keys = {city: normalize_city(city) for city in cities}
+        found: Dict[str, Optional[WeatherData]] = {}
+        led: Dict[str, Future] = {}
+        waiting: Dict[str, Future] = {}
+        now = time.time()
+        with self._lock:
+            for key in dict.fromkeys(keys.values()):
+                entry = self._entries.get(key)
+                if entry and entry[0] > now:
+                    found[key] = entry[1]
+                elif key in self._inflight:
+                    waiting[key] = self._inflight[key]
+                else:
+                    led[key] = self._inflight[key] = Future()
+        
+        if led:
+            fetched: Dict[str, Optional[WeatherData]] = {}
+            try:
+                # Another server process may have fetched some since this one started
+                stored = self._load()
+                misses = []
+                for key in led:
+                    if key in stored:
+                        fetched[key] = stored[key][1]
+                        with self._lock:
+                            self._entries[key] = stored[key]
+                    else:
+                        misses.append(key)
+                
+                if misses:
+                    upstream = self.service.get_weather_batch([key.title() for key in misses], max_workers)
+                    expires_at = time.time() + self.ttl
+                    for key in misses:
+                        data = upstream.get(key.title())
+                        fetched[key] = data
+                        if data:
+                            with self._lock:
+                                self._entries[key] = (expires_at, data)
+                    if any(fetched.get(key) for key in misses):
+                        self._save()
+            finally:
+                with self._lock:
+                    for key in led:
+                        del self._inflight[key]
+                for key, future in led.items():
+                    future.set_result(fetched.get(key))
+            found.update(fetched)
+        
+        for key, future in waiting.items():
+            found[key] = future.result()
+        
+        # Report each city under the name it was asked for
+        results = {}
+        for city, key in keys.items():
+            data = found.get(key)
+            results[city] = replace(data, city=" ".join(city.split())) if data else None
+        return results
+    
+    def get_weather_at(self, lat: float, lng: float) -> Optional[WeatherData]:
+        """Cached current weather for the geohash cell containing the coordinate."""
+        cell = geohash(lat, lng, self.geohash_precision)
+        return self._get_one(f"geo:{cell}", lambda: self.service.get_weather_at(lat, lng), self.ttl)
+    
+    def get_forecast_at(self, lat: float, lng: float) -> Optional[List[WeatherData]]:
+        """Cached forecast for the geohash cell containing the coordinate."""
+        cell = geohash(lat, lng, self.geohash_precision)
+        return self._get_one(
+            f"forecast:{cell}", lambda: self.service.get_forecast_at(lat, lng), self.forecast_ttl
+        )
+    
+    def _get_one(self, key: str, fetch: Callable[[], Optional[CachedValue]],
+                 ttl: float) -> Optional[CachedValue]:
+        """Cached value for key, fetching it once (shared by concurrent callers) on a miss."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry and entry[0] > time.time():
+                return entry[1]
+            future = self._inflight.get(key)
+            leader = future is None
+            if leader:
+                future = self._inflight[key] = Future()
+        
+        if not leader:
+            return future.result()
+        
+        value = None
+        try:
+            stored = self._load().get(key)
+            if stored:
+                value = stored[1]
+                with self._lock:
+                    self._entries[key] = stored
+            else:
+                value = fetch()
+                if value:
+                    with self._lock:
+                        self._entries[key] = (time.time() + ttl, value)
+                    self._save()
+        finally:
+            with self._lock:
+                del self._inflight[key]
+            future.set_result(value)
+        return value
+    
+    def _load(self) -> Dict[str, Tuple[float, CachedValue]]:
+        if not self.path or not self.path.exists():
+            return {}
+        try:
+            raw = json.loads(self.path.read_text(encoding="utf-8"))
+            now = time.time()
+            return {
+                key: (
+                    entry["expires_at"],
+                    [WeatherData(**item) for item in entry["data"]] if isinstance(entry["data"], list)
+                    else WeatherData(**entry["data"])
+                )
+                for key, entry in raw.items()
+                if entry["expires_at"] > now
+            }
+        except (OSError, ValueError, TypeError, KeyError) as e:
+            self.logger.warning(f"Ignoring unreadable weather cache {self.path}: {str(e)}")
+            return {}
+    
+    def _save(self):
+        if not self.path:
+            return
+        # Merge with entries other processes saved, keeping the fresher of each
+        entries = self._load()
+        with self._lock:
+            for key, entry in self._entries.items():
+                if key not in entries or entry[0] > entries[key][0]:
+                    entries[key] = entry
+        now = time.time()
+        raw = {
+            key: {
+                "expires_at": expires_at,
+                "data": [asdict(item) for item in data] if isinstance(data, list) else asdict(data)
+            }
+            for key, (expires_at, data) in entries.items()
+            if expires_at > now
+        }
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = self.path.with_name(f"{self.path.name}.{os.getpid()}.tmp")
+            tmp_path.write_text(json.dumps(raw), encoding="utf-8")
+            os.replace(tmp_path, self.path)
+        except OSError as e:
+            self.logger.warning(f"Could not save weather cache {self.path}: {str(e)}")
 
 
 class WeatherMCPServer:
@@ -94,7 +587,7 @@ class WeatherMCPServer:
         """Register MCP tools."""
         
         @self.mcp.tool()
-        def get_hackathon_weather(city: str) -> str:
+        def get_hackathon_weather(city: str) -> Dict[str, Any]:
             """
             Get the current weather conditions for a specified city.
             Use this tool when the user asks for the weather, temperature, or conditions.
@@ -103,15 +596,85 @@ class WeatherMCPServer:
                 city: The name of the city (e.g., "London", "Tokyo").
 
             Returns:
-                A string with the current weather summary.
+                A dictionary with a text "summary" and structured "weather": visibility, rain intensity,
+                sunrise/sunset, is_night and a travel_risk score (0-100) with level and factors.
             """
             self.logger.info(f"Tool called: get_current_weather({city})")
             
             weather_data = self.weather_service.get_weather(city)
             if weather_data:
-                return weather_data.to_string()
+                return self._weather_response(weather_data)
+            else:
+                return {
+                    "error": f"Sorry, I couldn't fetch weather data for {city}. "
+                             f"Please check the city name and try again."
+                }
+        
+        @self.mcp.tool()
+        def get_hackathon_weather_at(latitude: float, longitude: float, hours_ahead: float = 0) -> Dict[str, Any]:
+            """
+            Get the weather at a coordinate, now or forecast up to 5 days ahead.
+            Use this with the latitude/longitude of a location snapshot or a point on a trip route.
+
+            Args:
+                latitude: Latitude in degrees (e.g., 28.6139).
+                longitude: Longitude in degrees (e.g., 77.2090).
+                hours_ahead: 0 for current conditions, otherwise hours from now (up to 120).
+
+            Returns:
+                A dictionary with a text "summary" and structured "weather", as get_hackathon_weather.
+            """
+            self.logger.info(f"Tool called: get_hackathon_weather_at({latitude}, {longitude}, {hours_ahead})")
+            
+            if not (-90 <= latitude <= 90 and -180 <= longitude <= 180):
+                return {"error": f"Invalid coordinate {latitude},{longitude}."}
+            if not 0 <= hours_ahead <= 120:
+                return {"error": "hours_ahead must be between 0 and 120."}
+            
+            if hours_ahead:
+                entries = self.weather_service.get_forecast_at(latitude, longitude)
+                weather_data = pick_forecast(entries or [], time.time() + hours_ahead * 3600)
             else:
-                return f"Sorry, I couldn't fetch weather data for {city}. Please check the city name and try again."
+                weather_data = self.weather_service.get_weather_at(latitude, longitude)
+            
+            if weather_data:
+                return self._weather_response(weather_data)
+            return {"error": f"Sorry, I couldn't fetch weather data for {latitude},{longitude}."}
+        
+        @self.mcp.tool()
+        def get_hackathon_weather_batch(cities: List[str]) -> Dict[str, Any]:
+            """
+            Get the current weather conditions for several cities at once.
+            Use this tool instead of repeated get_hackathon_weather calls, e.g. for a trip's
+            source, destination and stops.
+
+            Args:
+                cities: City names (e.g., ["Delhi", "Agra", "Jaipur"]).
+
+            Returns:
+                A dictionary with one result per city, in the order given: a text "summary" and
+                structured "weather" as get_hackathon_weather, or an "error".
+            """
+            self.logger.info(f"Tool called: get_hackathon_weather_batch({cities})")
+            
+            try:
+                weather = self.weather_service.get_weather_batch(cities)
+                results = []
+                for city in dict.fromkeys(cities):
+                    weather_data = weather.get(city)
+                    if weather_data:
+                        results.append({"city": city, **self._weather_response(weather_data)})
+                    else:
+                        results.append({"city": city, "error": f"Couldn't fetch weather data for {city}"})
+                return {"results": results}
+            
+            except Exception as e:
+                self.logger.error(f"Error fetching batch weather: {str(e)}")
+                return {"error": str(e), "results": []}
+    
+    @staticmethod
+    def _weather_response(weather_data: WeatherData) -> Dict[str, Any]:
+        return {"summary": weather_data.to_string(), "weather": weather_data.to_dict()}
     
     def run(self):
         """Start the MCP server."""
@@ -145,7 +708,14 @@ def main():
         setup_logging(log_level)
         
         # Initialize services
-        weather_service = OpenWeatherMapService(api_key)
+        weather_service: WeatherServiceInterface = OpenWeatherMapService(
+            api_key, city_ids_path=default_cache_dir() / "weather_city_ids.json"
+        )
+        ttl = float(os.getenv("WEATHER_CACHE_TTL", "600"))
+        if ttl > 0:
+            weather_service = CachedWeatherService(
+                weather_service, ttl=ttl, path=default_cache_dir() / "weather.json"
+            )
         server = WeatherMCPServer(weather_service)
         
         # Start server
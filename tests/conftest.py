@@ -0,0 +1,62 @@
+"""Shared fixtures: a local stand-in for the Telegram Bot API."""
+
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+
+class FakeBotAPI(ThreadingHTTPServer):
+    """Records every call; `reply(method, payload)` decides the (status, body) answer."""
+
+    daemon_threads = True
+    # Bursts from many sender threads must not be refused at connect time
+    request_queue_size = 128
+
+    def __init__(self):
+        super().__init__(("127.0.0.1", 0), _Handler)
+        self.calls = []
+        self.lock = threading.Lock()
+        self.reply = lambda method, payload: (200, {"ok": True, "result": {"message_id": 1}})
+
+    @property
+    def url(self):
+        return f"http://127.0.0.1:{self.server_address[1]}"
+
+    def times(self, method=None):
+        with self.lock:
+            return [at for at, name, _ in self.calls if method in (None, name)]
+
+
+class _Handler(BaseHTTPRequestHandler):
+    def do_POST(self):
+        body = self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        method = self.path.rsplit("/", 1)[-1]
+        if self.headers.get("Content-Type", "").startswith("multipart/form-data"):
+            payload = {"upload": True}
+        else:
+            payload = json.loads(body or b"{}")
+        with self.server.lock:
+            self.server.calls.append((time.monotonic(), method, payload))
+        status, reply = self.server.reply(method, payload)
+        data = json.dumps(reply).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture
+def api():
+    server = FakeBotAPI()
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
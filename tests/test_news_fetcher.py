@@ -0,0 +1,64 @@
+"""ArticleFetcher conditional GET against a local feed server."""
+
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from hackathon_sakhi.news.cache import FeedCache
+from hackathon_sakhi.news.fetcher import ArticleFetcher
+
+FEED = b"""<?xml version="1.0"?>
+<rss version="2.0"><channel><title>Local News</title>
+<item><title>Road closed near the station</title><link>http://example.com/1</link>
+<description>Police closed the road.</description></item>
+</channel></rss>"""
+
+
+class _FeedHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        self.server.requests.append(dict(self.headers))
+        if self.headers.get("If-None-Match") == '"v1"':
+            self.send_response(304)
+            self.end_headers()
+            return
+        self.send_response(200)
+        self.send_header("Content-Type", "application/rss+xml")
+        self.send_header("ETag", '"v1"')
+        self.send_header("Content-Length", str(len(FEED)))
+        self.end_headers()
+        self.wfile.write(FEED)
+
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture
+def feed_url():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _FeedHandler)
+    server.requests = []
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield f"http://127.0.0.1:{server.server_address[1]}/feed.xml", server.requests
+    server.shutdown()
+    server.server_close()
+
+
+def test_not_modified_feed_comes_from_the_cache(tmp_path, feed_url):
+    url, requests = feed_url
+    fetcher = ArticleFetcher(cache=FeedCache(tmp_path / "feeds.json"))
+
+    assert [a.title for a in fetcher.fetch_rss(url)] == ["Road closed near the station"]
+    assert [a.title for a in fetcher.fetch_rss(url)] == ["Road closed near the station"]
+    assert len(requests) == 2
+
+
+def test_not_modified_without_a_usable_cached_copy_is_fetched_again(tmp_path, feed_url):
+    url, requests = feed_url
+    cache = FeedCache(tmp_path / "feeds.json")
+    # Validators survived but the entries did not
+    cache._entries[url] = {"etag": '"v1"', "last_modified": None, "articles": [{"title": "broken"}]}
+    fetcher = ArticleFetcher(cache=cache)
+
+    assert [a.title for a in fetcher.fetch_rss(url)] == ["Road closed near the station"]
+    assert [r.get("If-None-Match") for r in requests] == ['"v1"', None]
+    assert cache.get_articles(url) is not None
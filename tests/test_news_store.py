@@ -0,0 +1,51 @@
+"""ArticleStore retention: articles feeds still serve are not pruned."""
+
+import sqlite3
+import time
+
+from hackathon_sakhi.news.models import Article
+from hackathon_sakhi.news.store import ArticleStore
+
+DAY = 86400
+
+
+def article(key):
+    return Article(title=f"Harassment case {key}", summary="Police arrested a man.", published="",
+                   url=f"http://news.example/{key}", source="Local News", guid=key)
+
+
+def age(store, days):
+    with store._conn:
+        store._conn.execute("UPDATE articles SET ingested_at = ?, seen_at = ?",
+                            (time.time() - days * DAY,) * 2)
+
+
+def test_prune_keeps_articles_still_served(tmp_path):
+    store = ArticleStore(tmp_path / "articles.db")
+    store.add([article("served"), article("gone")], {"served", "gone"})
+    age(store, 8)
+
+    store.mark_seen(store.existing_keys(["served"]))
+    removed = store.prune(7 * DAY)
+
+    assert [a.key for a in removed] == ["gone"]
+    assert store.existing_keys(["served", "gone"]) == {"served"}
+    store.close()
+
+
+def test_existing_store_is_migrated_with_seen_at_from_ingested_at(tmp_path):
+    path = tmp_path / "articles.db"
+    store = ArticleStore(path)
+    store.add([article("old")], {"old"})
+    age(store, 8)
+    store.close()
+    # As stored before seen_at existed
+    conn = sqlite3.connect(str(path))
+    conn.execute("DROP INDEX idx_articles_seen")
+    conn.execute("ALTER TABLE articles DROP COLUMN seen_at")
+    conn.commit()
+    conn.close()
+
+    store = ArticleStore(path)
+    assert [a.key for a in store.prune(7 * DAY)] == ["old"]
+    store.close()
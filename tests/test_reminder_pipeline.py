@@ -0,0 +1,92 @@
+"""ReminderPipeline fan-out: many due trips at once against a stub agent and outbox."""
+
+import asyncio
+import threading
+import time
+from collections import Counter
+from datetime import datetime, timedelta
+
+import scheduler
+from agent_runner import AgentRunResult
+
+TRIPS = 100
+REPORT_SECONDS = 0.05
+
+
+class StubOutbox:
+    """Records what would have been committed to the Telegram outbox."""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.messages = []
+        self.documents = []
+
+    def send_message(self, chat_id, text, parse_mode="HTML", key=None):
+        with self.lock:
+            self.messages.append((key, time.monotonic()))
+
+    def send_document(self, chat_id, path, caption=None, parse_mode="HTML", key=None):
+        with self.lock:
+            self.documents.append(key)
+
+    def status(self, key):
+        return {"status": "pending", "last_error": None}
+
+
+class StubRunner:
+    """Stands in for AgentRunner; each "agent run" just sleeps, tracking concurrency."""
+
+    def __init__(self):
+        self.labels = []
+        self.running = 0
+        self.max_running = 0
+
+    async def run(self, agent, cmd, timeout, label=""):
+        self.labels.append(label)
+        self.running += 1
+        self.max_running = max(self.max_running, self.running)
+        try:
+            await asyncio.sleep(REPORT_SECONDS)
+        finally:
+            self.running -= 1
+        return AgentRunResult(agent=agent, label=label, returncode=0, elapsed=REPORT_SECONDS)
+
+
+def make_trips(count):
+    departure = (datetime.now() + timedelta(hours=2)).replace(microsecond=0).isoformat()
+    return [{"id": i, "source": "Home", "destination": f"City {i}", "datetime": departure} for i in range(count)]
+
+
+def test_simultaneous_trips_are_each_dispatched_once_within_the_cap(tmp_path, monkeypatch):
+    monkeypatch.setattr(scheduler, "REPORTS_DIR", tmp_path)
+    monkeypatch.setattr(scheduler, "log", lambda message: None)
+    trips = make_trips(TRIPS)
+    for trip in trips:
+        (tmp_path / scheduler.report_filename(trip)).write_text("<html></html>")
+
+    outbox = StubOutbox()
+    runner = StubRunner()
+
+    async def run():
+        pipeline = scheduler.ReminderPipeline(runner, outbox)
+        started = time.monotonic()
+        delivered = await pipeline.dispatch(trips)
+        fast_path = time.monotonic() - started
+        pending_reports = len(pipeline.reports)
+        await pipeline.drain()
+        return delivered, fast_path, pending_reports
+
+    delivered, fast_path, pending_reports = asyncio.run(run())
+
+    assert delivered == [True] * TRIPS
+    # Every reminder is queued before the (slow) reports get going
+    assert fast_path < 2.0
+    assert pending_reports > 0
+
+    reminder_keys = Counter(key for key, _ in outbox.messages)
+    assert reminder_keys == Counter(scheduler.reminder_key(trip) for trip in trips)
+    assert max(reminder_keys.values()) == 1
+
+    assert Counter(runner.labels) == Counter(f"trip to {trip['destination']}" for trip in trips)
+    assert len(outbox.documents) == len(set(outbox.documents)) == TRIPS
+    assert runner.max_running == scheduler.MAX_CONCURRENT_REPORTS
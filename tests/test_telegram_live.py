@@ -0,0 +1,92 @@
+"""LiveLocationStreamer coalescing against a fake Bot API client."""
+
+import pytest
+
+from hackathon_sakhi import telegram_live
+from hackathon_sakhi.telegram_live import LiveLocationStreamer
+
+START = (28.6139, 77.2090)
+# About 11 m and 111 m north of START
+NEAR = (28.6140, 77.2090)
+FAR = (28.6149, 77.2090)
+FARTHER = (28.6159, 77.2090)
+
+
+class FakeSender:
+    """Records Bot API calls; every call succeeds."""
+
+    def __init__(self):
+        self.calls = []
+
+    def call(self, method, payload, **options):
+        self.calls.append((method, payload))
+        self.options = options
+        return {"message_id": len(self.calls)}
+
+    def edits(self):
+        return [(p["latitude"], p["longitude"]) for m, p in self.calls if m == "editMessageLiveLocation"]
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def time(self):
+        return self.now
+
+    def monotonic(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(telegram_live, "time", clock)
+    return clock
+
+
+@pytest.fixture
+def streamer(clock):
+    streamer = LiveLocationStreamer(FakeSender(), min_interval=10, min_distance=25)
+    # Flushes are driven by the test instead of the background thread
+    streamer._ensure_thread = lambda: None
+    streamer.start(["42"], lat=START[0], lng=START[1])
+    return streamer
+
+
+def test_short_moves_are_not_sent(streamer, clock):
+    clock.now += 60
+    streamer.update(*NEAR)
+
+    assert streamer.sender.edits() == []
+    assert streamer.sessions()[0].updates_skipped == 1
+
+
+def test_moves_within_min_interval_are_coalesced_to_the_newest(streamer, clock):
+    clock.now += 5
+    streamer.update(*FAR)
+    streamer.update(*FARTHER)
+    assert streamer.sender.edits() == []
+
+    clock.now += 5
+    assert streamer.flush() == 1
+    assert streamer.flush() == 0
+    assert streamer.sender.edits() == [FARTHER]
+
+    session = streamer.sessions()[0]
+    assert (session.lat, session.lng, session.pending, session.updates_sent) == (*FARTHER, None, 1)
+
+
+def test_stop_ends_the_live_location(streamer):
+    stopped = streamer.stop()
+
+    assert [session.chat_id for session in stopped] == ["42"]
+    assert streamer.sender.calls[-1] == ("stopMessageLiveLocation", {"chat_id": "42", "message_id": 1})
+    assert streamer.sessions() == []
+
+
+def test_stop_with_a_timeout_is_not_retried(streamer):
+    streamer.stop(timeout=1.5)
+
+    assert streamer.sender.calls[-1][0] == "stopMessageLiveLocation"
+    assert streamer.sender.options == {"timeout": 1.5, "max_retries": 0}
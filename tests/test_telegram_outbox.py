@@ -0,0 +1,85 @@
+"""TelegramOutbox and QueuedTelegramService against a local stand-in for the Bot API."""
+
+import threading
+import time
+
+import pytest
+
+from hackathon_sakhi.telegram import QueuedTelegramService, TelegramMessage
+from hackathon_sakhi.telegram_outbox import FAILED, PENDING, SENT, TelegramOutbox
+from hackathon_sakhi.telegram_sender import TelegramSender
+
+
+@pytest.fixture
+def outbox(api, tmp_path):
+    sender = TelegramSender("123:token", api_url=api.url, chat_rate=100, max_retries=0, timeout=5)
+    outbox = TelegramOutbox(sender, tmp_path / "outbox.db", retry_delay=60, poll_interval=0.1)
+    outbox.start()
+    yield outbox
+    outbox.close()
+
+
+def reject(description, status=400, retry_after=None):
+    body = {"ok": False, "error_code": status, "description": description}
+    if retry_after is not None:
+        body["parameters"] = {"retry_after": retry_after}
+    return status, body
+
+
+def test_send_message_reports_sent_queued_and_failed(api, outbox):
+    service = QueuedTelegramService(outbox, "42", wait=2)
+
+    assert service.deliver(TelegramMessage("SOS", "")).status == SENT
+
+    api.reply = lambda method, payload: reject("Bad Request: chat not found")
+    result = service.deliver(TelegramMessage("SOS", "nobody"))
+    assert result.status == FAILED
+    assert "chat not found" in result.error
+    assert service.send_message(TelegramMessage("SOS", "nobody")) is False
+
+    api.reply = lambda method, payload: reject("Internal Server Error", status=500)
+    result = service.deliver(TelegramMessage("SOS", ""))
+    assert result.status == "queued"
+    assert "Internal Server Error" in result.error
+
+
+def test_failed_key_is_queued_again(api, outbox):
+    api.reply = lambda method, payload: reject("Forbidden: bot was blocked by the user", status=403)
+    outbox.send_message("42", "Reminder", key="trip-reminder:1")
+    assert outbox.wait_idle(5)
+    assert outbox.status("trip-reminder:1")["status"] == FAILED
+
+    api.reply = lambda method, payload: (200, {"ok": True, "result": {"message_id": 9}})
+    outbox.send_message("42", "Reminder", key="trip-reminder:1")
+    assert outbox.status("trip-reminder:1")["status"] in (PENDING, SENT)
+    assert outbox.wait_idle(5)
+    assert outbox.status("trip-reminder:1")["status"] == SENT
+
+    # A sent key is not sent twice
+    outbox.send_message("42", "Reminder", key="trip-reminder:1")
+    assert outbox.wait_idle(5)
+    assert len(api.calls) == 2
+
+
+def test_lease_is_renewed_while_a_send_is_still_retrying(api, tmp_path):
+    def slow(method, payload):
+        time.sleep(1.0)
+        return 200, {"ok": True, "result": {"message_id": 1}}
+
+    api.reply = slow
+    sender = TelegramSender("123:token", api_url=api.url, chat_rate=100, max_retries=0, timeout=5)
+    first = TelegramOutbox(sender, tmp_path / "outbox.db", lease=0.3)
+    second = TelegramOutbox(sender, tmp_path / "outbox.db", lease=0.3)
+    first.send_message("42", "SOS", key="sos-1")
+
+    draining = threading.Thread(target=first.drain_once)
+    draining.start()
+    # Well past the original lease, while the send is still in flight
+    time.sleep(0.6)
+    assert second.drain_once() == 0
+    draining.join()
+
+    assert first.status("sos-1")["status"] == SENT
+    assert len(api.calls) == 1
+    first.close()
+    second.close()
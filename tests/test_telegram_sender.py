@@ -0,0 +1,132 @@
+"""TelegramSender against a local stand-in for the Bot API."""
+
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from hackathon_sakhi.telegram import TelegramBotService, TelegramMessage
+from hackathon_sakhi.telegram_media import FileIdCache
+from hackathon_sakhi.telegram_sender import TelegramError, TelegramSender
+
+
+def make_sender(api, **options):
+    options = {"backoff": 0.01, "max_backoff": 0.05, "timeout": 5, **options}
+    return TelegramSender("123:token", api_url=api.url, **options)
+
+
+def test_burst_is_paced_by_the_global_bucket(api):
+    sender = make_sender(api, global_rate=20, chat_rate=100)
+    started = time.monotonic()
+    with ThreadPoolExecutor(max_workers=10) as pool:
+        list(pool.map(lambda i: sender.send_message(f"chat-{i}", "SOS"), range(40)))
+
+    times = sorted(api.times("sendMessage"))
+    assert len(times) == 40
+    # A full bucket lets 20 through at once; the other 20 follow at 20 a second
+    assert time.monotonic() - started >= 20 / 20 * 0.9
+    assert times[-1] - times[19] >= 19 / 20 * 0.9
+    assert times[19] - started < 0.5
+
+
+def test_paused_chats_do_not_burst_past_the_global_limit(api):
+    sender = make_sender(api, global_rate=20, chat_rate=100)
+    # More paused chats than the global bucket holds, all free to send again at once
+    paused = [f"paused-{i}" for i in range(30)]
+    for chat_id in paused:
+        sender._bucket(chat_id).pause(2.0)
+
+    chats = paused + [f"chat-{i}" for i in range(40)]
+    with ThreadPoolExecutor(max_workers=len(chats)) as pool:
+        list(pool.map(lambda chat_id: sender.send_message(chat_id, "SOS"), chats))
+
+    times = sorted(api.times("sendMessage"))
+    assert len(times) == len(chats)
+    # Any stretch of time holds at most a full bucket plus what refills meanwhile
+    for first in range(len(times)):
+        for last in range(first, len(times)):
+            assert last - first + 1 <= 20 + 20 * (times[last] - times[first]) + 2
+
+
+def test_one_chat_is_paced_by_its_own_bucket(api):
+    sender = make_sender(api, global_rate=100, chat_rate=10)
+    started = time.monotonic()
+    for _ in range(6):
+        sender.send_message("42", "Reminder")
+    # The first message goes straight away, the next five 0.1s apart
+    assert time.monotonic() - started >= 5 / 10 * 0.9
+
+
+def test_rate_limit_waits_retry_after_for_that_chat_only(api):
+    limited = {"count": 0}
+
+    def reply(method, payload):
+        if payload["chat_id"] == "busy" and limited["count"] == 0:
+            limited["count"] += 1
+            return 429, {"ok": False, "error_code": 429, "description": "Too Many Requests: retry after 1",
+                         "parameters": {"retry_after": 1}}
+        return 200, {"ok": True, "result": {"message_id": 7}}
+
+    api.reply = reply
+    sender = make_sender(api, global_rate=100, chat_rate=100)
+
+    with ThreadPoolExecutor(max_workers=1) as pool:
+        busy = pool.submit(sender.send_message, "busy", "SOS")
+        time.sleep(0.2)
+        started = time.monotonic()
+        assert sender.send_message("other", "SOS") == {"message_id": 7}
+        # Another chat is not held up by the pause
+        assert time.monotonic() - started < 0.5
+        assert busy.result(timeout=5) == {"message_id": 7}
+
+    busy_calls = [at for at, method, payload in api.calls if payload.get("chat_id") == "busy"]
+    assert len(busy_calls) == 2
+    assert busy_calls[1] - busy_calls[0] >= 0.9
+
+
+def test_rate_limit_gives_up_after_max_retries(api):
+    api.reply = lambda method, payload: (429, {"ok": False, "error_code": 429, "description": "Too Many Requests",
+                                               "parameters": {"retry_after": 0.05}})
+    sender = make_sender(api, max_retries=2, chat_rate=100)
+    with pytest.raises(TelegramError) as error:
+        sender.send_message("42", "SOS")
+    assert error.value.error_code == 429
+    assert len(api.calls) == 3
+
+
+@pytest.mark.parametrize("description, uploads", [
+    ("Bad Request: wrong file identifier/HTTP URL specified", 2),
+    ("Bad Request: chat not found", 1),
+])
+def test_cached_file_id_is_only_dropped_for_file_id_errors(api, tmp_path, description, uploads):
+    report = tmp_path / "report.html"
+    report.write_text("<html></html>")
+
+    def reply(method, payload):
+        if payload.get("upload"):
+            return 200, {"ok": True, "result": {"message_id": 1, "document": {"file_id": "FILE"}}}
+        return 400, {"ok": False, "error_code": 400, "description": description}
+
+    api.reply = reply
+    sender = make_sender(api, chat_rate=100, file_ids=FileIdCache(tmp_path / "file_ids.json"))
+    sender.send_document("42", report)
+
+    if uploads == 2:
+        sender.send_document("42", report)
+    else:
+        with pytest.raises(TelegramError):
+            sender.send_document("42", report)
+    assert sum(1 for _, _, payload in api.calls if payload.get("upload")) == uploads
+
+
+def test_direct_service_sends_each_idempotency_key_once(api):
+    service = TelegramBotService("123:token", "42", sender=make_sender(api, chat_rate=100))
+    for _ in range(2):
+        assert service.send_message(TelegramMessage("SOS", "42", idempotency_key="sos-1"))
+        results = service.broadcast("SOS", ["1", "2", "1"], idempotency_key="sos-2")
+        assert [(r.chat_id, r.status) for r in results] == [("1", "sent"), ("2", "sent")]
+    service.broadcast("SOS", ["1"])
+
+    # The repeated keys were not sent again; the unkeyed broadcast was
+    assert Counter(payload["chat_id"] for _, _, payload in api.calls) == {"42": 1, "1": 2, "2": 1}
@@ -0,0 +1,53 @@
+"""The Telegram MCP server's file tool only sends reports to known chats."""
+
+import asyncio
+
+import pytest
+
+from hackathon_sakhi.telegram import DeliveryResult, TelegramMCPServer
+from hackathon_sakhi.telegram_contacts import ContactGroupRegistry
+
+
+class RecordingService:
+    """Stands in for a Telegram service; records the files it was asked to send."""
+
+    def __init__(self):
+        self.files = []
+
+    def send_file(self, path, chat_ids, caption=None, as_photo=False, idempotency_key=None):
+        self.files.append((path, chat_ids))
+        return [DeliveryResult(chat_id, "sent") for chat_id in chat_ids]
+
+
+@pytest.fixture
+def server(tmp_path):
+    reports = tmp_path / "reports"
+    reports.mkdir()
+    (reports / "trip-safety-report-Delhi-2026-10-19.html").write_text("<html></html>")
+    (reports / ".env").write_text("TELEGRAM_BOT_TOKEN=secret")
+    (tmp_path / "secret.html").write_text("<html>secret</html>")
+    (reports / "linked.html").symlink_to(tmp_path / "secret.html")
+    return TelegramMCPServer(RecordingService(), contacts=ContactGroupRegistry(tmp_path / "contacts.json"),
+                             default_chat_id="42", reports_dir=reports)
+
+
+def send_file(server, **arguments):
+    _, structured = asyncio.run(server.mcp.call_tool("send_hackathon_telegram_file", arguments))
+    return structured["result"]
+
+
+@pytest.mark.parametrize("path", ["../secret.html", "{root}/secret.html", "linked.html", ".env", "missing.html"])
+def test_files_outside_the_reports_dir_or_not_reports_are_refused(server, tmp_path, path):
+    result = send_file(server, path=path.format(root=tmp_path))
+
+    assert result["error"]
+    assert server.telegram_service.files == []
+
+
+def test_report_goes_to_the_default_chat_only(server):
+    result = send_file(server, path="trip-safety-report-Delhi-2026-10-19.html", chat_ids=["666"])
+
+    assert "error" not in result
+    assert server.telegram_service.files == [
+        (str(server.reports_dir / "trip-safety-report-Delhi-2026-10-19.html"), ["42"])
+    ]
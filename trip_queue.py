@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+"""
+SAKHI - Trip reminder queue.
+
+Keeps pending trips in a min-heap ordered by reminder time so the
+scheduler can sleep exactly until the next reminder is due instead of
+rescanning trips on a fixed interval. trips.json is only imported into
+the trips store when its modification time changes.
+
+refresh() and mark_sent() do file and SQLite I/O; the scheduler runs them
+through asyncio.to_thread so they never block the event loop.
+"""
+
+import heapq
+import itertools
+import json
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple
+
+from trip_store import TripStore
+
+
+class TripQueue:
+    """Min-heap of pending trip reminders backed by the trips store."""
+
+    def __init__(self, path: Path, store: TripStore, reminder_hours: float, log: Callable[[str], None]):
+        self.path = path
+        self.store = store
+        self.reminder_delta = timedelta(hours=reminder_hours)
+        self.log = log
+        self._heap: List[Tuple[datetime, int, int]] = []
+        self._by_id: Dict[int, Dict] = {}
+        self._in_progress: set = set()
+        # Trip id -> earliest retry of a failed reminder; survives heap rebuilds
+        self._retry_at: Dict[int, datetime] = {}
+        self._counter = itertools.count()
+        self._mtime: Optional[float] = None
+        self._loaded = False
+
+    def __len__(self) -> int:
+        return len(self._heap)
+
+    def refresh(self) -> bool:
+        """Import trips.json if it changed since the last import and rebuild the heap."""
+        try:
+            mtime = self.path.stat().st_mtime
+        except FileNotFoundError:
+            mtime = None
+
+        if self._loaded and mtime == self._mtime:
+            return False
+
+        if mtime is not None:
+            try:
+                imported = self.store.import_json(self.path)
+                self.log(f"📥 Imported {imported} trip(s) from {self.path.name}")
+            except json.JSONDecodeError:
+                # Probably caught mid-write - retry on the next refresh
+                self.log("❌ Error reading trips.json")
+                return False
+
+        self._mtime = mtime
+        self._loaded = True
+        self._rebuild()
+        return True
+
+    def _rebuild(self):
+        self._by_id = {}
+        self._heap = []
+
+        pending = self.store.pending_trips()
+        pending_ids = {trip["id"] for trip in pending}
+        self._retry_at = {trip_id: at for trip_id, at in self._retry_at.items() if trip_id in pending_ids}
+
+        for trip in pending:
+            if trip["id"] in self._in_progress:
+                continue
+            self._by_id[trip["id"]] = trip
+            remind_at = datetime.fromisoformat(trip["datetime"]) - self.reminder_delta
+            retry_at = self._retry_at.get(trip["id"])
+            if retry_at is not None:
+                remind_at = max(remind_at, retry_at)
+            self._heap.append((remind_at, next(self._counter), trip["id"]))
+
+        heapq.heapify(self._heap)
+        self.log(f"🔍 {len(self._heap)} reminder(s) pending")
+
+    def seconds_until_next(self, now: datetime) -> Optional[float]:
+        """Seconds until the earliest pending reminder, or None if the queue is empty."""
+        if not self._heap:
+            return None
+        return max(0.0, (self._heap[0][0] - now).total_seconds())
+
+    def pop_due(self, now: datetime) -> List[Dict]:
+        """Remove and return every trip whose reminder is due and that hasn't departed yet."""
+        due = []
+        while self._heap and self._heap[0][0] <= now:
+            _, _, trip_id = heapq.heappop(self._heap)
+            trip = self._by_id.pop(trip_id, None)
+            if trip is None:
+                continue
+            if datetime.fromisoformat(trip["datetime"]) <= now:
+                self.log(f"⚠️ Missed reminder for trip to {trip.get('destination')} - already departed")
+                continue
+            self._in_progress.add(trip_id)
+            due.append(trip)
+        return due
+
+    def retry_later(self, trip: Dict, delay_seconds: float):
+        """Re-queue a trip whose reminder failed, as long as it hasn't departed by then."""
+        self._in_progress.discard(trip["id"])
+        retry_at = datetime.now() + timedelta(seconds=delay_seconds)
+        # Kept even past departure, so a rebuild does not make the trip due again
+        self._retry_at[trip["id"]] = retry_at
+        if retry_at >= datetime.fromisoformat(trip["datetime"]):
+            return
+        self._by_id[trip["id"]] = trip
+        heapq.heappush(self._heap, (retry_at, next(self._counter), trip["id"]))
+
+    def mark_sent(self, trip: Dict):
+        """Record that a trip's reminder went out."""
+        self.store.mark_sent(trip["id"])
+        self._in_progress.discard(trip["id"])
+        self._retry_at.pop(trip["id"], None)
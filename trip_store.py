@@ -0,0 +1,146 @@
+#!/usr/bin/env python3
+"""
+SAKHI - SQLite trips store.
+
+trips.json stays the file agents write new trips to; it is imported into
+trips.db, which holds the authoritative reminder state. Pending trips are
+indexed by departure time and marking a reminder as sent is a single-row
+atomic update instead of a rewrite of the whole JSON file.
+"""
+
+import json
+import sqlite3
+import threading
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS trips (
+    id INTEGER PRIMARY KEY,
+    source TEXT NOT NULL,
+    destination TEXT NOT NULL,
+    datetime TEXT NOT NULL,
+    trip_at REAL NOT NULL,
+    payload TEXT NOT NULL,
+    reminder_sent INTEGER NOT NULL DEFAULT 0,
+    reminder_sent_at TEXT,
+    UNIQUE (source, destination, datetime)
+);
+CREATE INDEX IF NOT EXISTS idx_trips_pending ON trips (reminder_sent, trip_at);
+"""
+
+
+def parse_trips_json(data) -> List[Dict]:
+    """Handle both formats: {"trips": [...]} or [...]"""
+    if isinstance(data, dict):
+        return data.get("trips", [])
+    return data or []
+
+
+class TripStore:
+    """Trips table with indexed pending-reminder queries.
+
+    Safe to share between threads, so the scheduler can call it through
+    asyncio.to_thread.
+    """
+
+    def __init__(self, db_path: Path):
+        self.db_path = db_path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(db_path), check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(SCHEMA)
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+    def import_json(self, path: Path) -> int:
+        """Upsert every valid trip from a trips.json file. Returns the number imported."""
+        with open(path, 'r') as f:
+            trips = parse_trips_json(json.load(f))
+        return self.upsert_trips(trips)
+
+    def upsert_trips(self, trips: Iterable[Dict]) -> int:
+        """Insert new trips and refresh existing ones in a single transaction.
+
+        A reminder already recorded as sent is never reset by a re-import.
+        """
+        rows = []
+        for trip in trips:
+            try:
+                trip_at = datetime.fromisoformat(trip["datetime"]).timestamp()
+                rows.append((
+                    trip["source"],
+                    trip["destination"],
+                    trip["datetime"],
+                    trip_at,
+                    json.dumps(trip),
+                    1 if trip.get("reminder_sent") else 0,
+                    trip.get("reminder_sent_at"),
+                ))
+            except (KeyError, ValueError, TypeError):
+                continue
+
+        with self._lock, self._conn:
+            self._conn.executemany(
+                """
+                INSERT INTO trips (source, destination, datetime, trip_at, payload,
+                                   reminder_sent, reminder_sent_at)
+                VALUES (?, ?, ?, ?, ?, ?, ?)
+                ON CONFLICT (source, destination, datetime) DO UPDATE SET
+                    payload = excluded.payload,
+                    trip_at = excluded.trip_at,
+                    reminder_sent = MAX(trips.reminder_sent, excluded.reminder_sent),
+                    reminder_sent_at = COALESCE(trips.reminder_sent_at, excluded.reminder_sent_at)
+                """,
+                rows
+            )
+        return len(rows)
+
+    def pending_trips(self, after: Optional[datetime] = None, before: Optional[datetime] = None) -> List[Dict]:
+        """Trips without a reminder, departing in (after, before], ordered by departure."""
+        after_ts = (after or datetime.now()).timestamp()
+        query = "SELECT * FROM trips WHERE reminder_sent = 0 AND trip_at > ?"
+        params = [after_ts]
+        if before is not None:
+            query += " AND trip_at <= ?"
+            params.append(before.timestamp())
+        query += " ORDER BY trip_at"
+        with self._lock:
+            rows = self._conn.execute(query, params).fetchall()
+        return [self._to_trip(row) for row in rows]
+
+    def next_departure(self, after: Optional[datetime] = None) -> Optional[datetime]:
+        """Departure time of the earliest trip still waiting for its reminder."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT MIN(trip_at) FROM trips WHERE reminder_sent = 0 AND trip_at > ?",
+                ((after or datetime.now()).timestamp(),)
+            ).fetchone()
+        return datetime.fromtimestamp(row[0]) if row and row[0] is not None else None
+
+    def mark_sent(self, trip_id: int) -> bool:
+        """Atomically flag one trip's reminder as sent. False if it was already sent."""
+        with self._lock, self._conn:
+            cursor = self._conn.execute(
+                "UPDATE trips SET reminder_sent = 1, reminder_sent_at = ? WHERE id = ? AND reminder_sent = 0",
+                (datetime.now().isoformat(), trip_id)
+            )
+        return cursor.rowcount == 1
+
+    def count(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM trips").fetchone()[0]
+
+    @staticmethod
+    def _to_trip(row: sqlite3.Row) -> Dict:
+        trip = json.loads(row["payload"])
+        trip["id"] = row["id"]
+        trip["reminder_sent"] = bool(row["reminder_sent"])
+        if row["reminder_sent_at"]:
+            trip["reminder_sent_at"] = row["reminder_sent_at"]
+        return trip